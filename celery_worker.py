@@ -1,13 +1,27 @@
+import os
+import time
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_shutdown, worker_shutdown
 from database.connection import SessionLocal
 from services.auction_service import AuctionService
+from services.auction_order_book import get_order_book
 from models.db_models import Auction, AuctionStatus, Domain, Listing, ListingStatus, TransactionType
+from models.api_dto import DNSRecordRequest
+from fastapi import HTTPException
 from datetime import datetime, timedelta
 from sqlalchemy.orm import joinedload
 
 from services.namecheap_service import NamecheapService
 from services.notification_service import NotificationService
+from services.trending_snapshot import TrendingSnapshot
+from services.rate_limiter import Priority, RateLimitExceeded, request_priority
+from services.circuit_breaker import CircuitOpenError
+from services.bulk_availability import BulkCheckJobStore
+from services.namecheap_management_service import NamecheapManagementService
+from services.dns_templates import DnsTemplateJobStore, RETRYABLE_STATUSES, apply_to_domains, render_template
+from services.executors import shutdown_executors
+from services.registrar_sync import RegistrarSync, save_last_run
 from services.payment_service import PaymentService
 import stripe
 
@@ -20,6 +34,13 @@ celery_app = Celery(
 )
 
 
+@worker_shutdown.connect
+@worker_process_shutdown.connect
+def shutdown_shared_executors(**kwargs):
+    """Stops the shared outbound thread pools when the worker (or a prefork child) exits."""
+    shutdown_executors()
+
+
 @celery_app.task
 def check_and_close_expired_auctions():
     """
@@ -145,9 +166,9 @@ def check_and_renew_expiring_domains():
                 continue
 
             try:
-                # 1. Get Current Price (Assuming standard domain, 1 year)
+                # 1. Get Current Renewal Price from the local catalog (Assuming standard domain, 1 year)
                 tld = domain.domain_name.split('.')[-1]
-                price_info = namecheap_service.get_tld_price(tld)
+                price_info = namecheap_service.get_tld_price(tld, category="renew")
 
                 if "error" in price_info:
                     print(f"Skipping {domain.domain_name}: Could not fetch price.")
@@ -213,6 +234,186 @@ def check_and_renew_expiring_domains():
         db.close()
 
 
+@celery_app.task
+def refresh_tld_pricing_catalog():
+    """
+    Periodic task to pull the full Namecheap REGISTER/RENEW price list in one call
+    and publish it as a new version of the shared pricing catalog.
+    """
+    print("Running scheduled task: Refreshing TLD pricing catalog...")
+    with request_priority(Priority.BACKGROUND):
+        result = NamecheapService().refresh_pricing_catalog()
+
+    if "error" in result:
+        print(f"Pricing catalog refresh failed: {result['error']}")
+        return
+
+    print(f"Published pricing catalog version {result['version']} ({result['tld_counts']}).")
+    return result
+
+
+@celery_app.task
+def refresh_trending_domains_snapshot():
+    """
+    Periodic task to recompute the trending available domains and store them as a
+    snapshot, so the /domains/trending-domains endpoint never calls Namecheap itself.
+    """
+    snapshot_store = TrendingSnapshot()
+    try:
+        print("Running scheduled task: Refreshing trending domains snapshot...")
+        with request_priority(Priority.BACKGROUND):
+            domains = NamecheapService().get_trending_available_domains()
+
+        # An empty result usually means the Namecheap call failed; keep serving the last snapshot
+        if not domains and snapshot_store.has_snapshot():
+            print("No trending domains returned. Keeping the previous snapshot.")
+            return
+
+        snapshot = snapshot_store.store(domains)
+        print(f"Stored trending snapshot with {len(domains)} domains at {snapshot['generated_at']}.")
+    finally:
+        snapshot_store.release_refresh_lock()
+
+
+@celery_app.task
+def sync_registrar_account():
+    """
+    Periodic task to mirror the Namecheap account (domains.getList, plus getInfo for
+    changed domains) into the registrar_domain_states table, at background priority.
+    Domain info endpoints read the mirror, and drifted local expiry dates are corrected.
+    """
+    db = SessionLocal()
+    try:
+        print("Running scheduled task: Syncing registrar account...")
+        service = NamecheapManagementService()
+        sync = RegistrarSync(fetch_page=service.list_domains_page, fetch_info=service.fetch_domain_info)
+        with request_priority(Priority.BACKGROUND):
+            stats = sync.run(db)
+
+        save_last_run(stats)
+        print(f"Registrar sync finished: {stats['domains']} domains on {stats['pages']} pages, "
+              f"{stats['changed']} changed, {stats['info_refreshed']} details refreshed, "
+              f"{stats['expiry_corrected']} expiry dates corrected, {stats['removed']} removed.")
+        return stats
+    finally:
+        db.close()
+
+
+@celery_app.task
+def run_bulk_availability_check(job_id: str):
+    """
+    Checks the domains of a bulk availability job (see POST /domains/check/bulk) in
+    chunks at background priority, appending results to the job as batches complete.
+    When the rate limiter or a circuit breaker pushes back, the task waits and resumes
+    with the domains that have not been checked yet.
+    """
+    store = BulkCheckJobStore()
+    namecheap_service = NamecheapService()
+    chunk_size = int(os.getenv("BULK_CHECK_JOB_CHUNK", "250"))
+    max_retries = int(os.getenv("BULK_CHECK_JOB_MAX_RETRIES", "10"))
+
+    remaining = store.get_input(job_id)
+    store.set_status(job_id, "running")
+    print(f"Running bulk availability job {job_id} for {len(remaining)} domains...")
+
+    retries = 0
+    try:
+        with request_priority(Priority.BACKGROUND):
+            while remaining:
+                done = set()
+                try:
+                    for results in namecheap_service.iter_bulk_availability(remaining[:chunk_size]):
+                        store.append_results(job_id, results)
+                        done.update(result["domain"] for result in results)
+                    retries = 0
+                except (RateLimitExceeded, CircuitOpenError) as e:
+                    retries += 1
+                    if retries > max_retries:
+                        raise
+                    print(f"Bulk job {job_id} paused for {e.retry_after:.0f}s: {e}")
+                    time.sleep(e.retry_after)
+                remaining = [domain for domain in remaining if domain not in done]
+
+        store.set_status(job_id, "completed")
+        print(f"Bulk availability job {job_id} completed.")
+    except Exception as e:
+        print(f"Bulk availability job {job_id} failed: {e}")
+        store.set_status(job_id, "failed", error=str(e))
+
+
+@celery_app.task
+def apply_dns_template_job(job_id: str):
+    """
+    Applies a DNS template to every domain of a job (see POST
+    /domains/manage/dns-templates/{id}/apply) with a few domains in flight at a
+    time, at background rate-limit priority. Domains that fail with a retryable
+    error (rate limited, Namecheap unavailable, edit in progress) are retried
+    with backoff; the status of every domain is kept in the job.
+    """
+    store = DnsTemplateJobStore()
+    spec = store.get_spec(job_id)
+    if spec is None:
+        print(f"DNS template job {job_id} not found.")
+        return
+
+    management_service = NamecheapManagementService()
+    concurrency = int(os.getenv("DNS_TEMPLATE_CONCURRENCY", "4"))
+    max_attempts = int(os.getenv("DNS_TEMPLATE_MAX_ATTEMPTS", "4"))
+    backoff = float(os.getenv("DNS_TEMPLATE_RETRY_BACKOFF", "10"))
+
+    def apply(domain):
+        sld, tld = domain.rsplit(".", 1)
+        records = [DNSRecordRequest(**record) for record in render_template(spec["records"], domain)]
+        try:
+            management_service.apply_dns_template(sld, tld, records, spec["mode"])
+            return None
+        except Exception as e:
+            return e
+
+    def is_retryable(error):
+        if isinstance(error, HTTPException):
+            retry_after = float((error.headers or {}).get("Retry-After", 0))
+            return error.status_code in RETRYABLE_STATUSES, retry_after
+        return True, 0.0
+
+    def on_result(domain, attempt, error, final):
+        if error is None:
+            store.set_domain(job_id, domain, "succeeded", attempt)
+            return
+        message = str(error.detail) if isinstance(error, HTTPException) else str(error)
+        store.set_domain(job_id, domain, "failed" if final else "retrying", attempt, message)
+        print(f"DNS template job {job_id}: {domain} attempt {attempt} failed: {message}")
+
+    store.set_status(job_id, "running")
+    print(f"Running DNS template job {job_id} for {len(spec['domains'])} domains...")
+    try:
+        with request_priority(Priority.BACKGROUND):
+            apply_to_domains(spec["domains"], apply, on_result, concurrency, max_attempts, backoff, is_retryable)
+        store.set_status(job_id, "completed")
+        print(f"DNS template job {job_id} completed.")
+    except Exception as e:
+        print(f"DNS template job {job_id} failed: {e}")
+        store.set_status(job_id, "failed", error=str(e))
+
+
+@celery_app.task
+def persist_order_book_bids():
+    """
+    Writes bids accepted by the Redis auction order book to the database.
+    Scheduled shortly after a bid, and every minute as a safety net.
+    """
+    order_book = get_order_book()
+    if not order_book.enabled:
+        return
+    db = SessionLocal()
+    try:
+        written = order_book.persist_pending(db, consumer=f"worker-{os.getpid()}")
+        if written:
+            print(f"Persisted {written} order book bids.")
+    finally:
+        db.close()
+
+
 @celery_app.task
 def send_push_notification_task(user_id: int, title: str, body: str, data: dict = None):
     """
@@ -236,6 +437,11 @@ celery_app.conf.beat_schedule = {
         'schedule': crontab(),  # Runs every minute
     },
 
+    'persist-order-book-bids-every-minute': {
+        'task': 'celery_worker.persist_order_book_bids',
+        'schedule': crontab(),  # Runs every minute
+    },
+
     'check-expired-domains-every-10-minutes': {
         'task': 'celery_worker.check_and_remove_expired_domains',
         'schedule': crontab(minute='*/10'), # Runs every 10 minutes
@@ -245,6 +451,22 @@ celery_app.conf.beat_schedule = {
         'task': 'celery_worker.check_and_renew_expiring_domains',
         'schedule': crontab(hour=0, minute=0),  # Runs once a day at midnight
     },
+
+    'refresh-tld-pricing-every-6-hours': {
+        'task': 'celery_worker.refresh_tld_pricing_catalog',
+        'schedule': crontab(minute=15, hour='*/6'),  # Runs every 6 hours
+    },
+
+    'refresh-trending-domains-every-10-minutes': {
+        'task': 'celery_worker.refresh_trending_domains_snapshot',
+        'schedule': crontab(minute='*/10'),  # Runs every 10 minutes
+    },
+
+    'sync-registrar-account-every-30-minutes': {
+        'task': 'celery_worker.sync_registrar_account',
+        'schedule': crontab(minute='5,35'),  # Runs every 30 minutes
+        'options': {'expires': 25 * 60},  # Drop a queued run instead of overlapping the next one
+    },
 }
 
 celery_app.conf.timezone = 'UTC'
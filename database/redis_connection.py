@@ -0,0 +1,20 @@
+import os
+import redis
+from dotenv import load_dotenv
+
+load_dotenv()
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# One pool per process; redis.Redis objects built on it are cheap and thread-safe.
+redis_pool = redis.ConnectionPool.from_url(
+    REDIS_URL,
+    decode_responses=True,
+    socket_timeout=float(os.getenv("REDIS_SOCKET_TIMEOUT", "2")),
+    socket_connect_timeout=float(os.getenv("REDIS_CONNECT_TIMEOUT", "2"))
+)
+
+
+def get_redis() -> redis.Redis:
+    """Returns a Redis client backed by the shared connection pool."""
+    return redis.Redis(connection_pool=redis_pool)
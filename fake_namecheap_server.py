@@ -0,0 +1,366 @@
+"""
+Local stand-in for the Namecheap XML API, for load and latency testing.
+
+Implements the commands the backend uses (domains.check, users.getPricing,
+domains.create, domains.renew, domains.getInfo, domains.getList, dns.getHosts,
+dns.setHosts) with in-memory state, and simulates Namecheap's latency, errors
+and response sizes. Point the backend at it with:
+
+    NAMECHEAP_API_URL=http://localhost:8081/xml.response
+
+Configuration (environment variables):
+    FAKE_NAMECHEAP_PORT=8081
+    FAKE_NAMECHEAP_SEED=                  random seed, for reproducible runs
+    FAKE_NAMECHEAP_LATENCY=lognormal:250,0.5
+        fixed:MS | uniform:MIN_MS,MAX_MS | lognormal:MEDIAN_MS,SIGMA | exponential:MEAN_MS
+    FAKE_NAMECHEAP_COMMAND_LATENCY=namecheap.domains.check=lognormal:400,0.8;namecheap.domains.create=fixed:2500
+    FAKE_NAMECHEAP_ERROR_RATE=0           share of Status="ERROR" responses
+    FAKE_NAMECHEAP_HTTP_ERROR_RATE=0      share of HTTP 503 responses
+    FAKE_NAMECHEAP_TIMEOUT_RATE=0         share of requests that hang for FAKE_NAMECHEAP_TIMEOUT_SECONDS
+    FAKE_NAMECHEAP_TIMEOUT_SECONDS=120
+    FAKE_NAMECHEAP_AVAILABLE_PERCENT=60   share of unregistered names reported available (and registrable)
+    FAKE_NAMECHEAP_PREMIUM_PERCENT=3
+    FAKE_NAMECHEAP_PRICING_TLDS=400       TLDs in the getPricing response
+    FAKE_NAMECHEAP_PRICING_DURATIONS=10   prices per TLD and category
+    FAKE_NAMECHEAP_DNS_HOSTS=4            host records of a domain that has not been edited yet
+"""
+import os
+import math
+import time
+import zlib
+import random
+import asyncio
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+from xml.sax.saxutils import escape, quoteattr
+
+import uvicorn
+from dotenv import load_dotenv
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+
+load_dotenv()
+
+COMMON_TLDS = [
+    "com", "net", "org", "io", "ai", "co", "app", "dev", "xyz", "tech", "shop", "store", "online", "site",
+    "info", "biz", "me", "us", "ca", "cloud", "design", "studio", "agency", "blog", "space",
+]
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Parses a latency distribution spec into a sampler returning seconds."""
+    kind, _, args = spec.strip().partition(":")
+    values = [float(v) for v in args.split(",") if v.strip()]
+    if kind == "fixed":
+        return lambda rng: values[0] / 1000
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000
+    if kind == "lognormal":
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1]) / 1000
+    if kind == "exponential":
+        return lambda rng: rng.expovariate(1 / values[0]) / 1000
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def parse_command_latencies(raw: str) -> Dict[str, Callable[[random.Random], float]]:
+    latencies = {}
+    for item in (raw or "").split(";"):
+        if "=" not in item:
+            continue
+        command, spec = item.split("=", 1)
+        latencies[command.strip().lower()] = parse_latency(spec)
+    return latencies
+
+
+def _stable_percent(value: str) -> int:
+    return zlib.crc32(value.encode()) % 100
+
+
+def _date(value: datetime) -> str:
+    return value.strftime("%m/%d/%Y")
+
+
+class FakeNamecheap:
+    """In-memory Namecheap account plus the simulated network behaviour."""
+
+    def __init__(self):
+        seed = os.getenv("FAKE_NAMECHEAP_SEED")
+        self.rng = random.Random(int(seed) if seed else None)
+        self.latency = parse_latency(os.getenv("FAKE_NAMECHEAP_LATENCY", "lognormal:250,0.5"))
+        self.command_latency = parse_command_latencies(os.getenv("FAKE_NAMECHEAP_COMMAND_LATENCY", ""))
+        self.error_rate = float(os.getenv("FAKE_NAMECHEAP_ERROR_RATE", "0"))
+        self.http_error_rate = float(os.getenv("FAKE_NAMECHEAP_HTTP_ERROR_RATE", "0"))
+        self.timeout_rate = float(os.getenv("FAKE_NAMECHEAP_TIMEOUT_RATE", "0"))
+        self.timeout_seconds = float(os.getenv("FAKE_NAMECHEAP_TIMEOUT_SECONDS", "120"))
+        self.available_percent = int(os.getenv("FAKE_NAMECHEAP_AVAILABLE_PERCENT", "60"))
+        self.premium_percent = int(os.getenv("FAKE_NAMECHEAP_PREMIUM_PERCENT", "3"))
+        self.pricing_tlds = int(os.getenv("FAKE_NAMECHEAP_PRICING_TLDS", "400"))
+        self.pricing_durations = int(os.getenv("FAKE_NAMECHEAP_PRICING_DURATIONS", "10"))
+        self.dns_hosts = int(os.getenv("FAKE_NAMECHEAP_DNS_HOSTS", "4"))
+
+        self.lock = threading.Lock()
+        self.reset()
+        self._pricing_xml = None
+
+    def reset(self):
+        with self.lock:
+            self.domains: Dict[str, Dict] = {}
+            self.hosts: Dict[str, List[Dict]] = {}
+            self.next_id = 1000
+            self.requests = Counter()
+            self.errors = Counter()
+
+    # ---- simulated network behaviour ----
+
+    def sample_latency(self, command: str) -> float:
+        sampler = self.command_latency.get(command, self.latency)
+        return max(0.0, sampler(self.rng))
+
+    def roll(self, rate: float) -> bool:
+        return rate > 0 and self.rng.random() < rate
+
+    # ---- account state ----
+
+    def _domain(self, name: str) -> Dict:
+        """Returns the account's record for a domain. Unknown names are treated as already owned."""
+        name = name.lower()
+        domain = self.domains.get(name)
+        if domain is None:
+            created = datetime.utcnow() - timedelta(days=_stable_percent(name) * 7)
+            domain = self._register(name, created, years=2)
+        return domain
+
+    def _register(self, name: str, created: datetime, years: int) -> Dict:
+        self.next_id += 1
+        domain = {
+            "id": self.next_id,
+            "name": name,
+            "created": created,
+            "expires": created + timedelta(days=365 * years),
+        }
+        self.domains[name] = domain
+        return domain
+
+    def _hosts(self, name: str) -> List[Dict]:
+        hosts = self.hosts.get(name)
+        if hosts is None:
+            hosts = [{"name": "@", "type": "A", "address": "34.123.45.6", "ttl": 1800, "mx_pref": 10}]
+            hosts.append({"name": "www", "type": "CNAME", "address": f"{name}.", "ttl": 1800, "mx_pref": 10})
+            for i in range(max(0, self.dns_hosts - 2)):
+                hosts.append({"name": f"host{i}", "type": "TXT", "address": f"fake-record-{i}", "ttl": 1800, "mx_pref": 10})
+            self.hosts[name] = hosts
+        return hosts
+
+    def _available(self, name: str) -> bool:
+        """Whether a name can be registered: not in the account, and not one of the names taken elsewhere."""
+        return name not in self.domains and _stable_percent(name) < self.available_percent
+
+    # ---- commands ----
+
+    def domains_check(self, params: Dict[str, str]) -> str:
+        results = []
+        for name in filter(None, (d.strip().lower() for d in params.get("domainlist", "").split(","))):
+            available = self._available(name)
+            premium = available and _stable_percent("premium:" + name) < self.premium_percent
+            premium_price = f"{100 + _stable_percent('price:' + name) * 25}.0000" if premium else "0"
+            results.append(
+                f'<DomainCheckResult Domain={quoteattr(name)} Available="{str(available).lower()}" ErrorNo="0" '
+                f'Description="" IsPremiumName="{str(premium).lower()}" PremiumRegistrationPrice="{premium_price}" '
+                f'PremiumRenewalPrice="0" PremiumRestorePrice="0" PremiumTransferPrice="0" IcannFee="0" EapFee="0" />'
+            )
+        return "\n".join(results)
+
+    def users_get_pricing(self, params: Dict[str, str]) -> str:
+        if self._pricing_xml is None:
+            tlds = COMMON_TLDS[:self.pricing_tlds] + [f"tld{i}" for i in range(max(0, self.pricing_tlds - len(COMMON_TLDS)))]
+            categories = []
+            for category, factor, durations in (("register", 1.0, self.pricing_durations),
+                                                ("renew", 1.08, self.pricing_durations),
+                                                ("transfer", 1.0, 1)):
+                products = []
+                for i, tld in enumerate(tlds):
+                    base = 6.98 + (i % 40) * 1.37
+                    prices = "".join(
+                        f'<Price Duration="{d}" DurationType="YEAR" Price="{base * d * factor:.2f}" '
+                        f'PricingType="MULTIPLE" AdditionalCost="0.18" RegularPrice="{base * d * factor + 2:.2f}" '
+                        f'YourPrice="{base * d * factor:.2f}" PromotionPrice="0.0" Currency="USD" />'
+                        for d in range(1, durations + 1)
+                    )
+                    products.append(f'<Product Name="{tld}">{prices}</Product>')
+                categories.append(f'<ProductCategory Name="{category}">{"".join(products)}</ProductCategory>')
+            self._pricing_xml = (f'<UserGetPricingResult><ProductType Name="domains">{"".join(categories)}'
+                                 f'</ProductType></UserGetPricingResult>')
+        return self._pricing_xml
+
+    def domains_create(self, params: Dict[str, str]) -> str:
+        name = params.get("domainname", "").lower()
+        years = int(params.get("years", "1"))
+        with self.lock:
+            if not self._available(name):
+                raise FakeApiError("3019166", f"Domain {name} is not available")
+            domain = self._register(name, datetime.utcnow(), years)
+        return (f'<DomainCreateResult Domain={quoteattr(name)} Registered="true" ChargedAmount="{8.88 * years:.4f}" '
+                f'DomainID="{domain["id"]}" OrderID="{domain["id"] + 50000}" TransactionID="{domain["id"] + 90000}" '
+                f'WhoisguardEnable="true" FreePositiveSSL="false" NonRealTimeDomain="false" />')
+
+    def domains_renew(self, params: Dict[str, str]) -> str:
+        name = params.get("domainname", "").lower()
+        years = int(params.get("years", "1"))
+        with self.lock:
+            domain = self._domain(name)
+            domain["expires"] += timedelta(days=365 * years)
+        return (f'<DomainRenewResult DomainName={quoteattr(name)} DomainID="{domain["id"]}" Renew="true" '
+                f'OrderID="{domain["id"] + 60000}" TransactionID="{domain["id"] + 95000}" '
+                f'ChargedAmount="{9.58 * years:.4f}"><DomainDetails>'
+                f'<ExpiredDate>{domain["expires"].strftime("%m/%d/%Y %I:%M:%S %p")}</ExpiredDate>'
+                f'<NumYears>0</NumYears></DomainDetails></DomainRenewResult>')
+
+    def domains_get_info(self, params: Dict[str, str]) -> str:
+        name = params.get("domainname", "").lower()
+        with self.lock:
+            domain = self._domain(name)
+            host_count = len(self._hosts(name))
+        return (f'<DomainGetInfoResult Status="Ok" ID="{domain["id"]}" DomainName={quoteattr(name)} '
+                f'OwnerName="fakeuser" IsOwner="true" IsPremium="false"><DomainDetails>'
+                f'<CreatedDate>{_date(domain["created"])}</CreatedDate><ExpiredDate>{_date(domain["expires"])}</ExpiredDate>'
+                f'<NumYears>0</NumYears></DomainDetails><LockDetails /><Whoisguard Enabled="True"><ID>{domain["id"]}</ID>'
+                f'<ExpiredDate>{_date(domain["expires"])}</ExpiredDate></Whoisguard>'
+                f'<DnsDetails ProviderType="FREE" IsUsingOurDNS="true" HostCount="{host_count}" EmailType="FWD" '
+                f'DynamicDNSStatus="false" IsFailover="false"><Nameserver>dns1.registrar-servers.com</Nameserver>'
+                f'<Nameserver>dns2.registrar-servers.com</Nameserver></DnsDetails></DomainGetInfoResult>')
+
+    def domains_get_list(self, params: Dict[str, str]) -> str:
+        page = max(1, int(params.get("page", "1")))
+        page_size = min(100, max(10, int(params.get("pagesize", "20"))))
+        now = datetime.utcnow()
+        with self.lock:
+            domains = sorted(self.domains.values(), key=lambda d: d["name"])
+        items = "".join(
+            f'<Domain ID="{d["id"]}" Name={quoteattr(d["name"])} User="fakeuser" Created="{_date(d["created"])}" '
+            f'Expires="{_date(d["expires"])}" IsExpired="{str(d["expires"] < now).lower()}" IsLocked="false" '
+            f'AutoRenew="false" WhoisGuard="ENABLED" IsPremium="false" IsOurDNS="true" />'
+            for d in domains[(page - 1) * page_size:page * page_size]
+        )
+        return (f'<DomainGetListResult>{items}</DomainGetListResult><Paging><TotalItems>{len(domains)}</TotalItems>'
+                f'<CurrentPage>{page}</CurrentPage><PageSize>{page_size}</PageSize></Paging>')
+
+    def dns_get_hosts(self, params: Dict[str, str]) -> str:
+        name = f'{params.get("sld", "")}.{params.get("tld", "")}'.lower()
+        with self.lock:
+            self._domain(name)
+            hosts = list(self._hosts(name))
+        records = "".join(
+            f'<host HostId="{i + 1}" Name={quoteattr(h["name"])} Type="{h["type"]}" Address={quoteattr(h["address"])} '
+            f'MXPref="{h["mx_pref"]}" TTL="{h["ttl"]}" AssociatedAppTitle="" FriendlyName="" IsActive="true" '
+            f'IsDDNSEnabled="false" />'
+            for i, h in enumerate(hosts)
+        )
+        return (f'<DomainDNSGetHostsResult Domain={quoteattr(name)} EmailType="FWD" IsUsingOurDNS="true">'
+                f'{records}</DomainDNSGetHostsResult>')
+
+    def dns_set_hosts(self, params: Dict[str, str]) -> str:
+        name = f'{params.get("sld", "")}.{params.get("tld", "")}'.lower()
+        hosts = []
+        index = 1
+        while f"hostname{index}" in params:
+            hosts.append({
+                "name": params[f"hostname{index}"],
+                "type": params.get(f"recordtype{index}", "A"),
+                "address": params.get(f"address{index}", ""),
+                "ttl": int(params.get(f"ttl{index}", "1800")),
+                "mx_pref": int(params.get(f"mxpref{index}", "10")),
+            })
+            index += 1
+        with self.lock:
+            self._domain(name)
+            self.hosts[name] = hosts
+        return f'<DomainDNSSetHostsResult Domain={quoteattr(name)} IsSuccess="true"><Warnings /></DomainDNSSetHostsResult>'
+
+
+class FakeApiError(Exception):
+    def __init__(self, number: str, message: str):
+        self.number = number
+        self.message = message
+        super().__init__(message)
+
+
+COMMANDS = {
+    "namecheap.domains.check": FakeNamecheap.domains_check,
+    "namecheap.users.getpricing": FakeNamecheap.users_get_pricing,
+    "namecheap.domains.create": FakeNamecheap.domains_create,
+    "namecheap.domains.renew": FakeNamecheap.domains_renew,
+    "namecheap.domains.getinfo": FakeNamecheap.domains_get_info,
+    "namecheap.domains.getlist": FakeNamecheap.domains_get_list,
+    "namecheap.domains.dns.gethosts": FakeNamecheap.dns_get_hosts,
+    "namecheap.domains.dns.sethosts": FakeNamecheap.dns_set_hosts,
+}
+
+
+def render(command: str, body: str, started: float) -> str:
+    return (f'<?xml version="1.0" encoding="utf-8"?>\n'
+            f'<ApiResponse Status="OK" xmlns="http://api.namecheap.com/xml.response"><Errors /><Warnings />'
+            f'<RequestedCommand>{escape(command)}</RequestedCommand>'
+            f'<CommandResponse Type={quoteattr(command)}>{body}</CommandResponse>'
+            f'<Server>FAKE-NAMECHEAP</Server><GMTTimeDifference>--0:00</GMTTimeDifference>'
+            f'<ExecutionTime>{time.perf_counter() - started:.3f}</ExecutionTime></ApiResponse>')
+
+
+def render_error(command: str, number: str, message: str) -> str:
+    return (f'<?xml version="1.0" encoding="utf-8"?>\n'
+            f'<ApiResponse Status="ERROR" xmlns="http://api.namecheap.com/xml.response">'
+            f'<Errors><Error Number="{number}">{escape(message)}</Error></Errors><Warnings />'
+            f'<RequestedCommand>{escape(command)}</RequestedCommand>'
+            f'<Server>FAKE-NAMECHEAP</Server><GMTTimeDifference>--0:00</GMTTimeDifference>'
+            f'<ExecutionTime>0.001</ExecutionTime></ApiResponse>')
+
+
+app = FastAPI(title="Fake Namecheap API")
+fake = FakeNamecheap()
+
+
+@app.get("/xml.response")
+async def xml_response(request: Request):
+    started = time.perf_counter()
+    params = {key.lower(): value for key, value in request.query_params.items()}
+    command = params.get("command", "").lower()
+    fake.requests[command] += 1
+
+    await asyncio.sleep(fake.sample_latency(command))
+
+    if fake.roll(fake.timeout_rate):
+        await asyncio.sleep(fake.timeout_seconds)
+    if fake.roll(fake.http_error_rate):
+        fake.errors["http"] += 1
+        return Response("Service Unavailable", status_code=503)
+    if fake.roll(fake.error_rate):
+        fake.errors["api"] += 1
+        return Response(render_error(command, "5050900", "Unhandled exceptions"), media_type="application/xml")
+
+    handler = COMMANDS.get(command)
+    if handler is None:
+        return Response(render_error(command, "1010900", f"Invalid Command: {command}"), media_type="application/xml")
+
+    try:
+        body = handler(fake, params)
+    except FakeApiError as e:
+        return Response(render_error(command, e.number, e.message), media_type="application/xml")
+    return Response(render(command, body, started), media_type="application/xml")
+
+
+@app.get("/_stats")
+async def stats():
+    """Requests per command and injected errors since start or the last reset."""
+    return {"requests": dict(fake.requests), "errors": dict(fake.errors), "domains": len(fake.domains)}
+
+
+@app.post("/_reset")
+async def reset():
+    fake.reset()
+    return {"reset": True}
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("FAKE_NAMECHEAP_PORT", "8081")))
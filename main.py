@@ -9,6 +9,10 @@ from routes.listing_routes import router as listing_router
 from database.connection import engine, Base
 from fastapi.middleware.cors import CORSMiddleware
 from routes.domain_management_routes import router as management_router
+from routes.metrics_routes import router as metrics_router
+from services.namecheap_client import close_namecheap_clients
+from services.executors import shutdown_executors
+from services.auction_events import get_event_hub
 
 app = FastAPI()
 
@@ -28,6 +32,14 @@ app.include_router(user_router, prefix="/users", tags=["users"])
 app.include_router(auction_router, prefix="/auctions", tags=["auctions"])
 app.include_router(listing_router, prefix="/listings", tags=["listings"])
 app.include_router(management_router, prefix="/domains", tags=["domain management"])
+app.include_router(metrics_router, prefix="/metrics", tags=["metrics"])
+
+@app.on_event("shutdown")
+async def shutdown():
+    # Drain outbound fan-out first so in-flight calls can still use the HTTP clients
+    shutdown_executors()
+    await close_namecheap_clients()
+    await get_event_hub().stop()
 
 @app.get("/")
 async def root():
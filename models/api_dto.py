@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from decimal import Decimal
 
@@ -31,6 +31,9 @@ class RegisterRequest(BaseModel):
 class DomainsCheckRequest(BaseModel):
     domain: str
 
+class BulkCheckRequest(BaseModel):
+    domains: List[str]
+
 class PaymentRequest(BaseModel):
     domain: str
     price: float
@@ -186,11 +189,34 @@ class DomainInfoResponse(BaseModel):
 
 
 class DomainStatusResponse(BaseModel):
-    """Comprehensive domain status including info and DNS."""
-    domain_info: DomainInfoResponse
-    dns_records: List[DNSRecordResponse]
-    is_hosted: bool
-    is_forwarding: bool
+    """
+    Comprehensive domain status including info and DNS.
+    Sections that could not be loaded are None and explained in errors
+    (keyed by "domain_info" or "dns_records").
+    """
+    domain_info: Optional[DomainInfoResponse] = None
+    dns_records: Optional[List[DNSRecordResponse]] = None
+    is_hosted: Optional[bool] = None
+    is_forwarding: Optional[bool] = None
+    errors: Dict[str, str] = {}
+
+
+class DomainDashboardEntry(BaseModel):
+    """One owned domain on the management dashboard."""
+    domain_name: str
+    sld: str
+    tld: str
+    expiry_date: datetime
+    auto_renew_enabled: bool
+    status: DomainStatusResponse
+
+
+class DomainDashboardResponse(BaseModel):
+    """One page of the user's domains, ordered by name, with their status."""
+    page: int
+    page_size: int
+    total: int
+    domains: List[DomainDashboardEntry]
 
 
 class HostingSetupResponse(BaseModel):
@@ -200,6 +226,38 @@ class HostingSetupResponse(BaseModel):
     dns_records_set: List[DNSRecordResponse]
 
 
+class DnsTemplateRequest(BaseModel):
+    """
+    A reusable set of DNS records, e.g. an A + CNAME hosting pair, an MX set or
+    verification TXT records. "{domain}" in an address is replaced per domain.
+    """
+    name: str = Field(..., min_length=1, max_length=100)
+    mode: str = Field(default="merge", description="'merge' (replace same hostname+type only) or 'replace' (all records)")
+    records: List[DNSRecordRequest] = Field(..., min_length=1)
+
+    @validator('mode')
+    def validate_mode(cls, v):
+        if v.lower() not in ['merge', 'replace']:
+            raise ValueError("Mode must be 'merge' or 'replace'")
+        return v.lower()
+
+
+class DnsTemplateResponse(BaseModel):
+    id: int
+    name: str
+    mode: str
+    records: List[DNSRecordRequest]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class DnsTemplateApplyRequest(BaseModel):
+    """Domains (owned by the caller) to apply a template to."""
+    domains: List[str] = Field(..., min_length=1)
+
+
 class DeviceTokenRequest(BaseModel):
     token: str
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Numeric, Enum, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Numeric, Enum, Boolean, JSON
 from sqlalchemy.orm import relationship
 from database.connection import Base
 from datetime import datetime
@@ -73,9 +73,17 @@ class Auction(Base):
     end_time = Column(DateTime, nullable=False)
     status = Column(Enum(AuctionStatus), default=AuctionStatus.ACTIVE)
 
+    # Denormalized from bids and updated under a row lock with every bid, so placing
+    # a bid never scans the bids table. bid_count is NULL for auctions created before
+    # these columns existed until their next bid fills them in.
+    current_highest_bid = Column(Numeric(10, 2), nullable=True)
+    current_leader_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    bid_count = Column(Integer, nullable=True, default=0)
+
     domain = relationship("Domain", back_populates="auctions")
     seller = relationship("User", foreign_keys='Auction.seller_id')
     winner = relationship("User", foreign_keys='Auction.winner_id')
+    current_leader = relationship("User", foreign_keys='Auction.current_leader_id')
     bids = relationship("Bid", back_populates="auction", cascade="all, delete-orphan", order_by="desc(Bid.bid_amount)")
 
 
@@ -88,6 +96,8 @@ class Bid(Base):
 
     bid_amount = Column(Numeric(10, 2), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # The auction's bid_count after this bid; lets the order book's write-behind skip bids it already saved
+    order_book_seq = Column(Integer, nullable=True)
 
     auction = relationship("Auction", back_populates="bids")
     bidder = relationship("User")
@@ -177,4 +187,48 @@ class Notification(Base):
     related_auction_id = Column(Integer, nullable=True)
     related_domain_id = Column(Integer, nullable=True)
 
-    user = relationship("User", backref="notifications")
\ No newline at end of file
+    user = relationship("User", backref="notifications")
+
+
+class DnsTemplate(Base):
+    __tablename__ = "dns_templates"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    name = Column(String, nullable=False)
+    # "merge" replaces only existing records with the same hostname and type; "replace" replaces all records
+    mode = Column(String, nullable=False, default="merge")
+    # List of {hostname, record_type, address, ttl, mx_pref}; "{domain}" in an address is filled in per domain
+    records = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    user = relationship("User", backref="dns_templates")
+
+
+class RegistrarDomainState(Base):
+    """Local mirror of a domain in the Namecheap account, kept up to date by the registrar sync task."""
+    __tablename__ = "registrar_domain_states"
+
+    id = Column(Integer, primary_key=True, index=True)
+    domain_name = Column(String, unique=True, index=True, nullable=False)
+    registrar_id = Column(String, nullable=True)
+    owner_name = Column(String, nullable=True)
+    created = Column(DateTime, nullable=True)
+    expires = Column(DateTime, nullable=True)
+    is_expired = Column(Boolean, default=False)
+    is_locked = Column(Boolean, default=False)
+    # Namecheap's own auto-renew flag, not the marketplace's Domain.auto_renew_enabled
+    auto_renew = Column(Boolean, default=False)
+    whoisguard_enabled = Column(Boolean, default=False)
+    is_premium = Column(Boolean, default=False)
+    is_our_dns = Column(Boolean, default=True)
+
+    # Only known after a getInfo call
+    status = Column(String, nullable=True)
+    is_owner = Column(Boolean, nullable=True)
+    nameservers = Column(JSON, nullable=True)
+
+    # Hash of the getList fields; a change schedules a getInfo refresh
+    fingerprint = Column(String, nullable=True)
+    list_synced_at = Column(DateTime, nullable=True)
+    info_synced_at = Column(DateTime, nullable=True)
@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Depends, status
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List
 
 from stripe import PaymentMethodService
 
-from database.connection import get_db
+from database.connection import SessionLocal, get_db
+from models.db_models import Auction
 from services.auth_service import AuthService
 from services.auction_service import AuctionService
+from services.auction_events import AuctionSubscription, get_event_hub
 from models.api_dto import AuctionCreateRequest, BidCreateRequest, AuctionResponse
 from services.payment_service import PaymentService
 
@@ -58,6 +64,28 @@ def get_my_won_auctions(
     """
     return auction_service.get_auctions_won_by_user(username, db)
 
+@router.get("/my-auctions/events")
+async def my_auction_events(username: str = Depends(auth_service.verify_token)):
+    """
+    Server-sent events for every active auction the user sells or bids on
+    (including ones they start bidding on while connected).
+    """
+    auction_ids = await run_in_threadpool(_watched_auction_ids, username)
+    return _event_stream(get_event_hub().subscribe(auction_ids, username))
+
+
+@router.websocket("/my-auctions/ws")
+async def my_auction_updates(websocket: WebSocket, token: str = Query(...)):
+    """WebSocket version of /my-auctions/events; browsers pass the JWT as ?token=."""
+    try:
+        username = auth_service.verify_token(token)
+        auction_ids = await run_in_threadpool(_watched_auction_ids, username)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await _pump_websocket(websocket, get_event_hub().subscribe(auction_ids, username))
+
+
 @router.get("/", response_model=List[AuctionResponse])
 def get_active_auctions(db: Session = Depends(get_db)):
     """
@@ -77,6 +105,27 @@ def get_auction_details(
     return auction_service.get_auction_details(auction_id, db)
 
 
+@router.get("/{auction_id}/events")
+async def auction_events(auction_id: int):
+    """
+    Server-sent events for one auction: "bid", "closed" and "cancelled", plus
+    "resync" when updates may have been missed (fetch the auction again).
+    Fetch GET /auctions/{auction_id} once, then follow this instead of polling.
+    """
+    if not await run_in_threadpool(_auction_exists, auction_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Auction not found.")
+    return _event_stream(get_event_hub().subscribe([auction_id]))
+
+
+@router.websocket("/{auction_id}/ws")
+async def auction_updates(websocket: WebSocket, auction_id: int):
+    """WebSocket version of /{auction_id}/events."""
+    if not await run_in_threadpool(_auction_exists, auction_id):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await _pump_websocket(websocket, get_event_hub().subscribe([auction_id]))
+
+
 @router.post("/{auction_id}/bids", response_model=AuctionResponse)
 def place_bid(
     auction_id: int,
@@ -86,9 +135,10 @@ def place_bid(
 ):
     """
     Place a bid on an active auction.
+    Returns the auction with its highest bids (AUCTION_BID_RESPONSE_LIMIT).
     """
-    auction = auction_service.place_bid(auction_id, request, username, db)
-    return auction_service._format_auction_response(auction)
+    # Only the top bids are listed here; the full history is at GET /auctions/{auction_id}
+    return auction_service.submit_bid(auction_id, request, username, db)
 
 
 @router.post("/{auction_id}/close", response_model=AuctionResponse)
@@ -113,4 +163,62 @@ def cancel_auction(
     """
     Cancel an active auction. Can only be done by the seller if no bids exist.
     """
-    return auction_service.cancel_auction(auction_id, username, db)
\ No newline at end of file
+    return auction_service.cancel_auction(auction_id, username, db)
+
+
+def _auction_exists(auction_id: int) -> bool:
+    db = SessionLocal()
+    try:
+        return db.query(Auction.id).filter(Auction.id == auction_id).first() is not None
+    finally:
+        db.close()
+
+
+def _watched_auction_ids(username: str) -> List[int]:
+    db = SessionLocal()
+    try:
+        return auction_service.get_watched_auction_ids(username, db)
+    finally:
+        db.close()
+
+
+def _event_stream(subscription: AuctionSubscription) -> StreamingResponse:
+    hub = get_event_hub()
+
+    async def events():
+        try:
+            async for event in subscription.stream(hub.keepalive):
+                if event is None:
+                    yield ": keepalive\n\n"
+                else:
+                    yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            hub.unsubscribe(subscription)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+async def _pump_websocket(websocket: WebSocket, subscription: AuctionSubscription):
+    hub = get_event_hub()
+    await websocket.accept()
+
+    async def wait_for_disconnect():
+        # Clients don't send anything; this only notices when they go away
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+
+    receiver = asyncio.create_task(wait_for_disconnect())
+    try:
+        async for event in subscription.stream(hub.keepalive):
+            if receiver.done():
+                break
+            await websocket.send_json(event or {"type": "keepalive"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        hub.unsubscribe(subscription)
@@ -1,18 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, Path, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query, Response, status
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from database.connection import get_db
 from services.auth_service import AuthService
 from services.database_service import DatabaseService
 from services.namecheap_management_service import NamecheapManagementService
+from services.dns_template_service import DnsTemplateService
 from models.api_dto import (
     DomainInfoResponse,
+    DNSRecordRequest,
     DNSRecordResponse,
     DNSUpdateRequest,
     URLForwardingRequest,
     DomainStatusResponse,
-    HostingSetupResponse
+    DomainDashboardEntry,
+    DomainDashboardResponse,
+    HostingSetupResponse,
+    DnsTemplateRequest,
+    DnsTemplateResponse,
+    DnsTemplateApplyRequest
 )
 from models.db_models import Domain, User
 
@@ -20,6 +28,7 @@ router = APIRouter()
 auth_service = AuthService()
 database_service = DatabaseService()
 management_service = NamecheapManagementService()
+dns_template_service = DnsTemplateService()
 
 
 def verify_domain_ownership(sld: str, tld: str, username: str, db: Session):
@@ -87,6 +96,7 @@ def get_domain_info(
 
 @router.get("/manage/{sld}/{tld}/dns", response_model=List[DNSRecordResponse])
 def get_dns_records(
+        response: Response,
         sld: str = Path(..., description="Second-level domain"),
         tld: str = Path(..., description="Top-level domain"),
         username: str = Depends(auth_service.verify_token),
@@ -100,19 +110,26 @@ def get_dns_records(
     - Hostnames and addresses
     - TTL values
     - MX priorities (for MX records)
+
+    The ETag response header identifies this version of the record set; send it
+    back as If-Match when changing records to avoid overwriting someone else's edit.
     """
     # Verify ownership
     verify_domain_ownership(sld, tld, username, db)
 
     # Get DNS records from Namecheap
-    return management_service.get_dns_records(sld, tld)
+    records = management_service.get_dns_records(sld, tld)
+    response.headers["ETag"] = management_service.dns_etag(records)
+    return records
 
 
 @router.post("/manage/{sld}/{tld}/dns/update", response_model=List[DNSRecordResponse])
 def update_dns_records(
         request: DNSUpdateRequest,
+        response: Response,
         sld: str = Path(..., description="Second-level domain"),
         tld: str = Path(..., description="Top-level domain"),
+        if_match: Optional[str] = Header(None, description="ETag from GET .../dns; 412 if records changed since"),
         username: str = Depends(auth_service.verify_token),
         db: Session = Depends(get_db)
 ):
@@ -153,7 +170,76 @@ def update_dns_records(
     verify_domain_ownership(sld, tld, username, db)
 
     # Update DNS records
-    return management_service.update_dns_records(sld, tld, request.records)
+    records = management_service.update_dns_records(sld, tld, request.records, if_match)
+    response.headers["ETag"] = management_service.dns_etag(records)
+    return records
+
+
+@router.post("/manage/{sld}/{tld}/dns/records", response_model=List[DNSRecordResponse])
+def add_dns_record(
+        record: DNSRecordRequest,
+        response: Response,
+        sld: str = Path(..., description="Second-level domain"),
+        tld: str = Path(..., description="Top-level domain"),
+        if_match: Optional[str] = Header(None, description="ETag from GET .../dns; 412 if records changed since"),
+        username: str = Depends(auth_service.verify_token),
+        db: Session = Depends(get_db)
+):
+    """
+    Add a single DNS record and keep all existing ones.
+
+    The server merges the record into the current record set and saves it with
+    one Namecheap call. Returns the full updated list with a new ETag.
+    """
+    verify_domain_ownership(sld, tld, username, db)
+
+    records = management_service.add_dns_record(sld, tld, record, if_match)
+    response.headers["ETag"] = management_service.dns_etag(records)
+    return records
+
+
+@router.put("/manage/{sld}/{tld}/dns/records/{host_id}", response_model=List[DNSRecordResponse])
+def modify_dns_record(
+        record: DNSRecordRequest,
+        response: Response,
+        sld: str = Path(..., description="Second-level domain"),
+        tld: str = Path(..., description="Top-level domain"),
+        host_id: str = Path(..., description="host_id of the record, from GET .../dns"),
+        if_match: Optional[str] = Header(None, description="ETag from GET .../dns; 412 if records changed since"),
+        username: str = Depends(auth_service.verify_token),
+        db: Session = Depends(get_db)
+):
+    """
+    Replace a single DNS record and keep all other ones.
+    Host ids can change after every update, so send If-Match with the ETag of
+    the list the host id was taken from.
+    """
+    verify_domain_ownership(sld, tld, username, db)
+
+    records = management_service.modify_dns_record(sld, tld, host_id, record, if_match)
+    response.headers["ETag"] = management_service.dns_etag(records)
+    return records
+
+
+@router.delete("/manage/{sld}/{tld}/dns/records/{host_id}", response_model=List[DNSRecordResponse])
+def remove_dns_record(
+        response: Response,
+        sld: str = Path(..., description="Second-level domain"),
+        tld: str = Path(..., description="Top-level domain"),
+        host_id: str = Path(..., description="host_id of the record, from GET .../dns"),
+        if_match: Optional[str] = Header(None, description="ETag from GET .../dns; 412 if records changed since"),
+        username: str = Depends(auth_service.verify_token),
+        db: Session = Depends(get_db)
+):
+    """
+    Remove a single DNS record and keep all other ones.
+    Send If-Match with the ETag of the list the host id was taken from.
+    """
+    verify_domain_ownership(sld, tld, username, db)
+
+    records = management_service.remove_dns_record(sld, tld, host_id, if_match)
+    response.headers["ETag"] = management_service.dns_etag(records)
+    return records
 
 
 @router.post("/manage/{sld}/{tld}/forward")
@@ -253,6 +339,50 @@ def get_domain_status(
     return management_service.get_domain_status(sld, tld, username)
 
 
+@router.get("/manage/dashboard", response_model=DomainDashboardResponse)
+def get_domains_dashboard(
+        page: int = Query(1, ge=1),
+        page_size: int = Query(25, ge=1, le=100),
+        username: str = Depends(auth_service.verify_token),
+        db: Session = Depends(get_db)
+):
+    """
+    Get the status of all domains owned by the authenticated user, one page at a time.
+
+    Returns the same status as `/manage/{sld}/{tld}/status` for every domain on
+    the page. Data is served from the local registrar mirror and DNS cache where
+    possible; the rest is fetched from Namecheap a few domains at a time. Sections
+    that could not be loaded are explained per domain in `status.errors`.
+    """
+    user = db.query(User).filter(User.username == username).first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+
+    # Ownership is implied by the query, so no per-domain ownership checks are needed
+    query = db.query(Domain).filter(Domain.user_id == user.id)
+    total = query.count()
+    domains = query.order_by(Domain.domain_name).offset((page - 1) * page_size).limit(page_size).all()
+
+    statuses = management_service.get_domains_status([domain.domain_name for domain in domains])
+
+    entries = []
+    for domain in domains:
+        sld, tld = domain.domain_name.rsplit('.', 1)
+        entries.append(DomainDashboardEntry(
+            domain_name=domain.domain_name,
+            sld=sld,
+            tld=tld,
+            expiry_date=domain.expiry_date,
+            auto_renew_enabled=bool(domain.auto_renew_enabled),
+            status=statuses[domain.domain_name]
+        ))
+
+    return DomainDashboardResponse(page=page, page_size=page_size, total=total, domains=entries)
+
+
 @router.get("/manage/my-domains")
 def list_my_manageable_domains(
         username: str = Depends(auth_service.verify_token),
@@ -297,4 +427,80 @@ def list_my_manageable_domains(
                 "management_url": f"/domains/manage/{sld}/{tld}/status"
             })
 
-    return {"domains": manageable_domains}
\ No newline at end of file
+    return {"domains": manageable_domains}
+
+
+@router.post("/manage/dns-templates", response_model=DnsTemplateResponse)
+def create_dns_template(
+        request: DnsTemplateRequest,
+        username: str = Depends(auth_service.verify_token),
+        db: Session = Depends(get_db)
+):
+    """
+    Save a DNS template that can be applied to many domains at once.
+
+    Use "{domain}" in an address to insert each domain's name, e.g. a hosting template:
+    ```json
+    {
+      "name": "Hosting",
+      "mode": "merge",
+      "records": [
+        {"hostname": "@", "record_type": "A", "address": "34.123.45.6"},
+        {"hostname": "www", "record_type": "CNAME", "address": "{domain}."}
+      ]
+    }
+    ```
+    In "merge" mode only existing records with the same hostname and type are
+    replaced; "replace" mode replaces all records.
+    """
+    return dns_template_service.create_template(request, username, db)
+
+
+@router.get("/manage/dns-templates", response_model=List[DnsTemplateResponse])
+def list_dns_templates(
+        username: str = Depends(auth_service.verify_token),
+        db: Session = Depends(get_db)
+):
+    """List the authenticated user's DNS templates."""
+    return dns_template_service.list_templates(username, db)
+
+
+@router.delete("/manage/dns-templates/{template_id}")
+def delete_dns_template(
+        template_id: int,
+        username: str = Depends(auth_service.verify_token),
+        db: Session = Depends(get_db)
+):
+    """Delete a DNS template. Jobs already started keep their copy of the records."""
+    dns_template_service.delete_template(template_id, username, db)
+    return {"success": True}
+
+
+@router.post("/manage/dns-templates/{template_id}/apply")
+def apply_dns_template(
+        template_id: int,
+        request: DnsTemplateApplyRequest,
+        username: str = Depends(auth_service.verify_token),
+        db: Session = Depends(get_db)
+):
+    """
+    Apply a DNS template to several of your domains in the background.
+
+    Returns 202 with a job id; poll the status URL for per-domain progress.
+    Failed domains are retried automatically.
+    """
+    job_id = dns_template_service.start_apply_job(template_id, request.domains, username, db)
+    return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content={
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/domains/manage/dns-jobs/{job_id}"
+    })
+
+
+@router.get("/manage/dns-jobs/{job_id}")
+def get_dns_template_job(
+        job_id: str,
+        username: str = Depends(auth_service.verify_token)
+):
+    """Status, progress and per-domain results of a DNS template job."""
+    return dns_template_service.get_job(job_id, username)
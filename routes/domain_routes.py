@@ -1,31 +1,146 @@
-from fastapi import APIRouter, Query, Depends, HTTPException, status
+import json
+from fastapi import APIRouter, Query, Depends, HTTPException, Response, status, UploadFile, File
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import List
 from database.connection import get_db
 from sqlalchemy.orm import Session
-from models.api_dto import PaymentRequest, UserDomainResponse
+from models.api_dto import PaymentRequest, UserDomainResponse, BulkCheckRequest
 from models.db_models import User, Domain
 from services import payment_service
 from services.namecheap_service import NamecheapService
 from services.auth_service import AuthService
 from services.database_service import DatabaseService
+from services.trending_snapshot import TrendingSnapshot
+from services.rate_limiter import RateLimitExceeded
+from services.circuit_breaker import CircuitOpenError
+from services.bulk_availability import (BulkCheckJobStore, normalize_domain_list, parse_domain_file,
+                                        BULK_CHECK_MAX_DOMAINS, BULK_CHECK_SYNC_LIMIT, BULK_CHECK_MAX_UPLOAD_BYTES)
 
 router = APIRouter()
 namecheap = NamecheapService()
 payment = payment_service.PaymentService()
 auth_service = AuthService()
 database_service = DatabaseService()
+trending_snapshot = TrendingSnapshot()
+bulk_jobs = BulkCheckJobStore()
 
 @router.get("/check")
 def check_domain(domain: str = Query(...), username: str = Depends(auth_service.verify_token)):
     """Check availability of a single domain."""
     if not domain:
         return {"error": "No domain provided"}
-    return namecheap.check_domain_availability(domain)
+    try:
+        return namecheap.check_domain_availability(domain)
+    except RateLimitExceeded as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, round(e.retry_after)))}
+        )
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, round(e.retry_after)))}
+        )
+
+@router.get("/check/stream")
+def check_domain_stream(domain: str = Query(...), username: str = Depends(auth_service.verify_token)):
+    """
+    Streaming version of /check (newline-delimited JSON).
+
+    Events are sent as soon as they are known:
+    - {"event": "domain", ...}: the exact-match result, always first
+    - {"event": "suggestions", "suggestions": [...]}: available suggestions from one batch
+    - {"event": "error", "error": ..., "retry_after": s}: the search was rate limited or Namecheap is unavailable
+    - {"event": "done", "checked": n}: end of the stream
+    """
+    def event_stream():
+        for event in namecheap.iter_domain_availability(domain):
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+@router.post("/check/bulk")
+def check_domains_bulk(request: BulkCheckRequest, background: bool = Query(False),
+                       username: str = Depends(auth_service.verify_token)):
+    """
+    Bulk availability check for a list of domain names.
+
+    Names are normalized and deduplicated (names without a TLD get .com). Up to
+    BULK_CHECK_SYNC_LIMIT names are checked right away and streamed back as NDJSON:
+    - {"event": "accepted", "total": n, "invalid": [...]}
+    - {"event": "results", "results": [...]}: one per cache lookup or Namecheap batch
+    - {"event": "error", ...}: the check was rate limited; remaining names were not checked
+    - {"event": "done", "checked": n}
+    Larger lists (or background=true) run as a Celery job: the response is 202 with a
+    job_id to poll at GET /domains/check/bulk/{job_id}.
+    """
+    return _start_bulk_check(request.domains, username, background)
+
+@router.post("/check/bulk/upload")
+def check_domains_bulk_upload(file: UploadFile = File(...), background: bool = Query(False),
+                              username: str = Depends(auth_service.verify_token)):
+    """Same as /check/bulk, reading the names from an uploaded text or CSV file."""
+    content = file.file.read(BULK_CHECK_MAX_UPLOAD_BYTES + 1)
+    if len(content) > BULK_CHECK_MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"File is larger than {BULK_CHECK_MAX_UPLOAD_BYTES} bytes")
+    return _start_bulk_check(parse_domain_file(content), username, background)
+
+@router.get("/check/bulk/{job_id}")
+def get_bulk_check_job(job_id: str, offset: int = Query(0, ge=0), limit: int = Query(500, ge=1, le=1000),
+                       username: str = Depends(auth_service.verify_token)):
+    """Status, progress and a page of results of a bulk availability job."""
+    job = bulk_jobs.get(job_id, offset, limit)
+    if job is None or job.pop("username") != username:
+        raise HTTPException(status_code=404, detail="Bulk check job not found")
+    return job
+
+def _start_bulk_check(raw_names: List[str], username: str, background: bool):
+    domains, invalid = normalize_domain_list(raw_names)
+    if not domains:
+        raise HTTPException(status_code=400, detail={"message": "No valid domain names provided", "invalid": invalid[:100]})
+    if len(domains) > BULK_CHECK_MAX_DOMAINS:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"At most {BULK_CHECK_MAX_DOMAINS} domains can be checked at once")
+
+    if background or len(domains) > BULK_CHECK_SYNC_LIMIT:
+        from celery_worker import run_bulk_availability_check
+
+        job_id = bulk_jobs.create(username, domains, invalid)
+        run_bulk_availability_check.delay(job_id)
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content={
+            "job_id": job_id,
+            "status": "queued",
+            "total": len(domains),
+            "invalid": invalid,
+            "status_url": f"/domains/check/bulk/{job_id}"
+        })
+
+    def event_stream():
+        yield json.dumps({"event": "accepted", "total": len(domains), "invalid": invalid}) + "\n"
+        checked = 0
+        try:
+            for results in namecheap.iter_bulk_availability(domains):
+                checked += len(results)
+                yield json.dumps({"event": "results", "results": results}) + "\n"
+        except (RateLimitExceeded, CircuitOpenError) as e:
+            yield json.dumps({"event": "error", "error": str(e), "retry_after": round(e.retry_after, 1)}) + "\n"
+        yield json.dumps({"event": "done", "checked": checked}) + "\n"
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
 
 @router.get("/trending-domains")
-def trending_domains(username: str = Depends(auth_service.verify_token)):
-    """Gets the trending domains"""
-    return namecheap.get_trending_available_domains()
+def trending_domains(response: Response, username: str = Depends(auth_service.verify_token)):
+    """
+    Gets the trending domains from the precomputed snapshot.
+    The snapshot's age is returned in the X-Snapshot-Generated-At and X-Snapshot-Stale headers.
+    """
+    snapshot = trending_snapshot.get_or_build(namecheap.get_trending_available_domains)
+    response.headers["X-Snapshot-Generated-At"] = snapshot["generated_at"]
+    response.headers["X-Snapshot-Stale"] = str(snapshot["stale"]).lower()
+    return snapshot["domains"]
 
 @router.get("/trending-tlds")
 def get_trending_tlds(username: str = Depends(auth_service.verify_token)):
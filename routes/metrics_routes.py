@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends
+
+from services.auth_service import AuthService
+from services.domain_batcher import get_domain_batcher
+from services.pricing_catalog import get_pricing_catalog
+from services.availability_cache import get_availability_cache
+from services.single_flight import get_single_flight_stats
+from services.rate_limiter import get_rate_limiter
+from services.circuit_breaker import get_circuit_breaker_stats
+from services.namecheap_client import get_namecheap_client
+from services.executors import get_executor_stats
+from services.registered_index import get_registered_index
+from services.dns_cache import get_dns_cache
+from services.registrar_sync import get_last_run
+
+router = APIRouter()
+auth_service = AuthService()
+
+
+@router.get("/namecheap")
+def namecheap_metrics(username: str = Depends(auth_service.verify_token)):
+    """
+    Runtime metrics for outbound Namecheap traffic in this worker process.
+    Used to tune batching, caching and rate-limit settings.
+    """
+    return {
+        "domain_check_batching": get_domain_batcher().get_stats(),
+        "pricing_catalog": get_pricing_catalog().get_info(),
+        "availability_cache": get_availability_cache().get_stats(),
+        "registered_index": get_registered_index().get_stats(),
+        "dns_cache": get_dns_cache().get_stats(),
+        "single_flight": get_single_flight_stats(),
+        "rate_limiter": get_rate_limiter().get_stats(),
+        "circuit_breakers": get_circuit_breaker_stats(),
+        "client": get_namecheap_client().get_stats(),
+        "executors": get_executor_stats(),
+        "registrar_sync": get_last_run(),
+    }
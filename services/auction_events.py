@@ -0,0 +1,165 @@
+import os
+import json
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import AsyncIterator, Dict, Iterable, Optional, Set
+
+import redis
+import redis.asyncio as aioredis
+from dotenv import load_dotenv
+
+from database.redis_connection import REDIS_URL, get_redis
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+AUCTION_EVENTS_CHANNEL = "auction:events:{auction_id}"
+AUCTION_EVENTS_PATTERN = "auction:events:*"
+
+
+def publish_auction_event(event_type: str, auction_id: int, **fields) -> bool:
+    """
+    Publishes an auction event ("bid", "closed", "cancelled") to every API worker.
+    Called after the change is committed; a Redis failure only costs the push,
+    clients still see the change on their next fetch.
+    """
+    event = {"type": event_type, "auction_id": auction_id, "at": datetime.utcnow().isoformat(), **fields}
+    try:
+        get_redis().publish(AUCTION_EVENTS_CHANNEL.format(auction_id=auction_id), json.dumps(event, default=str))
+        return True
+    except redis.RedisError as e:
+        logger.warning("Could not publish %s event for auction %s: %s", event_type, auction_id, e)
+        return False
+
+
+class AuctionSubscription:
+    """
+    One client's stream of auction events, either for a fixed set of auctions or
+    for everything a user sells or bids on ("my auctions"). Events are buffered in
+    a bounded queue; a client that falls behind gets a single "resync" event,
+    telling it to fetch the auction again, instead of an ever-growing backlog.
+    """
+
+    def __init__(self, auction_ids: Iterable[int] = (), username: Optional[str] = None, queue_size: int = 100):
+        self.auction_ids: Set[int] = set(auction_ids)
+        self.username = username
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def matches(self, event: Dict) -> bool:
+        if event.get("auction_id") in self.auction_ids:
+            return True
+        if self.username and self.username in (event.get("seller_username"), event.get("bidder_username")):
+            # Auctions the user starts bidding on (or sells) after subscribing
+            self.auction_ids.add(event["auction_id"])
+            return True
+        return False
+
+    def push(self, event: Dict):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "resync", "auction_id": event.get("auction_id")})
+
+    async def stream(self, keepalive: float) -> AsyncIterator[Optional[Dict]]:
+        """Yields events as they arrive, and None after `keepalive` seconds of silence."""
+        while True:
+            try:
+                yield await asyncio.wait_for(self.queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield None
+
+
+class AuctionEventHub:
+    """
+    Fans auction events out to the WebSocket/SSE clients of this API worker.
+    The worker holds a single Redis PSUBSCRIBE on all auction channels, however
+    many clients are connected, and routes each event to the matching
+    subscriptions in memory. The listener starts with the first subscriber and
+    reconnects with backoff if Redis goes away.
+    """
+
+    def __init__(self, redis_url: str = REDIS_URL):
+        self.redis_url = redis_url
+        self.queue_size = int(os.getenv("AUCTION_EVENTS_QUEUE_SIZE", "100"))
+        self.keepalive = float(os.getenv("AUCTION_EVENTS_KEEPALIVE", "15"))
+        self.subscriptions: Set[AuctionSubscription] = set()
+        self.connected = False
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, auction_ids: Iterable[int] = (), username: Optional[str] = None) -> AuctionSubscription:
+        """Registers a subscription; must be called from the event loop."""
+        subscription = AuctionSubscription(auction_ids, username, self.queue_size)
+        self.subscriptions.add(subscription)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._listen())
+        return subscription
+
+    def unsubscribe(self, subscription: AuctionSubscription):
+        self.subscriptions.discard(subscription)
+
+    def dispatch(self, event: Dict):
+        for subscription in list(self.subscriptions):
+            if subscription.matches(event):
+                subscription.push(event)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _listen(self):
+        backoff = 1
+        reconnecting = False
+        while True:
+            client = aioredis.Redis.from_url(self.redis_url, decode_responses=True, health_check_interval=30)
+            pubsub = client.pubsub()
+            try:
+                await pubsub.psubscribe(AUCTION_EVENTS_PATTERN)
+                if reconnecting:
+                    # Events may have been missed while disconnected
+                    self._resync_all()
+                self.connected = True
+                reconnecting = True
+                backoff = 1
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    try:
+                        self.dispatch(json.loads(message["data"]))
+                    except (ValueError, KeyError) as e:
+                        logger.warning("Ignoring malformed auction event: %s", e)
+            except redis.RedisError as e:
+                logger.warning("Auction event subscription lost, retrying in %ss: %s", backoff, e)
+            finally:
+                self.connected = False
+                await pubsub.aclose()
+                await client.aclose()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+    def _resync_all(self):
+        for subscription in list(self.subscriptions):
+            subscription.push({"type": "resync", "auction_id": None})
+
+
+_hub_lock = threading.Lock()
+_hub: Optional[AuctionEventHub] = None
+
+
+def get_event_hub() -> AuctionEventHub:
+    """Returns the process-wide AuctionEventHub."""
+    global _hub
+    if _hub is None:
+        with _hub_lock:
+            if _hub is None:
+                _hub = AuctionEventHub()
+    return _hub
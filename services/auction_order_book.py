@@ -0,0 +1,386 @@
+import os
+import time
+import logging
+import threading
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+import redis
+from dotenv import load_dotenv
+
+from database.redis_connection import get_redis
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+BOOK_KEY = "auction:{auction_id}:book"
+BOOK_BIDS_KEY = "auction:{auction_id}:bids"
+PENDING_BIDS_STREAM = "auction:bids:pending"
+PERSIST_GROUP = "bid-persister"
+FLUSH_SCHEDULED_KEY = "auction:bids:flush-scheduled"
+
+# Creates an auction's book from Postgres unless it already exists (or was closed):
+# KEYS[1] = book hash, KEYS[2] = top bids sorted set
+# ARGV[1] = TTL, ARGV[2] = number of hash field/value pairs that follow, then score/member pairs
+LOAD_BOOK_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+local pairs_count = tonumber(ARGV[2])
+local i = 3
+for _ = 1, pairs_count do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+    i = i + 2
+end
+while i <= #ARGV do
+    redis.call('ZADD', KEYS[2], ARGV[i], ARGV[i + 1])
+    i = i + 2
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+return 1
+"""
+
+# Validates and accepts one bid atomically:
+# KEYS[1] = book hash, KEYS[2] = top bids sorted set, KEYS[3] = pending bids stream
+# ARGV[1] = auction id, ARGV[2] = bidder id, ARGV[3] = bidder username,
+# ARGV[4] = amount in cents, ARGV[5] = now in ms, ARGV[6] = top bids to keep
+# Returns {"ok", previous leader id, bid count} or {reason[, minimum in cents]}
+PLACE_BID_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return {'missing'}
+end
+local book = redis.call('HMGET', KEYS[1], 'status', 'end_ms', 'seller_id', 'start_cents', 'highest_cents', 'leader_id')
+if book[1] ~= 'ACTIVE' then
+    return {'inactive'}
+end
+if tonumber(ARGV[5]) >= tonumber(book[2]) then
+    return {'ended'}
+end
+if book[3] == ARGV[2] then
+    return {'own'}
+end
+local highest = tonumber(book[5])
+local minimum = highest >= 0 and highest or tonumber(book[4])
+if tonumber(ARGV[4]) <= minimum then
+    return {'low', tostring(minimum)}
+end
+local count = redis.call('HINCRBY', KEYS[1], 'count', 1)
+redis.call('HSET', KEYS[1], 'highest_cents', ARGV[4], 'leader_id', ARGV[2])
+redis.call('ZADD', KEYS[2], ARGV[4], count .. ':' .. ARGV[5] .. ':' .. ARGV[3])
+redis.call('ZREMRANGEBYRANK', KEYS[2], 0, -(tonumber(ARGV[6]) + 1))
+redis.call('XADD', KEYS[3], '*', 'auction_id', ARGV[1], 'bidder_id', ARGV[2],
+           'amount_cents', ARGV[4], 'seq', count, 'created_ms', ARGV[5])
+return {'ok', book[6] or '', tostring(count)}
+"""
+
+
+class BidRejected(Exception):
+    """A bid the order book did not accept. reason is "inactive", "ended", "own" or "low"."""
+
+    def __init__(self, reason: str, minimum: Optional[Decimal] = None):
+        super().__init__(reason)
+        self.reason = reason
+        self.minimum = minimum
+
+
+class BookMissing(Exception):
+    """The auction has no book in Redis yet; load it from Postgres and retry."""
+
+
+def to_cents(amount) -> int:
+    return int((Decimal(str(amount)) * 100).quantize(Decimal(1)))
+
+
+def from_cents(cents) -> Decimal:
+    return (Decimal(int(cents)) / 100).quantize(Decimal("0.01"))
+
+
+def to_ms(value: datetime) -> int:
+    """Epoch milliseconds of a naive UTC datetime, as stored in the database."""
+    return int(value.replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def from_ms(value) -> datetime:
+    return datetime.utcfromtimestamp(int(value) / 1000)
+
+
+def bid_from_entry(fields: Dict) -> Dict:
+    """A bids-table row from a pending bids stream entry."""
+    return {
+        "auction_id": int(fields["auction_id"]),
+        "bidder_id": int(fields["bidder_id"]),
+        "bid_amount": from_cents(fields["amount_cents"]),
+        "order_book_seq": int(fields["seq"]),
+        "created_at": from_ms(fields["created_ms"]),
+    }
+
+
+def new_bids(bids: List[Dict], existing) -> List[Dict]:
+    """Bids whose (auction_id, order_book_seq) is not in `existing`, each once."""
+    seen = set(existing)
+    result = []
+    for bid in bids:
+        key = (bid["auction_id"], bid["order_book_seq"])
+        if key not in seen:
+            seen.add(key)
+            result.append(bid)
+    return result
+
+
+def latest_bids(bids: List[Dict]) -> Dict[int, Dict]:
+    """The bid with the highest sequence number per auction; bids only go up, so also the highest bid."""
+    latest = {}
+    for bid in bids:
+        if bid["order_book_seq"] > latest.get(bid["auction_id"], {}).get("order_book_seq", -1):
+            latest[bid["auction_id"]] = bid
+    return latest
+
+
+class AuctionOrderBook:
+    """
+    Optional Redis front for bidding on active auctions (AUCTION_ORDER_BOOK_ENABLED).
+
+    Each auction's book is a hash (status, end time, start price, highest bid,
+    leader, bid count) plus a sorted set of its top bids. A Lua script validates
+    and accepts a bid in one round trip and appends it to a Redis stream; the
+    auctions row is never locked on the bid path. A Celery task drains the stream
+    into the bids table (write-behind) and updates the auction's denormalized bid
+    columns once per batch.
+
+    Postgres stays the system of record: a missing book is rebuilt from the
+    auctions and bids tables on the next bid. Before an auction is closed or
+    cancelled its book is closed and its highest bid is written straight from
+    the book, so the winner never depends on how far the stream has been drained.
+    """
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None):
+        self.redis = redis_client or get_redis()
+        self.enabled = os.getenv("AUCTION_ORDER_BOOK_ENABLED", "false").lower() == "true"
+        self.top_bids = int(os.getenv("AUCTION_ORDER_BOOK_TOP", "20"))
+        self.flush_delay = float(os.getenv("AUCTION_ORDER_BOOK_FLUSH_DELAY", "1"))
+        self.batch_size = int(os.getenv("AUCTION_ORDER_BOOK_BATCH", "500"))
+        self.reclaim_idle_ms = int(os.getenv("AUCTION_ORDER_BOOK_RECLAIM_IDLE_MS", "60000"))
+        self._load_script = self.redis.register_script(LOAD_BOOK_SCRIPT)
+        self._place_script = self.redis.register_script(PLACE_BID_SCRIPT)
+        self._group_lock = threading.Lock()
+        self._group_ready = False
+
+    # ---- bid path ----
+
+    def place_bid(self, auction_id: int, bidder_id: int, bidder_username: str, amount,
+                  now: Optional[datetime] = None) -> Tuple[Optional[int], int]:
+        """
+        Accepts a bid or raises BidRejected / BookMissing.
+        Returns (previous leader id or None, the auction's bid count after this bid).
+        """
+        now_ms = to_ms(now or datetime.utcnow())
+        result = self._place_script(
+            keys=[self._book_key(auction_id), self._bids_key(auction_id), PENDING_BIDS_STREAM],
+            args=[auction_id, bidder_id, bidder_username, to_cents(amount), now_ms, self.top_bids]
+        )
+        outcome = result[0]
+        if outcome == "missing":
+            raise BookMissing()
+        if outcome != "ok":
+            raise BidRejected(outcome, from_cents(result[1]) if len(result) > 1 else None)
+        return (int(result[1]) if result[1] else None), int(result[2])
+
+    def load(self, auction, top_bids: List) -> bool:
+        """
+        Creates the auction's book from its Postgres state and top bids (with bidders
+        loaded). Does nothing if a book exists, so concurrent loads are harmless.
+        """
+        end_ms = to_ms(auction.end_time)
+        fields = {
+            "status": auction.status.value,
+            "end_ms": end_ms,
+            "seller_id": auction.seller_id,
+            "start_cents": to_cents(auction.start_price),
+            "highest_cents": to_cents(auction.current_highest_bid) if auction.current_highest_bid is not None else -1,
+            "leader_id": auction.current_leader_id or "",
+            "count": auction.bid_count or 0,
+            "domain_name": auction.domain.domain_name,
+            "seller_username": auction.seller.username,
+            "start_price": str(auction.start_price),
+            "end_time": auction.end_time.isoformat(),
+        }
+        args = [self._ttl(end_ms), len(fields)]
+        for name, value in fields.items():
+            args += [name, value]
+        for bid in top_bids:
+            created_ms = to_ms(bid.created_at) if bid.created_at else 0
+            args += [to_cents(bid.bid_amount), f"{bid.order_book_seq or bid.id}:{created_ms}:{bid.bidder.username}"]
+        return bool(self._load_script(keys=[self._book_key(auction.id), self._bids_key(auction.id)], args=args))
+
+    def close(self, auction_id: int, status: str = "CLOSING"):
+        """
+        Stops the book from accepting bids. Also written when no book exists, so a
+        bid racing the closure cannot rebuild it from the still-active Postgres row.
+        """
+        pipe = self.redis.pipeline()
+        pipe.hset(self._book_key(auction_id), "status", status)
+        pipe.expire(self._book_key(auction_id), 86400)
+        pipe.execute()
+
+    def snapshot(self, auction_id: int) -> Optional[Dict]:
+        """The book's current state and top bids, for bid responses."""
+        pipe = self.redis.pipeline()
+        pipe.hgetall(self._book_key(auction_id))
+        pipe.zrevrange(self._bids_key(auction_id), 0, -1, withscores=True)
+        book, bids = pipe.execute()
+        if not book or "domain_name" not in book:
+            return None
+
+        top_bids = []
+        for member, score in bids:
+            _, created_ms, username = member.split(":", 2)
+            top_bids.append({
+                "bidder_username": username,
+                "bid_amount": float(from_cents(score)),
+                "created_at": from_ms(created_ms),
+            })
+        highest = int(book["highest_cents"])
+        return {
+            "id": auction_id,
+            "domain_name": book["domain_name"],
+            "seller_username": book["seller_username"],
+            "start_price": float(book["start_price"]),
+            "current_highest_bid": float(from_cents(highest)) if highest >= 0 else None,
+            "end_time": datetime.fromisoformat(book["end_time"]),
+            "status": book["status"],
+            "bids": top_bids,
+        }
+
+    def final_bid(self, auction_id: int) -> Optional[Dict]:
+        """
+        The latest (and so highest) bid accepted by the book, as a bids-table row,
+        or None if the book is missing or has no bids. Call after close().
+        """
+        pipe = self.redis.pipeline()
+        pipe.hmget(self._book_key(auction_id), "count", "highest_cents", "leader_id")
+        pipe.zrevrange(self._bids_key(auction_id), 0, 0)
+        (count, highest, leader_id), top = pipe.execute()
+        if not count or int(count) == 0 or not leader_id or int(highest) < 0 or not top:
+            return None
+        _, created_ms, _ = top[0].split(":", 2)
+        return {
+            "auction_id": auction_id,
+            "bidder_id": int(leader_id),
+            "bid_amount": from_cents(highest),
+            "order_book_seq": int(count),
+            "created_at": from_ms(created_ms),
+        }
+
+    def schedule_flush(self) -> bool:
+        """
+        Returns True for at most one caller per AUCTION_ORDER_BOOK_FLUSH_DELAY across
+        all workers; that caller should queue the persistence task.
+        """
+        try:
+            return bool(self.redis.set(FLUSH_SCHEDULED_KEY, 1, nx=True, px=max(1, int(self.flush_delay * 1000))))
+        except redis.RedisError as e:
+            # The periodic flush still persists the bids
+            logger.warning("Could not schedule bid persistence: %s", e)
+            return False
+
+    # ---- write-behind ----
+
+    def persist_pending(self, db, consumer: str = "worker", max_batches: int = 100) -> int:
+        """
+        Writes accepted bids from the stream to the bids table and the auctions'
+        denormalized bid columns, then acknowledges them. Bids already written by
+        an earlier, interrupted run or by an auction closure (same auction and
+        sequence number) are skipped. Returns the number of bids written.
+        """
+        self._ensure_group()
+        written = 0
+        for _ in range(max_batches):
+            entries = self._claim_stale(consumer)
+            if not entries:
+                response = self.redis.xreadgroup(PERSIST_GROUP, consumer, {PENDING_BIDS_STREAM: ">"},
+                                                 count=self.batch_size)
+                entries = response[0][1] if response else []
+            if not entries:
+                break
+            written += self.write_bids(db, [bid_from_entry(fields) for _, fields in entries])
+            db.commit()
+            ids = [entry_id for entry_id, _ in entries]
+            self.redis.xack(PENDING_BIDS_STREAM, PERSIST_GROUP, *ids)
+            self.redis.xdel(PENDING_BIDS_STREAM, *ids)
+        return written
+
+    def _claim_stale(self, consumer: str) -> List:
+        """Takes over bids read by a worker that died before acknowledging them."""
+        result = self.redis.xautoclaim(PENDING_BIDS_STREAM, PERSIST_GROUP, consumer,
+                                       min_idle_time=self.reclaim_idle_ms, start_id="0-0", count=self.batch_size)
+        return [entry for entry in result[1] if entry[1]]
+
+    @staticmethod
+    def write_bids(db, bids: List[Dict]) -> int:
+        """
+        Inserts the bids that are not in the table yet and moves each auction's bid
+        columns forward. The auctions rows are locked first, so the persistence
+        task and an auction closure writing the same bid take turns and the second
+        one sees the first one's row. Does not commit.
+        """
+        from models.db_models import Auction, Bid
+
+        auction_ids = sorted({bid["auction_id"] for bid in bids})
+        db.query(Auction.id).filter(Auction.id.in_(auction_ids)).order_by(Auction.id).with_for_update().all()
+        existing = set(db.query(Bid.auction_id, Bid.order_book_seq).filter(
+            Bid.auction_id.in_(auction_ids),
+            Bid.order_book_seq.in_({bid["order_book_seq"] for bid in bids})
+        ).all())
+        bids_to_insert = new_bids(bids, existing)
+        db.bulk_insert_mappings(Bid, bids_to_insert)
+
+        for auction_id, bid in latest_bids(bids).items():
+            db.query(Auction).filter(
+                Auction.id == auction_id,
+                (Auction.bid_count == None) | (Auction.bid_count < bid["order_book_seq"])  # noqa: E711
+            ).update({
+                "current_highest_bid": bid["bid_amount"],
+                "current_leader_id": bid["bidder_id"],
+                "bid_count": bid["order_book_seq"],
+            }, synchronize_session=False)
+        return len(bids_to_insert)
+
+    def _ensure_group(self):
+        if self._group_ready:
+            return
+        with self._group_lock:
+            try:
+                self.redis.xgroup_create(PENDING_BIDS_STREAM, PERSIST_GROUP, id="0", mkstream=True)
+            except redis.ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+            self._group_ready = True
+
+    def _ttl(self, end_ms: int) -> int:
+        # Keep the book a day past the auction's end so late bids are still rejected from Redis
+        return max(3600, int(end_ms / 1000 - time.time()) + 86400)
+
+    @staticmethod
+    def _book_key(auction_id: int) -> str:
+        return BOOK_KEY.format(auction_id=auction_id)
+
+    @staticmethod
+    def _bids_key(auction_id: int) -> str:
+        return BOOK_BIDS_KEY.format(auction_id=auction_id)
+
+
+_book_lock = threading.Lock()
+_book: Optional[AuctionOrderBook] = None
+
+
+def get_order_book() -> AuctionOrderBook:
+    """Returns the process-wide AuctionOrderBook."""
+    global _book
+    if _book is None:
+        with _book_lock:
+            if _book is None:
+                _book = AuctionOrderBook()
+    return _book
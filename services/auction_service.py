@@ -1,14 +1,26 @@
+import os
+import redis
 import stripe
+from decimal import Decimal
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
 from datetime import datetime, timedelta
 from models.db_models import User, Domain, Auction, Bid, AuctionStatus, TransactionType
 from models.api_dto import AuctionCreateRequest, BidCreateRequest, AuctionResponse, BidResponse
 from typing import List
 from services.payment_service import PaymentService
+from services.auction_order_book import BidRejected, BookMissing, get_order_book
+from services.auction_events import publish_auction_event
 
 
 class AuctionService:
+    def __init__(self):
+        # Bids included in the response to a new bid; the full history is at GET /auctions/{id}
+        self.bid_response_limit = int(os.getenv("AUCTION_BID_RESPONSE_LIMIT", "10"))
+        # Optional Redis front for bids on active auctions (AUCTION_ORDER_BOOK_ENABLED)
+        self.order_book = get_order_book()
+
     def create_auction(self, request: AuctionCreateRequest, username: str, db: Session):
         # Find the user who is creating the auction
         seller = db.query(User).filter(User.username == username).first()
@@ -37,73 +49,229 @@ class AuctionService:
             seller_id=seller.id,
             start_price=request.start_price,
             end_time=end_time,
-            status=AuctionStatus.ACTIVE
+            status=AuctionStatus.ACTIVE,
+            bid_count=0
         )
         db.add(new_auction)
         db.commit()
         db.refresh(new_auction)
         return new_auction
 
+    def submit_bid(self, auction_id: int, request: BidCreateRequest, username: str, db: Session) -> AuctionResponse:
+        """
+        Places a bid and returns the auction with its top bids. Goes through the Redis
+        order book when it is enabled, otherwise straight to the database.
+        """
+        if self.order_book.enabled:
+            return self._place_bid_in_order_book(auction_id, request, username, db)
+        auction = self.place_bid(auction_id, request, username, db)
+        return self._format_auction_response(auction, bids=self.get_top_bids(auction.id, db))
+
     def place_bid(self, auction_id: int, request: BidCreateRequest, username: str, db: Session):
+        """
+        Places a bid. The auction row is locked (SELECT ... FOR UPDATE) while the bid is
+        checked against the denormalized highest bid and recorded, so concurrent bids on
+        the same auction are applied one at a time and only ever increase the price.
+        """
         from celery_worker import send_push_notification_task
         # find the bidder and the auction
         bidder = db.query(User).filter(User.username == username).first()
-        auction = db.query(Auction).get(auction_id)
 
         if not bidder.stripe_payment_method_id:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Setup payment method not found.")
 
-        if not auction:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Auction not found.")
+        auction = db.query(Auction).filter(Auction.id == auction_id).with_for_update().first()
 
-        # validation checks
-        if auction.status != AuctionStatus.ACTIVE:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="This auction is not active.")
+        try:
+            if not auction:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Auction not found.")
 
-        if auction.end_time < datetime.utcnow():
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="This auction has already ended.")
+            # validation checks
+            if auction.status != AuctionStatus.ACTIVE:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="This auction is not active.")
 
-        if auction.seller_id == bidder.id:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You cannot bid on your own auction.")
+            if auction.end_time < datetime.utcnow():
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="This auction has already ended.")
 
-        # check if bid amount is valid
-        highest_bid = db.query(Bid).filter(Bid.auction_id == auction_id).order_by(Bid.bid_amount.desc()).first()
+            if auction.seller_id == bidder.id:
+                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You cannot bid on your own auction.")
 
-        min_bid_amount = highest_bid.bid_amount if highest_bid else auction.start_price
+            # check if bid amount is valid
+            self._ensure_bid_state(auction, db)
+            min_bid_amount = auction.current_highest_bid if auction.current_highest_bid is not None \
+                else auction.start_price
 
-        if request.amount <= min_bid_amount:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
-                                detail=f"Your bid must be higher than the current highest bid of ${min_bid_amount}.")
+            if request.amount <= min_bid_amount:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                    detail=f"Your bid must be higher than the current highest bid of ${min_bid_amount}.")
+        except HTTPException:
+            db.rollback()  # release the row lock
+            raise
 
-        previous_highest_bid = (
-            db.query(Bid)
-            .filter(Bid.auction_id == auction_id)
-            .order_by(Bid.bid_amount.desc())
-            .first()
-        )
+        previous_leader_id = auction.current_leader_id
 
-        # create and save the new bid
-        new_bid = Bid(
+        # create and save the new bid together with the auction's new highest bid
+        auction.current_highest_bid = Decimal(str(request.amount))
+        auction.current_leader_id = bidder.id
+        auction.bid_count += 1
+        db.add(Bid(
             auction_id=auction.id,
             bidder_id=bidder.id,
-            bid_amount=request.amount
-        )
-        db.add(new_bid)
+            bid_amount=request.amount,
+            order_book_seq=auction.bid_count
+        ))
         db.commit()
-        db.refresh(auction)  # Refresh auction to show new bid
-        print("Checking previous high bid")
-        if previous_highest_bid:
-            # Don't notify if the previous bidder is the same person
-            if previous_highest_bid.bidder_id != bidder.id:
-                print("Bid outbidden notification sent")
-                send_push_notification_task.delay(
-                    user_id=previous_highest_bid.bidder_id,
-                    title="You've been outbid!",
-                    body=f"Someone bid ${request.amount} on {auction.domain.domain_name}. Bid now to win!",
-                    data={"type": "auction", "id": auction.id}
-                )
+
+        publish_auction_event(
+            "bid", auction.id, domain_name=auction.domain.domain_name, seller_username=auction.seller.username,
+            bidder_username=bidder.username, amount=float(request.amount), bid_count=auction.bid_count,
+            end_time=auction.end_time.isoformat()
+        )
+
+        # Don't notify if the previous bidder is the same person
+        if previous_leader_id and previous_leader_id != bidder.id:
+            send_push_notification_task.delay(
+                user_id=previous_leader_id,
+                title="You've been outbid!",
+                body=f"Someone bid ${request.amount} on {auction.domain.domain_name}. Bid now to win!",
+                data={"type": "auction", "id": auction.id}
+            )
         return auction
 
+    def _place_bid_in_order_book(self, auction_id: int, request: BidCreateRequest, username: str,
+                                 db: Session) -> AuctionResponse:
+        """
+        Accepts a bid in the auction's Redis order book without touching the auctions
+        row. The bid is written to the database shortly after by the write-behind task.
+        """
+        from celery_worker import persist_order_book_bids, send_push_notification_task
+
+        bidder = db.query(User).filter(User.username == username).first()
+        if not bidder.stripe_payment_method_id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Setup payment method not found.")
+
+        try:
+            try:
+                previous_leader_id, bid_count = self.order_book.place_bid(
+                    auction_id, bidder.id, bidder.username, request.amount)
+            except BookMissing:
+                self._load_order_book(auction_id, db)
+                previous_leader_id, bid_count = self.order_book.place_bid(
+                    auction_id, bidder.id, bidder.username, request.amount)
+        except BidRejected as e:
+            raise HTTPException(**self._rejection(e))
+        except redis.RedisError:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                                detail="Bidding is temporarily unavailable, please try again.")
+
+        if self.order_book.schedule_flush():
+            persist_order_book_bids.apply_async(countdown=self.order_book.flush_delay)
+
+        # The bid is accepted now; if the book can't be read back, answer from the database
+        try:
+            snapshot = self.order_book.snapshot(auction_id)
+        except redis.RedisError:
+            snapshot = None
+        if snapshot is not None:
+            snapshot["bids"] = [BidResponse(**bid) for bid in snapshot["bids"][:self.bid_response_limit]]
+            response = AuctionResponse(**snapshot)
+        else:
+            response = self._response_with_accepted_bid(auction_id, bidder, request.amount, db)
+
+        publish_auction_event(
+            "bid", auction_id, domain_name=response.domain_name, seller_username=response.seller_username,
+            bidder_username=bidder.username, amount=float(request.amount), bid_count=bid_count,
+            end_time=response.end_time.isoformat()
+        )
+
+        # Don't notify if the previous bidder is the same person
+        if previous_leader_id and previous_leader_id != bidder.id:
+            send_push_notification_task.delay(
+                user_id=previous_leader_id,
+                title="You've been outbid!",
+                body=f"Someone bid ${request.amount} on {response.domain_name}. Bid now to win!",
+                data={"type": "auction", "id": auction_id}
+            )
+        return response
+
+    def _response_with_accepted_bid(self, auction_id: int, bidder: User, amount: float,
+                                    db: Session) -> AuctionResponse:
+        """
+        The auction as stored in the database plus a bid the order book just accepted,
+        which the write-behind task may not have saved yet.
+        """
+        auction = db.query(Auction).filter(Auction.id == auction_id).first()
+        response = self._format_auction_response(auction, bids=self.get_top_bids(auction.id, db))
+        if response.current_highest_bid is None or response.current_highest_bid < float(amount):
+            response.current_highest_bid = float(amount)
+            accepted = BidResponse(bidder_username=bidder.username, bid_amount=float(amount),
+                                   created_at=datetime.utcnow())
+            response.bids = [accepted] + response.bids[:self.bid_response_limit - 1]
+        return response
+
+    def _load_order_book(self, auction_id: int, db: Session):
+        """Builds an auction's order book from the database (first bid, or after Redis lost it)."""
+        auction = db.query(Auction).filter(Auction.id == auction_id).with_for_update().first()
+        if not auction:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Auction not found.")
+        self._ensure_bid_state(auction, db)
+        db.commit()
+        self.order_book.load(auction, self.get_top_bids(auction.id, db, limit=self.order_book.top_bids))
+
+    @staticmethod
+    def _rejection(error: BidRejected) -> dict:
+        if error.reason == "own":
+            return {"status_code": status.HTTP_403_FORBIDDEN, "detail": "You cannot bid on your own auction."}
+        if error.reason == "ended":
+            return {"status_code": status.HTTP_400_BAD_REQUEST, "detail": "This auction has already ended."}
+        if error.reason == "low":
+            return {"status_code": status.HTTP_400_BAD_REQUEST,
+                    "detail": f"Your bid must be higher than the current highest bid of ${error.minimum}."}
+        return {"status_code": status.HTTP_400_BAD_REQUEST, "detail": "This auction is not active."}
+
+    def _finalize_order_book(self, auction: Auction, db: Session):
+        """
+        Before a locked auction is closed or cancelled: stops its order book from
+        taking bids and writes the book's highest bid to the database, so the winner
+        is known even if the persistence task has not caught up (or holds that bid
+        right now). Lower bids still in the stream are written later by the task.
+        """
+        if not self.order_book.enabled:
+            return
+        try:
+            self.order_book.close(auction.id)
+            final_bid = self.order_book.final_bid(auction.id)
+        except redis.RedisError:
+            db.rollback()
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                                detail="Pending bids could not be saved, please try again.")
+        if final_bid and (auction.bid_count or 0) < final_bid["order_book_seq"]:
+            self.order_book.write_bids(db, [final_bid])
+            db.expire(auction)  # bid columns were updated in SQL
+
+    def get_top_bids(self, auction_id: int, db: Session, limit: int = None) -> List[Bid]:
+        """The highest bids of an auction with their bidders, in one query."""
+        return (
+            db.query(Bid)
+            .options(joinedload(Bid.bidder))
+            .filter(Bid.auction_id == auction_id)
+            .order_by(Bid.bid_amount.desc())
+            .limit(limit or self.bid_response_limit)
+            .all()
+        )
+
+    def _ensure_bid_state(self, auction: Auction, db: Session):
+        """
+        Fills in the denormalized bid columns of an auction created before they
+        existed, from its bids. Called with the auction row locked.
+        """
+        if auction.bid_count is not None:
+            return
+        top_bid = db.query(Bid).filter(Bid.auction_id == auction.id).order_by(Bid.bid_amount.desc()).first()
+        auction.bid_count = db.query(func.count(Bid.id)).filter(Bid.auction_id == auction.id).scalar()
+        auction.current_highest_bid = top_bid.bid_amount if top_bid else None
+        auction.current_leader_id = top_bid.bidder_id if top_bid else None
+
     def get_auction_details(self, auction_id: int, db: Session):
         auction = db.query(Auction).get(auction_id)
         if not auction:
@@ -115,7 +283,7 @@ class AuctionService:
         return [self._format_auction_response(auc) for auc in auctions]
 
     def close_auction(self, auction_id: int, username: str, db: Session):
-        auction = db.query(Auction).get(auction_id)
+        auction = db.query(Auction).filter(Auction.id == auction_id).with_for_update().first()
         user = db.query(User).filter(User.username == username).first()
 
         if not auction:
@@ -128,15 +296,20 @@ class AuctionService:
         if auction.status != AuctionStatus.ACTIVE:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Auction is not active.")
 
+        self._finalize_order_book(auction, db)
+
         return self._process_auction_closure(auction, db)
 
     def _system_close_auction(self, auction_id: int, db: Session):
         """ Internal method for the system (Celery worker) to close an auction. """
-        auction = db.query(Auction).get(auction_id)
+        # Row lock: waits for bids in progress and blocks new ones until the auction is closed
+        auction = db.query(Auction).filter(Auction.id == auction_id).with_for_update().first()
         if not auction or auction.status != AuctionStatus.ACTIVE:
             # Auction might have been closed or cancelled by the user in the meantime.
             return
 
+        self._finalize_order_book(auction, db)
+
         return self._process_auction_closure(auction, db)
 
     def _process_auction_closure(self, auction: Auction, db: Session):
@@ -212,11 +385,18 @@ class AuctionService:
         auction.status = AuctionStatus.CLOSED
         db.commit()
         db.refresh(auction)
+
+        publish_auction_event(
+            "closed", auction.id, domain_name=auction.domain.domain_name, seller_username=auction.seller.username,
+            winner_username=auction.winner.username if auction.winner else None,
+            amount=float(winning_bid.bid_amount) if winning_bid else None
+        )
         return self._format_auction_response(auction)
 
     def cancel_auction(self, auction_id: int, username: str, db: Session):
         """ Cancels an auction. Can only be done by the seller if no bids exist. """
-        auction = db.query(Auction).get(auction_id)
+        # Row lock: a bid can't be committed between the status check and the cancellation
+        auction = db.query(Auction).filter(Auction.id == auction_id).with_for_update().first()
         user = db.query(User).filter(User.username == username).first()
 
         if not auction:
@@ -235,14 +415,27 @@ class AuctionService:
         #     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
         #                         detail="Cannot cancel an auction that already has bids.")
 
+        self._finalize_order_book(auction, db)
+
         auction.status = AuctionStatus.CANCELLED
         db.commit()
         db.refresh(auction)
+
+        publish_auction_event("cancelled", auction.id, domain_name=auction.domain.domain_name,
+                              seller_username=auction.seller.username)
         return self._format_auction_response(auction)
 
-    def _format_auction_response(self, auction: Auction):
-        """Helper to format the response model consistently."""
-        highest_bid = auction.bids[0].bid_amount if auction.bids else None
+    def _format_auction_response(self, auction: Auction, bids: List[Bid] = None):
+        """
+        Helper to format the response model consistently.
+        Lists the given bids, or all of the auction's bids if none are given.
+        """
+        if bids is None:
+            bids = auction.bids
+        if auction.bid_count is not None:
+            highest_bid = auction.current_highest_bid
+        else:
+            highest_bid = auction.bids[0].bid_amount if auction.bids else None
 
         return AuctionResponse(
             id=auction.id,
@@ -257,7 +450,7 @@ class AuctionService:
                 bidder_username=bid.bidder.username,
                 bid_amount=float(bid.bid_amount),
                 created_at=bid.created_at
-            ) for bid in auction.bids]
+            ) for bid in bids]
         )
 
     def get_auctions_by_seller(self, username: str, db: Session) -> List[AuctionResponse]:
@@ -283,6 +476,19 @@ class AuctionService:
         ).all()
         return [self._format_auction_response(auc) for auc in auctions]
 
+    def get_watched_auction_ids(self, username: str, db: Session) -> List[int]:
+        """ Ids of the active auctions the user sells or has bid on, for "my auctions" updates. """
+        user = db.query(User).filter(User.username == username).first()
+        if not user:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found.")
+
+        bidded = db.query(Bid.auction_id).filter(Bid.bidder_id == user.id)
+        rows = db.query(Auction.id).filter(
+            Auction.status == AuctionStatus.ACTIVE,
+            (Auction.seller_id == user.id) | Auction.id.in_(bidded)
+        ).all()
+        return [row[0] for row in rows]
+
     def get_auctions_won_by_user(self, username: str, db: Session) -> List[AuctionResponse]:
         winner_user = db.query(User).filter(User.username == username).first()
         if not winner_user:
@@ -0,0 +1,119 @@
+import os
+import json
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import redis
+from dotenv import load_dotenv
+
+from database.redis_connection import get_redis
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+AVAILABILITY_KEY = "namecheap:availability:{domain}"
+
+
+class AvailabilityCache:
+    """
+    Per-domain cache of namecheap.domains.check results in Redis.
+
+    Available and taken results get separate TTLs: an available name can be
+    registered by someone else at any moment, while a taken name almost never
+    frees up within minutes, so "taken" can be cached much longer.
+    """
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None,
+                 available_ttl: Optional[int] = None, taken_ttl: Optional[int] = None):
+        self.redis = redis_client or get_redis()
+        self.available_ttl = available_ttl or int(os.getenv("AVAILABILITY_CACHE_TTL_AVAILABLE", "60"))
+        self.taken_ttl = taken_ttl or int(os.getenv("AVAILABILITY_CACHE_TTL_TAKEN", "900"))
+
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+
+    def get_many(self, domains: List[str]) -> Tuple[Dict[str, dict], List[str]]:
+        """
+        Looks up cached results for the domains.
+
+        Returns:
+            (cached results keyed by domain, list of domains that must be checked upstream)
+        """
+        if not domains:
+            return {}, []
+
+        try:
+            values = self.redis.mget([self._key(domain) for domain in domains])
+        except redis.RedisError as e:
+            logger.warning("Availability cache read failed: %s", e)
+            with self._lock:
+                self._errors += 1
+                self._misses += len(domains)
+            return {}, list(domains)
+
+        hits, misses = {}, []
+        for domain, value in zip(domains, values):
+            if value is None:
+                misses.append(domain)
+            else:
+                hits[domain] = json.loads(value)
+
+        with self._lock:
+            self._hits += len(hits)
+            self._misses += len(misses)
+        return hits, misses
+
+    def set_many(self, results: Dict[str, dict]):
+        """Stores fresh domains.check results, each with the TTL for its availability."""
+        if not results:
+            return
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for domain, data in results.items():
+                value = {
+                    "available": data["available"],
+                    "is_premium": data["is_premium"],
+                    "price": data["price"]
+                }
+                ttl = self.available_ttl if data["available"] else self.taken_ttl
+                pipe.set(self._key(domain), json.dumps(value), ex=ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning("Availability cache write failed: %s", e)
+            with self._lock:
+                self._errors += 1
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "errors": self._errors,
+                "hit_ratio": round(self._hits / lookups, 3) if lookups else None,
+                "available_ttl": self.available_ttl,
+                "taken_ttl": self.taken_ttl
+            }
+
+    @staticmethod
+    def _key(domain: str) -> str:
+        return AVAILABILITY_KEY.format(domain=domain.lower())
+
+
+_cache_lock = threading.Lock()
+_cache: Optional[AvailabilityCache] = None
+
+
+def get_availability_cache() -> AvailabilityCache:
+    """Returns the process-wide AvailabilityCache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AvailabilityCache()
+    return _cache
@@ -0,0 +1,154 @@
+import os
+import re
+import json
+import time
+import uuid
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import redis
+from dotenv import load_dotenv
+
+from database.redis_connection import get_redis
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+JOB_KEY = "bulkcheck:job:{job_id}"
+JOB_INPUT_KEY = "bulkcheck:job:{job_id}:input"
+JOB_RESULTS_KEY = "bulkcheck:job:{job_id}:results"
+
+BULK_CHECK_MAX_DOMAINS = int(os.getenv("BULK_CHECK_MAX_DOMAINS", "5000"))
+BULK_CHECK_SYNC_LIMIT = int(os.getenv("BULK_CHECK_SYNC_LIMIT", "250"))
+BULK_CHECK_MAX_UPLOAD_BYTES = int(os.getenv("BULK_CHECK_MAX_UPLOAD_BYTES", str(512 * 1024)))
+
+_LABEL = re.compile(r"^(?!-)[a-z0-9-]{1,63}(?<!-)$")
+_TLD = re.compile(r"^[a-z][a-z0-9-]{1,62}$")
+_SEPARATORS = re.compile(r"[\s,;]+")
+
+
+def normalize_domain(raw: str, default_tld: str = "com") -> Optional[str]:
+    """
+    Normalizes user input such as " HTTPS://www.Example.com/ " to "example.com".
+    Names without a TLD get default_tld. Returns None if the name is not a valid domain.
+    """
+    name = raw.strip().lower()
+    name = re.sub(r"^[a-z]+://", "", name).split("/", 1)[0].strip(".")
+    if name.startswith("www."):
+        name = name[4:]
+    if not name:
+        return None
+    if "." not in name:
+        name = f"{name}.{default_tld}"
+
+    labels = name.split(".")
+    if len(name) > 253 or not _TLD.match(labels[-1]) or not all(_LABEL.match(label) for label in labels[:-1]):
+        return None
+    return name
+
+
+def normalize_domain_list(raw_names: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """Returns (normalized unique domains in input order, invalid inputs)."""
+    domains, invalid = {}, []
+    for raw in raw_names:
+        if not raw or not raw.strip():
+            continue
+        domain = normalize_domain(raw)
+        if domain is None:
+            invalid.append(raw.strip())
+        else:
+            domains.setdefault(domain, None)
+    return list(domains), invalid
+
+
+def parse_domain_file(content: bytes) -> List[str]:
+    """
+    Reads domain names from an uploaded text or CSV file: one per line, or separated
+    by commas, semicolons or whitespace. A "domain" header line is ignored.
+    """
+    text = content.decode("utf-8-sig", errors="replace")
+    names = [name for name in _SEPARATORS.split(text) if name]
+    if names and names[0].lower() in ("domain", "domains", "name", "domain_name"):
+        names = names[1:]
+    return names
+
+
+class BulkCheckJobStore:
+    """
+    Redis storage for bulk availability jobs run by Celery.
+
+    The job hash holds status and progress, the input list is stored once so the
+    task message stays small, and results are appended batch by batch so clients
+    can page through them while the job is still running.
+    """
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None):
+        self.redis = redis_client or get_redis()
+        self.ttl = int(os.getenv("BULK_CHECK_JOB_TTL", "86400"))
+
+    def create(self, username: str, domains: List[str], invalid: List[str]) -> str:
+        job_id = uuid.uuid4().hex
+        key = JOB_KEY.format(job_id=job_id)
+        pipe = self.redis.pipeline()
+        pipe.hset(key, mapping={
+            "status": "queued",
+            "username": username,
+            "total": len(domains),
+            "checked": 0,
+            "failed": 0,
+            "invalid": json.dumps(invalid),
+            "created_at": time.time(),
+        })
+        pipe.set(JOB_INPUT_KEY.format(job_id=job_id), json.dumps(domains))
+        for k in (key, JOB_INPUT_KEY.format(job_id=job_id)):
+            pipe.expire(k, self.ttl)
+        pipe.execute()
+        return job_id
+
+    def get_input(self, job_id: str) -> List[str]:
+        raw = self.redis.get(JOB_INPUT_KEY.format(job_id=job_id))
+        return json.loads(raw) if raw else []
+
+    def set_status(self, job_id: str, status: str, error: Optional[str] = None):
+        mapping = {"status": status}
+        if error:
+            mapping["error"] = error
+        if status in ("completed", "failed"):
+            mapping["finished_at"] = time.time()
+        self.redis.hset(JOB_KEY.format(job_id=job_id), mapping=mapping)
+
+    def append_results(self, job_id: str, results: List[Dict]):
+        if not results:
+            return
+        results_key = JOB_RESULTS_KEY.format(job_id=job_id)
+        failed = sum(1 for result in results if result.get("available") is None)
+        pipe = self.redis.pipeline()
+        pipe.rpush(results_key, *[json.dumps(result) for result in results])
+        pipe.expire(results_key, self.ttl)
+        pipe.hincrby(JOB_KEY.format(job_id=job_id), "checked", len(results))
+        if failed:
+            pipe.hincrby(JOB_KEY.format(job_id=job_id), "failed", failed)
+        pipe.execute()
+
+    def get(self, job_id: str, offset: int = 0, limit: int = 500) -> Optional[Dict]:
+        """Returns the job's status, progress and one page of its results, or None if unknown."""
+        meta = self.redis.hgetall(JOB_KEY.format(job_id=job_id))
+        if not meta:
+            return None
+
+        results = self.redis.lrange(JOB_RESULTS_KEY.format(job_id=job_id), offset, offset + limit - 1)
+        total, checked = int(meta["total"]), int(meta["checked"])
+        return {
+            "job_id": job_id,
+            "username": meta["username"],
+            "status": meta["status"],
+            "total": total,
+            "checked": checked,
+            "failed": int(meta.get("failed", 0)),
+            "progress": round(checked / total, 3) if total else 1.0,
+            "invalid": json.loads(meta.get("invalid", "[]")),
+            "error": meta.get("error"),
+            "results": [json.loads(result) for result in results],
+            "next_offset": offset + len(results) if offset + len(results) < checked else None,
+        }
@@ -0,0 +1,146 @@
+import os
+import time
+import logging
+import threading
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Namecheap while the command's circuit is open."""
+
+    def __init__(self, command: str, retry_after: float):
+        self.command = command
+        self.retry_after = retry_after
+        super().__init__(f"{command} is temporarily unavailable (circuit open), retry in {retry_after:.0f}s")
+
+
+class CircuitBreaker:
+    """
+    Per-command circuit breaker for calls to Namecheap.
+
+    After failure_threshold consecutive failures (network errors, timeouts or 5xx
+    responses) the circuit opens and calls fail immediately with CircuitOpenError
+    instead of tying up a worker for the full timeout. After reset_timeout one
+    probe call is let through (half-open): success closes the circuit, failure
+    opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: Optional[int] = None, reset_timeout: Optional[float] = None,
+                 enabled: Optional[bool] = None):
+        self.name = name
+        self.enabled = enabled if enabled is not None else os.getenv("NAMECHEAP_BREAKER_ENABLED", "true").lower() == "true"
+        self.failure_threshold = failure_threshold or int(os.getenv("NAMECHEAP_BREAKER_FAILURE_THRESHOLD", "5"))
+        self.reset_timeout = reset_timeout or float(os.getenv("NAMECHEAP_BREAKER_RESET_TIMEOUT", "30"))
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._times_opened = 0
+        self._rejected = 0
+        self._successes = 0
+        self._failures = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def is_open(self) -> bool:
+        """True while calls would be rejected. Does not use up the half-open probe."""
+        if not self.enabled:
+            return False
+        with self._lock:
+            state = self._current_state()
+            return state == OPEN or (state == HALF_OPEN and self._probe_in_flight)
+
+    def before_call(self):
+        """Raises CircuitOpenError if the call must not be sent."""
+        if not self.enabled:
+            return
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            self._rejected += 1
+            retry_after = max(1.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+        raise CircuitOpenError(self.name, retry_after)
+
+    def release(self):
+        """Gives back a half-open probe slot taken by before_call() for a call that was never sent."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self._successes += 1
+            self._consecutive_failures = 0
+            if self._state != CLOSED:
+                logger.info("Circuit for %s closed", self.name)
+            self._state = CLOSED
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._consecutive_failures += 1
+            state = self._current_state()
+            if state == HALF_OPEN or (state == CLOSED and self._consecutive_failures >= self.failure_threshold):
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+                self._times_opened += 1
+                logger.warning("Circuit for %s opened after %d consecutive failures",
+                               self.name, self._consecutive_failures)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "state": self._current_state() if self.enabled else "disabled",
+                "consecutive_failures": self._consecutive_failures,
+                "times_opened": self._times_opened,
+                "rejected": self._rejected,
+                "successes": self._successes,
+                "failures": self._failures,
+            }
+
+
+_breakers_lock = threading.Lock()
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(command: str) -> CircuitBreaker:
+    """Returns the process-wide circuit breaker for a Namecheap command."""
+    with _breakers_lock:
+        breaker = _breakers.get(command)
+        if breaker is None:
+            breaker = CircuitBreaker(command)
+            _breakers[command] = breaker
+        return breaker
+
+
+def get_circuit_breaker_stats() -> Dict[str, Dict]:
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {name: breaker.get_stats() for name, breaker in breakers.items()}
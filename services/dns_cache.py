@@ -0,0 +1,226 @@
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+import redis
+from dotenv import load_dotenv
+
+from database.redis_connection import get_redis
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DNS_HOSTS_KEY = "namecheap:dns:{domain}"
+DNS_GENERATION_KEY = "namecheap:dns:{domain}:gen"
+DNS_LOCK_KEY = "namecheap:dns:{domain}:lock"
+
+# Stores a read-through result only if no write happened since the read started:
+# KEYS[1] = hosts key, KEYS[2] = generation key
+# ARGV[1] = generation seen before the fetch ("" if none), ARGV[2] = records JSON, ARGV[3] = TTL
+FILL_IF_UNCHANGED_SCRIPT = """
+local current = redis.call('GET', KEYS[2]) or ''
+if current ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', tonumber(ARGV[3]))
+return 1
+"""
+
+# Releases the edit lock only if we still own it
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class DnsEditInProgress(Exception):
+    """Raised when another request holds the DNS edit lock for a domain for too long."""
+
+    def __init__(self, domain: str):
+        super().__init__(f"Another DNS change for {domain} is in progress")
+        self.domain = domain
+
+
+class DnsHostCache:
+    """
+    Per-domain cache of namecheap.domains.dns.getHosts results in Redis.
+
+    Reads go through the cache. Writes made through this backend (setHosts) bump
+    a per-domain generation and replace or drop the cached records, so a getHosts
+    that started before the write cannot put stale records back. The TTL bounds
+    how long changes made outside this backend (e.g. in the Namecheap panel) stay
+    invisible.
+    """
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None, ttl: Optional[int] = None):
+        self.redis = redis_client or get_redis()
+        self.ttl = ttl or int(os.getenv("DNS_CACHE_TTL", "300"))
+        self.enabled = os.getenv("DNS_CACHE_ENABLED", "true").lower() == "true"
+        self._fill_script = self.redis.register_script(FILL_IF_UNCHANGED_SCRIPT)
+        self._release_script = self.redis.register_script(RELEASE_LOCK_SCRIPT)
+        self.lock_ttl = float(os.getenv("DNS_EDIT_LOCK_TTL", "30"))
+        self.lock_wait = float(os.getenv("DNS_EDIT_LOCK_WAIT", "5"))
+
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+
+    def get(self, domain: str) -> Tuple[Optional[List[Dict]], str]:
+        """
+        Returns (cached records or None, generation token). Pass the token to fill()
+        after fetching the records upstream.
+        """
+        if not self.enabled:
+            return None, ""
+        try:
+            records, generation = self.redis.mget([self._key(domain), self._generation_key(domain)])
+        except redis.RedisError as e:
+            logger.warning("DNS cache read failed for %s: %s", domain, e)
+            with self._lock:
+                self._errors += 1
+                self._misses += 1
+            return None, ""
+
+        with self._lock:
+            if records is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return (json.loads(records) if records is not None else None), generation or ""
+
+    def get_many(self, domains: List[str]) -> Dict[str, Tuple[Optional[List[Dict]], str]]:
+        """get() for several domains with one MGET."""
+        if not self.enabled or not domains:
+            return {domain: (None, "") for domain in domains}
+        keys = []
+        for domain in domains:
+            keys += [self._key(domain), self._generation_key(domain)]
+        try:
+            values = self.redis.mget(keys)
+        except redis.RedisError as e:
+            logger.warning("DNS cache read failed for %d domains: %s", len(domains), e)
+            with self._lock:
+                self._errors += 1
+                self._misses += len(domains)
+            return {domain: (None, "") for domain in domains}
+
+        results = {}
+        for i, domain in enumerate(domains):
+            records, generation = values[2 * i], values[2 * i + 1]
+            results[domain] = (json.loads(records) if records is not None else None), generation or ""
+        hits = sum(1 for records, _ in results.values() if records is not None)
+        with self._lock:
+            self._hits += hits
+            self._misses += len(domains) - hits
+        return results
+
+    def fill(self, domain: str, records: List[Dict], generation: str):
+        """Caches freshly read records unless the domain was written to since get()."""
+        if not self.enabled:
+            return
+        try:
+            self._fill_script(keys=[self._key(domain), self._generation_key(domain)],
+                              args=[generation, json.dumps(records), self.ttl])
+        except redis.RedisError as e:
+            logger.warning("DNS cache write failed for %s: %s", domain, e)
+            with self._lock:
+                self._errors += 1
+
+    def put(self, domain: str, records: List[Dict]):
+        """Stores records read back right after a successful setHosts."""
+        self._write(domain, records)
+
+    def invalidate(self, domain: str):
+        """Drops the cached records after a setHosts whose result we did not read back."""
+        self._write(domain, None)
+
+    def _write(self, domain: str, records: Optional[List[Dict]]):
+        if not self.enabled:
+            return
+        try:
+            pipe = self.redis.pipeline()
+            pipe.incr(self._generation_key(domain))
+            pipe.expire(self._generation_key(domain), max(self.ttl * 2, 3600))
+            if records is None:
+                pipe.delete(self._key(domain))
+            else:
+                pipe.set(self._key(domain), json.dumps(records), ex=self.ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            # The TTL still bounds how long stale records can be served
+            logger.warning("DNS cache invalidation failed for %s: %s", domain, e)
+            with self._lock:
+                self._errors += 1
+
+    @contextmanager
+    def edit_lock(self, domain: str):
+        """
+        Serializes read-modify-write DNS edits for one domain across all workers.
+        Raises DnsEditInProgress if the lock cannot be taken within DNS_EDIT_LOCK_WAIT.
+        If Redis is unavailable the edit proceeds unlocked; ETag checks still apply.
+        """
+        key = DNS_LOCK_KEY.format(domain=domain.lower())
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.lock_wait
+        acquired = False
+        try:
+            while not self.redis.set(key, token, nx=True, px=int(self.lock_ttl * 1000)):
+                if time.monotonic() >= deadline:
+                    raise DnsEditInProgress(domain)
+                time.sleep(0.05)
+            acquired = True
+        except redis.RedisError as e:
+            logger.warning("DNS edit lock unavailable for %s, continuing without it: %s", domain, e)
+
+        try:
+            yield
+        finally:
+            if acquired:
+                try:
+                    self._release_script(keys=[key], args=[token])
+                except redis.RedisError as e:
+                    # The lock expires on its own after DNS_EDIT_LOCK_TTL
+                    logger.warning("DNS edit lock release failed for %s: %s", domain, e)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "hits": self._hits,
+                "misses": self._misses,
+                "errors": self._errors,
+                "hit_ratio": round(self._hits / lookups, 3) if lookups else None,
+                "ttl": self.ttl
+            }
+
+    @staticmethod
+    def _key(domain: str) -> str:
+        return DNS_HOSTS_KEY.format(domain=domain.lower())
+
+    @staticmethod
+    def _generation_key(domain: str) -> str:
+        return DNS_GENERATION_KEY.format(domain=domain.lower())
+
+
+_cache_lock = threading.Lock()
+_cache: Optional[DnsHostCache] = None
+
+
+def get_dns_cache() -> DnsHostCache:
+    """Returns the process-wide DnsHostCache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = DnsHostCache()
+    return _cache
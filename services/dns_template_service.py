@@ -0,0 +1,95 @@
+import os
+from typing import List
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from models.api_dto import DnsTemplateRequest
+from models.db_models import DnsTemplate, Domain, User
+from services.dns_templates import DnsTemplateJobStore
+
+
+class DnsTemplateService:
+    def __init__(self):
+        self.jobs = DnsTemplateJobStore()
+        self.max_domains = int(os.getenv("DNS_TEMPLATE_MAX_DOMAINS", "500"))
+
+    def create_template(self, request: DnsTemplateRequest, username: str, db: Session) -> DnsTemplate:
+        """Saves a DNS template for the authenticated user."""
+        user = self._get_user(username, db)
+        template = DnsTemplate(
+            user_id=user.id,
+            name=request.name,
+            mode=request.mode,
+            records=[record.model_dump() for record in request.records]
+        )
+        db.add(template)
+        db.commit()
+        db.refresh(template)
+        return template
+
+    def list_templates(self, username: str, db: Session) -> List[DnsTemplate]:
+        user = self._get_user(username, db)
+        return db.query(DnsTemplate).filter(DnsTemplate.user_id == user.id).order_by(DnsTemplate.id).all()
+
+    def delete_template(self, template_id: int, username: str, db: Session):
+        template = self._get_template(template_id, username, db)
+        db.delete(template)
+        db.commit()
+
+    def start_apply_job(self, template_id: int, domain_names: List[str], username: str, db: Session) -> str:
+        """
+        Queues a Celery job applying the template to the given domains.
+        All domains must belong to the user. Returns the job id.
+        """
+        from celery_worker import apply_dns_template_job
+
+        template = self._get_template(template_id, username, db)
+        domain_names = list(dict.fromkeys(name.strip().lower() for name in domain_names if name.strip()))
+        if not domain_names:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No domains given")
+        if len(domain_names) > self.max_domains:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"A template can be applied to at most {self.max_domains} domains at once"
+            )
+
+        owned = {
+            name for (name,) in db.query(Domain.domain_name).filter(
+                Domain.user_id == template.user_id,
+                Domain.domain_name.in_(domain_names)
+            ).all()
+        }
+        not_owned = [name for name in domain_names if name not in owned]
+        if not_owned:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail={"message": "You do not own these domains", "domains": not_owned[:100]}
+            )
+
+        job_id = self.jobs.create(username, template.id, template.name, template.mode,
+                                  template.records, domain_names)
+        apply_dns_template_job.delay(job_id)
+        return job_id
+
+    def get_job(self, job_id: str, username: str) -> dict:
+        job = self.jobs.get(job_id)
+        if job is None or job.pop("username") != username:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="DNS template job not found")
+        return job
+
+    def _get_user(self, username: str, db: Session) -> User:
+        user = db.query(User).filter(User.username == username).first()
+        if not user:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        return user
+
+    def _get_template(self, template_id: int, username: str, db: Session) -> DnsTemplate:
+        user = self._get_user(username, db)
+        template = db.query(DnsTemplate).filter(
+            DnsTemplate.id == template_id,
+            DnsTemplate.user_id == user.id
+        ).first()
+        if not template:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="DNS template not found")
+        return template
@@ -0,0 +1,196 @@
+import os
+import json
+import time
+import uuid
+import logging
+import contextvars
+import concurrent.futures
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import redis
+from dotenv import load_dotenv
+
+from database.redis_connection import get_redis
+from services.executors import ExecutorSaturated, get_executor
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+JOB_KEY = "dnsjob:{job_id}"
+JOB_DOMAINS_KEY = "dnsjob:{job_id}:domains"
+
+TEMPLATE_MODES = ("merge", "replace")
+
+# HTTP statuses from the management service that are worth retrying later
+RETRYABLE_STATUSES = {409, 429, 500, 502, 503, 504}
+
+
+def render_template(records: List[Dict], domain: str) -> List[Dict]:
+    """Fills in "{domain}" in the template's addresses for one domain."""
+    return [dict(record, address=record["address"].replace("{domain}", domain)) for record in records]
+
+
+def merge_template(current: List, template: List, mode: str = "merge") -> List:
+    """
+    Combines a domain's current host records with a template's records.
+
+    "replace" returns just the template. "merge" keeps current records unless the
+    template has records with the same hostname and type, e.g. applying an MX set
+    replaces all existing MX records of that host but keeps A, CNAME and TXT records.
+    Records can be DNSRecordRequest/DNSRecordResponse objects.
+    """
+    if mode == "replace":
+        return list(template)
+
+    replaced = {(record.hostname.lower(), record.record_type.upper()) for record in template}
+    kept = [record for record in current
+            if (record.hostname.lower(), record.record_type.upper()) not in replaced]
+    return kept + list(template)
+
+
+def apply_to_domains(domains: Iterable[str], apply_fn: Callable[[str], Optional[Exception]],
+                     on_result: Callable[[str, int, Optional[Exception], bool], None],
+                     concurrency: int, max_attempts: int, backoff: float,
+                     is_retryable: Callable[[Exception], Tuple[bool, float]]):
+    """
+    Runs apply_fn for every domain on the shared "dns-template" executor with at
+    most `concurrency` domains in flight.
+
+    apply_fn returns None on success or the exception that made it fail. Retryable
+    failures are tried again in later rounds, after exponential backoff or the
+    Retry-After the failure asked for, up to max_attempts per domain.
+    on_result(domain, attempt, error, final) is called after every attempt.
+    """
+    executor = get_executor("dns-template", concurrency)
+    pending = list(domains)
+    attempt = 0
+
+    while pending and attempt < max_attempts:
+        attempt += 1
+        retry, wait = [], backoff * (2 ** (attempt - 1))
+        queue = deque(pending)
+        in_flight = {}
+
+        while queue or in_flight:
+            while queue and len(in_flight) < concurrency:
+                domain = queue.popleft()
+                try:
+                    # Runs in a copy of the caller's context to keep its rate-limit priority
+                    in_flight[executor.submit(contextvars.copy_context().run, apply_fn, domain)] = domain
+                except ExecutorSaturated:
+                    wait = max(wait, _record(domain, attempt, apply_fn(domain), max_attempts,
+                                             is_retryable, on_result, retry))
+
+            if in_flight:
+                done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    domain = in_flight.pop(future)
+                    retry_after = _record(domain, attempt, future.result(), max_attempts,
+                                          is_retryable, on_result, retry)
+                    wait = max(wait, retry_after)
+
+        pending = retry
+        if pending and attempt < max_attempts:
+            logger.info("Retrying DNS template for %d domains in %.0fs", len(pending), wait)
+            time.sleep(wait)
+
+
+def _record(domain, attempt, error, max_attempts, is_retryable, on_result, retry) -> float:
+    if error is None:
+        on_result(domain, attempt, None, True)
+        return 0.0
+
+    retryable, retry_after = is_retryable(error)
+    final = not retryable or attempt >= max_attempts
+    on_result(domain, attempt, error, final)
+    if not final:
+        retry.append(domain)
+    return retry_after
+
+
+class DnsTemplateJobStore:
+    """
+    Redis storage for DNS template jobs run by Celery.
+
+    The job hash holds the template snapshot, mode and overall status; a second
+    hash holds each domain's status ("pending", "retrying", "succeeded", "failed"),
+    attempts and last error.
+    """
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None):
+        self.redis = redis_client or get_redis()
+        self.ttl = int(os.getenv("DNS_TEMPLATE_JOB_TTL", "604800"))
+
+    def create(self, username: str, template_id: int, template_name: str, mode: str,
+               records: List[Dict], domains: List[str]) -> str:
+        job_id = uuid.uuid4().hex
+        key, domains_key = JOB_KEY.format(job_id=job_id), JOB_DOMAINS_KEY.format(job_id=job_id)
+        pipe = self.redis.pipeline()
+        pipe.hset(key, mapping={
+            "status": "queued",
+            "username": username,
+            "template_id": template_id,
+            "template_name": template_name,
+            "mode": mode,
+            "records": json.dumps(records),
+            "domains": json.dumps(domains),
+            "created_at": time.time(),
+        })
+        pipe.hset(domains_key, mapping={
+            domain: json.dumps({"status": "pending", "attempts": 0, "error": None}) for domain in domains
+        })
+        pipe.expire(key, self.ttl)
+        pipe.expire(domains_key, self.ttl)
+        pipe.execute()
+        return job_id
+
+    def get_spec(self, job_id: str) -> Optional[Dict]:
+        """Returns the mode, template records and domains of a job, or None if unknown."""
+        meta = self.redis.hmget(JOB_KEY.format(job_id=job_id), ["mode", "records", "domains"])
+        if meta[0] is None:
+            return None
+        return {"mode": meta[0], "records": json.loads(meta[1]), "domains": json.loads(meta[2])}
+
+    def set_status(self, job_id: str, status: str, error: Optional[str] = None):
+        mapping = {"status": status}
+        if error:
+            mapping["error"] = error
+        if status in ("completed", "failed"):
+            mapping["finished_at"] = time.time()
+        self.redis.hset(JOB_KEY.format(job_id=job_id), mapping=mapping)
+
+    def set_domain(self, job_id: str, domain: str, status: str, attempts: int, error: Optional[str] = None):
+        self.redis.hset(JOB_DOMAINS_KEY.format(job_id=job_id), domain,
+                        json.dumps({"status": status, "attempts": attempts, "error": error}))
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Returns the job's status, progress and per-domain results, or None if unknown."""
+        meta = self.redis.hgetall(JOB_KEY.format(job_id=job_id))
+        if not meta:
+            return None
+
+        states = {domain: json.loads(value)
+                  for domain, value in self.redis.hgetall(JOB_DOMAINS_KEY.format(job_id=job_id)).items()}
+        counts = {"succeeded": 0, "failed": 0, "retrying": 0, "pending": 0}
+        for state in states.values():
+            counts[state["status"]] = counts.get(state["status"], 0) + 1
+        total = len(states)
+        finished = counts["succeeded"] + counts["failed"]
+
+        return {
+            "job_id": job_id,
+            "username": meta["username"],
+            "status": meta["status"],
+            "template_id": int(meta["template_id"]),
+            "template_name": meta["template_name"],
+            "mode": meta["mode"],
+            "total": total,
+            "succeeded": counts["succeeded"],
+            "failed": counts["failed"],
+            "progress": round(finished / total, 3) if total else 1.0,
+            "error": meta.get("error"),
+            "domains": [dict(domain=domain, **states[domain]) for domain in json.loads(meta["domains"])
+                        if domain in states],
+        }
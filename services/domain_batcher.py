@@ -0,0 +1,202 @@
+import os
+import time
+import logging
+import threading
+import contextvars
+import concurrent.futures
+from collections import deque
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from services.rate_limiter import RateLimitExceeded
+from services.circuit_breaker import CircuitOpenError
+from services.executors import ExecutorSaturated, get_executor
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Namecheap accepts up to 50 domains in a single namecheap.domains.check DomainList.
+NAMECHEAP_CHECK_DOMAIN_LIMIT = 50
+
+BatchCheckFn = Callable[[List[str]], Dict[str, dict]]
+
+
+class AdaptiveDomainBatcher:
+    """
+    Packs domains into as few namecheap.domains.check calls as possible.
+
+    The batch size starts at the API limit and follows AIMD: it is halved when a
+    batch fails or exceeds the target latency, and grows back step by step while
+    batches stay fast. A failed batch is split in half and retried before its
+    domains are given up on. Per-batch latency is kept for tuning via get_stats().
+    """
+
+    def __init__(self, max_batch_size: Optional[int] = None, min_batch_size: Optional[int] = None,
+                 max_workers: Optional[int] = None, target_latency_ms: Optional[float] = None):
+        self.max_batch_size = min(
+            max_batch_size or int(os.getenv("NAMECHEAP_CHECK_MAX_BATCH", NAMECHEAP_CHECK_DOMAIN_LIMIT)),
+            NAMECHEAP_CHECK_DOMAIN_LIMIT
+        )
+        self.min_batch_size = max(1, min(
+            min_batch_size or int(os.getenv("NAMECHEAP_CHECK_MIN_BATCH", "5")),
+            self.max_batch_size
+        ))
+        self.max_workers = max_workers or int(os.getenv("NAMECHEAP_CHECK_MAX_WORKERS", "4"))
+        self.pool_workers = int(os.getenv("NAMECHEAP_CHECK_POOL_WORKERS", "16"))
+        self.pool_queue = int(os.getenv("NAMECHEAP_CHECK_POOL_QUEUE", "64"))
+        self.target_latency_ms = target_latency_ms or float(os.getenv("NAMECHEAP_CHECK_TARGET_LATENCY_MS", "1500"))
+        self.growth_step = int(os.getenv("NAMECHEAP_CHECK_BATCH_GROWTH", "5"))
+
+        self._batch_size = self.max_batch_size
+        self._lock = threading.Lock()
+        self._history = deque(maxlen=int(os.getenv("NAMECHEAP_CHECK_STATS_WINDOW", "200")))
+        self._total_batches = 0
+        self._total_errors = 0
+
+    @property
+    def batch_size(self) -> int:
+        return self._batch_size
+
+    def split(self, domains: List[str]) -> List[List[str]]:
+        """Splits domains into batches of the current adaptive size."""
+        size = self._batch_size
+        return [domains[i:i + size] for i in range(0, len(domains), size)]
+
+    def iter_results(self, domains: List[str], check_fn: BatchCheckFn) -> Iterator[Dict[str, dict]]:
+        """
+        Runs check_fn over the domains in parallel batches and yields each batch's
+        results as soon as that batch completes.
+        """
+        for _, results in self.iter_batches(self.split(domains), check_fn):
+            yield results
+
+    def iter_batches(self, batches: List[List[str]],
+                     check_fn: BatchCheckFn) -> Iterator[Tuple[List[str], Dict[str, dict]]]:
+        """
+        Runs check_fn over pre-built batches in parallel and yields (batch, results)
+        pairs in completion order.
+        """
+        batches = [batch for batch in batches if batch]
+        if not batches:
+            return
+
+        if len(batches) == 1:
+            yield batches[0], self._run_batch(batches[0], check_fn)
+            return
+
+        # Batches run on the shared, bounded "domain-check" pool. At most
+        # max_workers batches of this call are in flight so one large request
+        # cannot take over the pool from concurrent searches.
+        executor = get_executor("domain-check", self.pool_workers, self.pool_queue)
+        workers = min(self.max_workers, len(batches))
+        pending = deque(batches)
+        in_flight = {}
+        try:
+            while pending or in_flight:
+                while pending and len(in_flight) < workers:
+                    batch = pending.popleft()
+                    try:
+                        # Each batch runs in a copy of the caller's context so it keeps the caller's rate-limit priority
+                        future = executor.submit(contextvars.copy_context().run, self._run_batch, batch, check_fn)
+                    except ExecutorSaturated:
+                        # Pool and queue are full: run the batch in the caller's thread instead of queueing more work
+                        yield batch, self._run_batch(batch, check_fn)
+                        continue
+                    in_flight[future] = batch
+
+                if in_flight:
+                    done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        yield in_flight.pop(future), future.result()
+        finally:
+            # Stop batches that have not started if the caller gave up or a batch was shed
+            for future in in_flight:
+                future.cancel()
+
+    def check(self, domains: List[str], check_fn: BatchCheckFn) -> Dict[str, dict]:
+        """Checks all domains and returns the merged results of every batch."""
+        results = {}
+        for batch_results in self.iter_results(domains, check_fn):
+            results.update(batch_results)
+        return results
+
+    def _run_batch(self, batch: List[str], check_fn: BatchCheckFn, attempt: int = 0) -> Dict[str, dict]:
+        start = time.perf_counter()
+        try:
+            results = check_fn(batch)
+        except (RateLimitExceeded, CircuitOpenError):
+            # Shed by the rate limiter or the circuit breaker: splitting would only make more calls
+            raise
+        except Exception as e:
+            latency_ms = (time.perf_counter() - start) * 1000
+            self._record(len(batch), latency_ms, ok=False)
+            logger.warning("Domain check batch of %d failed after %.0fms: %s", len(batch), latency_ms, e)
+
+            # Retry the two halves once; a single poisoned name or an oversized
+            # request should not cost the whole batch.
+            if attempt == 0 and len(batch) > 1:
+                middle = len(batch) // 2
+                results = {}
+                results.update(self._run_batch(batch[:middle], check_fn, attempt + 1))
+                results.update(self._run_batch(batch[middle:], check_fn, attempt + 1))
+                return results
+            return {}
+
+        self._record(len(batch), (time.perf_counter() - start) * 1000, ok=True)
+        return results
+
+    def _record(self, size: int, latency_ms: float, ok: bool):
+        with self._lock:
+            self._total_batches += 1
+            if not ok:
+                self._total_errors += 1
+            self._history.append({
+                "size": size,
+                "latency_ms": round(latency_ms, 1),
+                "ok": ok,
+                "batch_size_setting": self._batch_size,
+                "timestamp": time.time()
+            })
+
+            if not ok or latency_ms > self.target_latency_ms:
+                self._batch_size = max(self.min_batch_size, self._batch_size // 2)
+            elif latency_ms < self.target_latency_ms / 2:
+                self._batch_size = min(self.max_batch_size, self._batch_size + self.growth_step)
+
+    def get_stats(self) -> Dict:
+        """Summary of recent batches, used to tune the batching settings."""
+        with self._lock:
+            history = list(self._history)
+            stats = {
+                "batch_size": self._batch_size,
+                "max_batch_size": self.max_batch_size,
+                "min_batch_size": self.min_batch_size,
+                "max_workers": self.max_workers,
+                "target_latency_ms": self.target_latency_ms,
+                "total_batches": self._total_batches,
+                "total_errors": self._total_errors,
+            }
+
+        latencies = sorted(entry["latency_ms"] for entry in history)
+        if latencies:
+            stats["latency_p50_ms"] = latencies[len(latencies) // 2]
+            stats["latency_p95_ms"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            stats["avg_domains_per_batch"] = round(sum(entry["size"] for entry in history) / len(history), 1)
+        stats["recent_batches"] = history[-20:]
+        return stats
+
+
+_batcher_lock = threading.Lock()
+_batcher: Optional[AdaptiveDomainBatcher] = None
+
+
+def get_domain_batcher() -> AdaptiveDomainBatcher:
+    """Returns the process-wide batcher so adaptation and stats are shared by all callers."""
+    global _batcher
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                _batcher = AdaptiveDomainBatcher()
+    return _batcher
@@ -0,0 +1,156 @@
+import time
+import logging
+import threading
+import concurrent.futures
+from collections import deque
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturated(RuntimeError):
+    """Raised when a bounded executor's workers and queue are all taken."""
+
+    def __init__(self, name: str):
+        super().__init__(f"Executor '{name}' is saturated")
+        self.name = name
+
+
+class BoundedExecutor:
+    """
+    Long-lived, named thread pool for outbound fan-out.
+
+    Unlike a bare ThreadPoolExecutor its queue is bounded: once max_workers tasks
+    are running and max_queue are waiting, submit() raises ExecutorSaturated so the
+    caller can run the work inline or shed it instead of piling up threads and
+    memory during a burst. Queue depth, active workers and queue wait are tracked
+    for the metrics endpoint.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers,
+                                                               thread_name_prefix=name)
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._cancelled = 0
+        self._peak_queued = 0
+        self._queue_waits = deque(maxlen=200)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> concurrent.futures.Future:
+        """
+        Schedules fn(*args, **kwargs). Raises ExecutorSaturated if the pool and its
+        queue are full, and RuntimeError if the executor has been shut down.
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise ExecutorSaturated(self.name)
+
+        with self._lock:
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+        try:
+            future = self._executor.submit(self._run, time.perf_counter(), fn, args, kwargs)
+        except RuntimeError:
+            with self._lock:
+                self._queued -= 1
+            self._slots.release()
+            raise
+        future.add_done_callback(self._release_cancelled)
+        return future
+
+    def _release_cancelled(self, future: concurrent.futures.Future):
+        # A future cancelled while queued never reaches _run, so its slot is given back here.
+        # Futures that started running can no longer be cancelled; _run releases those.
+        if not future.cancelled():
+            return
+        with self._lock:
+            self._queued -= 1
+            self._cancelled += 1
+        self._slots.release()
+
+    def _run(self, enqueued_at: float, fn: Callable, args, kwargs):
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            self._queue_waits.append(time.perf_counter() - enqueued_at)
+        ok = False
+        try:
+            result = fn(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+                if not ok:
+                    self._failed += 1
+            self._slots.release()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            waits = sorted(self._queue_waits)
+            stats = {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "active_workers": self._active,
+                "queue_depth": self._queued,
+                "peak_queue_depth": self._peak_queued,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "cancelled": self._cancelled,
+            }
+        if waits:
+            stats["queue_wait_p50_ms"] = round(waits[len(waits) // 2] * 1000, 1)
+            stats["queue_wait_p95_ms"] = round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 1)
+        return stats
+
+    def shutdown(self, wait: bool = True):
+        """Stops accepting work, drops queued tasks and optionally waits for running ones."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_executors_lock = threading.Lock()
+_executors: Dict[str, BoundedExecutor] = {}
+
+
+def get_executor(name: str, max_workers: int, max_queue: Optional[int] = None) -> BoundedExecutor:
+    """
+    Returns the process-wide executor with this name, creating it on first use.
+    The sizes only apply when the executor is created. max_queue defaults to
+    four times max_workers.
+    """
+    executor = _executors.get(name)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                executor = BoundedExecutor(name, max_workers,
+                                           max_queue if max_queue is not None else max_workers * 4)
+                _executors[name] = executor
+    return executor
+
+
+def get_executor_stats() -> Dict[str, Dict]:
+    with _executors_lock:
+        executors = list(_executors.values())
+    return {executor.name: executor.get_stats() for executor in executors}
+
+
+def shutdown_executors(wait: bool = True):
+    """Shuts down every shared executor. Called from the FastAPI shutdown hook."""
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        logger.info("Shutting down executor %s", executor.name)
+        executor.shutdown(wait=wait)
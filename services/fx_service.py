@@ -0,0 +1,218 @@
+import os
+import json
+import time
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import redis
+import requests
+from dotenv import load_dotenv
+
+from database.redis_connection import get_redis
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+RATES_KEY = "fx:rates:{base}"
+REFRESH_LOCK_KEY = "fx:refresh-lock:{base}"
+
+
+class FxRateProvider:
+    """Source of exchange rates. fetch_rates returns {currency: rate} relative to base."""
+
+    def fetch_rates(self, base: str) -> Dict[str, float]:
+        raise NotImplementedError
+
+
+class ExchangeRateApiProvider(FxRateProvider):
+    """Fetches rates from exchangerate-api.com."""
+
+    def __init__(self):
+        self.api_key = os.getenv("EXCHANGE_RATE_API_KEY", "6cdeb5d9db93fcb735409cb5")
+        self.timeout = float(os.getenv("EXCHANGE_RATE_API_TIMEOUT", "5"))
+
+    def fetch_rates(self, base: str) -> Dict[str, float]:
+        url = f"https://v6.exchangerate-api.com/v6/{self.api_key}/latest/{base}"
+        response = requests.get(url, timeout=self.timeout)
+        data = response.json()
+
+        if data.get("result") != "success":
+            raise Exception(f"Exchange rate API error: {data.get('error-type', 'unknown')}")
+        return data["conversion_rates"]
+
+
+class StaticFxRateProvider(FxRateProvider):
+    """
+    Local provider with fixed rates, for tests and offline development.
+    Set fail=True to simulate an upstream outage.
+    """
+
+    def __init__(self, rates: Optional[Dict[str, Dict[str, float]]] = None, fail: bool = False):
+        self.rates = rates or {"USD": {"USD": 1.0, "CAD": 1.37}}
+        self.fail = fail
+        self.calls = 0
+
+    def fetch_rates(self, base: str) -> Dict[str, float]:
+        self.calls += 1
+        if self.fail:
+            raise Exception("Static FX provider is set to fail")
+        return dict(self.rates[base])
+
+
+class FxRateService:
+    """
+    Exchange rates with a TTL cache shared across processes.
+
+    Rates are cached in memory and, when a Redis client is given, in Redis so that
+    every API worker and the Celery worker share one upstream fetch per TTL.
+    Shortly before the TTL runs out the rate is refreshed in a background thread
+    while callers keep getting the cached value. Expired rates are refreshed the
+    same way, so a provider outage never blocks conversions: the last known good
+    rate is served instead. After a failed fetch the provider is left alone for
+    FX_FAILURE_BACKOFF seconds.
+    """
+
+    def __init__(self, provider: Optional[FxRateProvider] = None, redis_client: Optional[redis.Redis] = None,
+                 ttl: Optional[float] = None, refresh_ahead_ratio: Optional[float] = None):
+        self.provider = provider or ExchangeRateApiProvider()
+        self.redis = redis_client
+        self.ttl = ttl or float(os.getenv("FX_RATE_TTL", "3600"))
+        self.refresh_ahead_ratio = refresh_ahead_ratio or float(os.getenv("FX_REFRESH_AHEAD_RATIO", "0.8"))
+        self.failure_backoff = float(os.getenv("FX_FAILURE_BACKOFF", "30"))
+
+        self._rates: Dict[str, Tuple[Dict[str, float], float]] = {}
+        self._refreshing = set()
+        self._failed_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get_rate(self, base: str = "USD", quote: str = "CAD") -> Optional[float]:
+        """Returns the base->quote rate, or None if no rate has ever been available."""
+        rates = self._get_rates(base.upper())
+        if rates is None:
+            return None
+        return rates.get(quote.upper())
+
+    def convert(self, amount: float, base: str = "USD", quote: str = "CAD") -> Optional[float]:
+        """Converts a single amount, rounded to cents."""
+        rate = self.get_rate(base, quote)
+        if rate is None:
+            return None
+        return round(amount * rate, 2)
+
+    def convert_many(self, amounts: Iterable[float], base: str = "USD", quote: str = "CAD") -> List[Optional[float]]:
+        """Converts many amounts with a single rate lookup."""
+        rate = self.get_rate(base, quote)
+        if rate is None:
+            return [None for _ in amounts]
+        return [round(amount * rate, 2) for amount in amounts]
+
+    def _get_rates(self, base: str) -> Optional[Dict[str, float]]:
+        cached = self._rates.get(base)
+        if cached is None or self._age(cached) >= self.ttl:
+            shared = self._read_shared(base)
+            if shared is not None and (cached is None or shared[1] > cached[1]):
+                cached = shared
+                self._rates[base] = shared
+
+        if cached is not None:
+            if self._age(cached) >= self.ttl * self.refresh_ahead_ratio:
+                # Soon to expire or already stale: keep serving it while one thread refreshes
+                self._refresh_in_background(base)
+            return cached[0]
+
+        # Nothing to fall back on: fetch inline, unless the provider just failed
+        if self._in_backoff(base):
+            return None
+        fresh = self._refresh(base)
+        return fresh[0] if fresh is not None else None
+
+    def _refresh(self, base: str) -> Optional[Tuple[Dict[str, float], float]]:
+        try:
+            rates = self.provider.fetch_rates(base)
+        except Exception as e:
+            logger.warning("Exchange rate refresh for %s failed: %s", base, e)
+            self._failed_at[base] = time.monotonic()
+            return None
+
+        self._failed_at.pop(base, None)
+        entry = (rates, time.time())
+        self._rates[base] = entry
+        self._write_shared(base, entry)
+        return entry
+
+    def _refresh_in_background(self, base: str):
+        if self._in_backoff(base):
+            return
+        with self._lock:
+            if base in self._refreshing:
+                return
+            self._refreshing.add(base)
+
+        if not self._acquire_refresh_lock(base):
+            with self._lock:
+                self._refreshing.discard(base)
+            return
+
+        def run():
+            try:
+                self._refresh(base)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(base)
+
+        threading.Thread(target=run, name=f"fx-refresh-{base}", daemon=True).start()
+
+    def _in_backoff(self, base: str) -> bool:
+        failed_at = self._failed_at.get(base)
+        return failed_at is not None and time.monotonic() - failed_at < self.failure_backoff
+
+    def _acquire_refresh_lock(self, base: str) -> bool:
+        """Makes sure only one process refreshes a soon-to-expire rate."""
+        if self.redis is None:
+            return True
+        try:
+            return bool(self.redis.set(REFRESH_LOCK_KEY.format(base=base), "1", nx=True, ex=30))
+        except redis.RedisError:
+            return True
+
+    def _read_shared(self, base: str) -> Optional[Tuple[Dict[str, float], float]]:
+        if self.redis is None:
+            return None
+        try:
+            raw = self.redis.get(RATES_KEY.format(base=base))
+            if raw is None:
+                return None
+            data = json.loads(raw)
+            return data["rates"], data["fetched_at"]
+        except (redis.RedisError, ValueError, KeyError) as e:
+            logger.warning("Could not read shared %s exchange rates: %s", base, e)
+            return None
+
+    def _write_shared(self, base: str, entry: Tuple[Dict[str, float], float]):
+        if self.redis is None:
+            return
+        try:
+            # No expiry: the entry doubles as the last known good rate
+            self.redis.set(RATES_KEY.format(base=base), json.dumps({"rates": entry[0], "fetched_at": entry[1]}))
+        except redis.RedisError as e:
+            logger.warning("Could not store shared %s exchange rates: %s", base, e)
+
+    @staticmethod
+    def _age(entry: Tuple[Dict[str, float], float]) -> float:
+        return time.time() - entry[1]
+
+
+_fx_lock = threading.Lock()
+_fx_service: Optional[FxRateService] = None
+
+
+def get_fx_service() -> FxRateService:
+    """Returns the process-wide FxRateService backed by the shared Redis cache."""
+    global _fx_service
+    if _fx_service is None:
+        with _fx_lock:
+            if _fx_service is None:
+                _fx_service = FxRateService(redis_client=get_redis())
+    return _fx_service
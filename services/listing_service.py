@@ -7,6 +7,7 @@ from models.api_dto import ListingCreateRequest, ListingResponse
 from typing import List
 
 from services.payment_service import PaymentService
+from services.registered_index import get_registered_index
 
 
 class ListingService:
@@ -57,6 +58,8 @@ class ListingService:
         db.add(new_listing)
         db.commit()
         db.refresh(new_listing)
+        # Searches in this worker should show the listing right away
+        get_registered_index().invalidate()
         return new_listing
 
     def get_active_listings(self, db: Session):
@@ -180,6 +183,7 @@ class ListingService:
         # Commit all changes
         db.commit()
         db.refresh(listing)
+        get_registered_index().invalidate()
 
         return self._format_listing_response(listing)
 
@@ -208,6 +212,7 @@ class ListingService:
         listing.status = ListingStatus.CANCELLED
         db.commit()
         db.refresh(listing)
+        get_registered_index().invalidate()
 
         return self._format_listing_response(listing)
 
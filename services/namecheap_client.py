@@ -0,0 +1,359 @@
+import os
+import time
+import threading
+import contextvars
+import concurrent.futures
+from collections import deque
+from typing import Dict, Optional
+from urllib.parse import urlparse, parse_qs
+
+import httpx
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from services.rate_limiter import NamecheapRateLimiter, RateLimitExceeded, get_rate_limiter
+from services.circuit_breaker import CLOSED, get_circuit_breaker
+from services.executors import ExecutorSaturated, get_executor
+
+load_dotenv()
+
+# Default read timeouts (seconds) per Namecheap command. Searches must fail fast,
+# registrations and renewals are slow on Namecheap's side and need more headroom.
+DEFAULT_COMMAND_TIMEOUTS = {
+    "namecheap.domains.check": 10,
+    "namecheap.users.getPricing": 30,
+    "namecheap.domains.create": 60,
+    "namecheap.domains.renew": 60,
+    "namecheap.domains.getInfo": 15,
+    "namecheap.domains.dns.getHosts": 15,
+    "namecheap.domains.dns.setHosts": 30,
+}
+
+# Read-only commands that are safe to send twice (hedged requests)
+IDEMPOTENT_COMMANDS = {
+    "namecheap.domains.check",
+    "namecheap.users.getPricing",
+    "namecheap.domains.getInfo",
+    "namecheap.domains.dns.getHosts",
+}
+
+
+NAMECHEAP_PRODUCTION_URL = "https://api.namecheap.com/xml.response"
+NAMECHEAP_SANDBOX_URL = "https://api.sandbox.namecheap.com/xml.response"
+
+
+def resolve_namecheap_api_url(use_production: bool = False) -> str:
+    """
+    Returns the Namecheap XML API endpoint. NAMECHEAP_API_URL overrides it, e.g. to
+    point both services at the local stand-in server (fake_namecheap_server.py).
+    """
+    override = os.getenv("NAMECHEAP_API_URL")
+    if override:
+        return override
+    return NAMECHEAP_PRODUCTION_URL if use_production else NAMECHEAP_SANDBOX_URL
+
+
+def _parse_command_timeouts(raw: Optional[str]) -> Dict[str, float]:
+    """
+    Parses overrides in the form "namecheap.domains.check=5,namecheap.domains.renew=90".
+    """
+    timeouts = {}
+    if not raw:
+        return timeouts
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        command, value = item.split("=", 1)
+        try:
+            timeouts[command.strip()] = float(value)
+        except ValueError:
+            continue
+    return timeouts
+
+
+def _command_from_url(url: str) -> Optional[str]:
+    """Extracts the Command query parameter from a Namecheap request URL."""
+    values = parse_qs(urlparse(url).query).get("Command")
+    return values[0] if values else None
+
+
+class NamecheapClientSettings:
+    """Connection pool and timeout settings shared by the sync and async clients."""
+
+    def __init__(self):
+        self.connect_timeout = float(os.getenv("NAMECHEAP_CONNECT_TIMEOUT", "5"))
+        self.default_timeout = float(os.getenv("NAMECHEAP_DEFAULT_TIMEOUT", "30"))
+        self.pool_connections = int(os.getenv("NAMECHEAP_POOL_CONNECTIONS", "4"))
+        self.pool_maxsize = int(os.getenv("NAMECHEAP_POOL_MAXSIZE", "32"))
+        self.keepalive_expiry = float(os.getenv("NAMECHEAP_KEEPALIVE_EXPIRY", "60"))
+
+        self.command_timeouts = dict(DEFAULT_COMMAND_TIMEOUTS)
+        self.command_timeouts.update(_parse_command_timeouts(os.getenv("NAMECHEAP_COMMAND_TIMEOUTS")))
+
+        # Hedged requests: a second copy of a slow idempotent read is sent once the
+        # first has been running longer than that command's recent p95 latency
+        self.hedging_enabled = os.getenv("NAMECHEAP_HEDGING_ENABLED", "false").lower() == "true"
+        hedge_commands = os.getenv("NAMECHEAP_HEDGE_COMMANDS")
+        self.hedge_commands = (
+            {c.strip() for c in hedge_commands.split(",") if c.strip()} & IDEMPOTENT_COMMANDS
+            if hedge_commands else set(IDEMPOTENT_COMMANDS)
+        )
+        self.hedge_default_delay = float(os.getenv("NAMECHEAP_HEDGE_DEFAULT_DELAY_MS", "1000")) / 1000
+        self.hedge_min_delay = float(os.getenv("NAMECHEAP_HEDGE_MIN_DELAY_MS", "100")) / 1000
+        self.hedge_min_samples = int(os.getenv("NAMECHEAP_HEDGE_MIN_SAMPLES", "20"))
+        self.hedge_max_workers = int(os.getenv("NAMECHEAP_HEDGE_MAX_WORKERS", "16"))
+        self.latency_window = int(os.getenv("NAMECHEAP_LATENCY_WINDOW", "200"))
+
+    def read_timeout(self, command: Optional[str]) -> float:
+        return self.command_timeouts.get(command, self.default_timeout)
+
+
+class _CommandStats:
+    """Recent latencies and call counts for one Namecheap command."""
+
+    def __init__(self, window: int):
+        self.latencies = deque(maxlen=window)
+        self.calls = 0
+        self.failures = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))]
+
+
+class NamecheapClient:
+    """
+    Keep-alive HTTP client for the Namecheap XML API.
+    A single instance is shared by NamecheapService and NamecheapManagementService
+    so that TCP/TLS connections are reused across searches, pricing lookups and DNS calls.
+    Every request first takes a token from the shared Namecheap rate limiter and
+    passes the command's circuit breaker. Idempotent reads can optionally be hedged.
+    """
+
+    def __init__(self, settings: Optional[NamecheapClientSettings] = None,
+                 rate_limiter: Optional[NamecheapRateLimiter] = None):
+        self.settings = settings or NamecheapClientSettings()
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.settings.pool_connections,
+            pool_maxsize=self.settings.pool_maxsize,
+            max_retries=0,
+            pool_block=False
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, _CommandStats] = {}
+        self._hedge_executor = None
+        if self.settings.hedging_enabled:
+            self._hedge_executor = get_executor("namecheap-hedge", self.settings.hedge_max_workers)
+
+    def get(self, url: str, command: Optional[str] = None) -> requests.Response:
+        """
+        Sends a GET request through the pooled session using the command's timeout.
+        Raises requests.exceptions.RequestException on network errors,
+        RateLimitExceeded if the request was shed by the rate limiter and
+        CircuitOpenError if the command's circuit is open.
+        """
+        command = command or _command_from_url(url) or "unknown"
+        timeout = (self.settings.connect_timeout, self.settings.read_timeout(command))
+        breaker = get_circuit_breaker(command)
+        breaker.before_call()
+        try:
+            self.rate_limiter.acquire()
+        except RateLimitExceeded:
+            breaker.release()
+            raise
+
+        if self._hedge_executor is not None and command in self.settings.hedge_commands and breaker.state == CLOSED:
+            return self._hedged_get(url, command, timeout)
+        return self._send(url, command, timeout)
+
+    def _send(self, url: str, command: str, timeout) -> requests.Response:
+        breaker = get_circuit_breaker(command)
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, timeout=timeout)
+        except requests.exceptions.RequestException:
+            breaker.record_failure()
+            self._record(command, None)
+            raise
+
+        if response.status_code >= 500:
+            breaker.record_failure()
+            self._record(command, None)
+        else:
+            breaker.record_success()
+            self._record(command, time.perf_counter() - start)
+        return response
+
+    def _hedged_get(self, url: str, command: str, timeout) -> requests.Response:
+        """
+        Sends the request and, if it is still running after the hedge delay, a second
+        identical one. Returns whichever succeeds first. The hedge only goes out if
+        the rate limiter has a token available right away.
+        """
+        try:
+            primary = self._hedge_executor.submit(contextvars.copy_context().run, self._send, url, command, timeout)
+        except ExecutorSaturated:
+            return self._send(url, command, timeout)
+        try:
+            return primary.result(timeout=self._hedge_delay(command))
+        except concurrent.futures.TimeoutError:
+            pass
+
+        if not self.rate_limiter.try_acquire():
+            return primary.result()
+
+        try:
+            hedge = self._hedge_executor.submit(contextvars.copy_context().run, self._send, url, command, timeout)
+        except ExecutorSaturated:
+            return primary.result()
+        stats = self._command_stats(command)
+        with self._stats_lock:
+            stats.hedged += 1
+
+        for future in concurrent.futures.as_completed([primary, hedge]):
+            if future.exception() is None:
+                if future is hedge:
+                    with self._stats_lock:
+                        stats.hedge_wins += 1
+                return future.result()
+        return primary.result()
+
+    def _hedge_delay(self, command: str) -> float:
+        stats = self._command_stats(command)
+        with self._stats_lock:
+            p95 = stats.percentile(0.95) if len(stats.latencies) >= self.settings.hedge_min_samples else None
+        return max(self.settings.hedge_min_delay, p95 if p95 is not None else self.settings.hedge_default_delay)
+
+    def _command_stats(self, command: str) -> _CommandStats:
+        with self._stats_lock:
+            stats = self._stats.get(command)
+            if stats is None:
+                stats = _CommandStats(self.settings.latency_window)
+                self._stats[command] = stats
+            return stats
+
+    def _record(self, command: str, latency: Optional[float]):
+        stats = self._command_stats(command)
+        with self._stats_lock:
+            stats.calls += 1
+            if latency is None:
+                stats.failures += 1
+            else:
+                stats.latencies.append(latency)
+
+    def get_stats(self) -> Dict:
+        """Per-command call counts, latency percentiles (ms) and hedging results for this process."""
+        with self._stats_lock:
+            commands = {}
+            for command, stats in self._stats.items():
+                p50, p95 = stats.percentile(0.5), stats.percentile(0.95)
+                commands[command] = {
+                    "calls": stats.calls,
+                    "failures": stats.failures,
+                    "latency_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                    "latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+                    "hedged": stats.hedged,
+                    "hedge_wins": stats.hedge_wins,
+                }
+        return {"hedging_enabled": self._hedge_executor is not None, "commands": commands}
+
+    def close(self):
+        # The hedge executor is shared and shut down with the others by shutdown_executors()
+        self.session.close()
+
+
+class AsyncNamecheapClient:
+    """
+    asyncio counterpart of NamecheapClient for use inside async FastAPI handlers.
+    Must be closed with aclose() on application shutdown.
+    """
+
+    def __init__(self, settings: Optional[NamecheapClientSettings] = None,
+                 rate_limiter: Optional[NamecheapRateLimiter] = None):
+        self.settings = settings or NamecheapClientSettings()
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.settings.pool_maxsize,
+                max_keepalive_connections=self.settings.pool_maxsize,
+                keepalive_expiry=self.settings.keepalive_expiry
+            ),
+            timeout=httpx.Timeout(self.settings.default_timeout, connect=self.settings.connect_timeout)
+        )
+
+    async def get(self, url: str, command: Optional[str] = None) -> httpx.Response:
+        """
+        Sends a GET request through the pooled async client using the command's timeout.
+        Raises httpx.HTTPError on network errors, RateLimitExceeded if the request
+        was shed by the rate limiter and CircuitOpenError if the circuit is open.
+        """
+        command = command or _command_from_url(url) or "unknown"
+        timeout = httpx.Timeout(self.settings.read_timeout(command), connect=self.settings.connect_timeout)
+        breaker = get_circuit_breaker(command)
+        breaker.before_call()
+        try:
+            await self.rate_limiter.acquire_async()
+        except RateLimitExceeded:
+            breaker.release()
+            raise
+        try:
+            response = await self.client.get(url, timeout=timeout)
+        except httpx.HTTPError:
+            breaker.record_failure()
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+_client_lock = threading.Lock()
+_client: Optional[NamecheapClient] = None
+_async_client: Optional[AsyncNamecheapClient] = None
+
+
+def get_namecheap_client() -> NamecheapClient:
+    """Returns the process-wide NamecheapClient, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = NamecheapClient()
+    return _client
+
+
+def get_async_namecheap_client() -> AsyncNamecheapClient:
+    """Returns the process-wide AsyncNamecheapClient, creating it on first use."""
+    global _async_client
+    if _async_client is None:
+        with _client_lock:
+            if _async_client is None:
+                _async_client = AsyncNamecheapClient()
+    return _async_client
+
+
+async def close_namecheap_clients():
+    """Closes the shared clients. Called from the FastAPI shutdown hook."""
+    global _client, _async_client
+    with _client_lock:
+        client, async_client = _client, _async_client
+        _client, _async_client = None, None
+    if client is not None:
+        client.close()
+    if async_client is not None:
+        await async_client.aclose()
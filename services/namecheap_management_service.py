@@ -350,13 +350,29 @@ class NamecheapManagementService:
 # ==============================================
 
 import os
+import json
+import time
+import hashlib
 import requests
-import xmltodict
+from urllib.parse import quote
+import contextvars
+import concurrent.futures
+from collections import deque
+import xml.etree.ElementTree as ET
 from dotenv import load_dotenv
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 from datetime import datetime
 from fastapi import HTTPException
 
+from services.namecheap_client import get_namecheap_client, resolve_namecheap_api_url
+from services import namecheap_parser
+from services.namecheap_parser import NamecheapApiError
+from services.rate_limiter import RateLimitExceeded
+from services.circuit_breaker import CircuitOpenError
+from services.dns_cache import DnsEditInProgress, get_dns_cache
+from services.executors import ExecutorSaturated, get_executor
+from services.dns_templates import merge_template
+from services import registrar_sync
 from models.api_dto import (
     DNSRecordResponse,
     DomainInfoResponse,
@@ -385,16 +401,27 @@ class NamecheapManagementService:
         self.username = os.getenv("NAMEOFUSER")
         self.client_ip = os.getenv("CLIENT_IP")
 
-        # Switch between sandbox & production environments
+        # Switch between sandbox & production environments (NAMECHEAP_API_URL overrides both)
         use_production = os.getenv("NAMECHEAP_USE_PRODUCTION", "false").lower() == "true"
-        self.api_url = (
-            "https://api.namecheap.com/xml.response" if use_production
-            else "https://api.sandbox.namecheap.com/xml.response"
-        )
+        self.api_url = resolve_namecheap_api_url(use_production)
 
         # Default IP used for hosting when setting A record
         self.default_hosting_ip = os.getenv("DEFAULT_HOSTING_IP", "34.123.45.6")
 
+        # Shared keep-alive client (connection pool + per-command timeouts)
+        self.client = get_namecheap_client()
+
+        # Shared Redis cache of getHosts results, kept in sync by our own setHosts calls
+        self.dns_cache = get_dns_cache()
+
+        # Status page: upstream calls run in parallel and share one deadline (seconds)
+        self.status_timeout = float(os.getenv("DOMAIN_STATUS_TIMEOUT", "8"))
+        self.status_max_workers = int(os.getenv("DOMAIN_STATUS_MAX_WORKERS", "8"))
+
+        # Dashboard: domains missing from the local mirror/DNS cache are fetched with bounded concurrency
+        self.dashboard_timeout = float(os.getenv("DASHBOARD_TIMEOUT", "15"))
+        self.dashboard_concurrency = int(os.getenv("DASHBOARD_CONCURRENCY", "6"))
+
     def _build_api_url(self, command: str, **params) -> str:
         """
         Builds a Namecheap API request URL.
@@ -406,43 +433,48 @@ class NamecheapManagementService:
             f"&UserName={self.username}&ClientIp={self.client_ip}&Command={command}"
         )
 
-        # Add extra parameters (SLD, TLD, HostName, etc.)
+        # Add extra parameters (SLD, TLD, HostName, etc.). Values are URL-encoded so
+        # TXT records and forwarding targets containing "&", "+" or "=" survive intact.
         for key, value in params.items():
-            base_url += f"&{key}={value}"
+            base_url += f"&{key}={quote(str(value), safe='')}"
 
         return base_url
 
-    def _make_api_request(self, url: str) -> Dict:
+    def _make_api_request(self, url: str) -> ET.Element:
         """
         Sends a GET request to the Namecheap API.
-        Converts XML response into Python dictionary.
+        Returns the parsed XML root; the typed parsers in namecheap_parser
+        read their results from it.
         Handles:
             - HTTP request errors
             - Namecheap API internal errors
         """
         try:
-            response = requests.get(url, timeout=30)
+            response = self.client.get(url)
             response.raise_for_status()
 
-            # Parse returned XML to dictionary
-            data = xmltodict.parse(response.text)
-
-            api_response = data.get('ApiResponse', {})
-
-            # If Namecheap returns an error
-            if api_response.get('@Status') == 'ERROR':
-                errors = api_response.get('Errors', {}).get('Error', [])
-                if isinstance(errors, dict):  # single error
-                    errors = [errors]
-                error_messages = [e.get('#text', 'Unknown error') for e in errors]
-
-                raise HTTPException(
-                    status_code=502,
-                    detail=f"Namecheap API Error: {'; '.join(error_messages)}"
-                )
-
-            return data
+            # Parse once; raises NamecheapApiError if Namecheap returned an error
+            return namecheap_parser.parse_response(response.content)
 
+        except NamecheapApiError as e:
+            raise HTTPException(
+                status_code=502,
+                detail=f"Namecheap API Error: {'; '.join(e.messages)}"
+            )
+        except RateLimitExceeded as e:
+            # Namecheap budget exhausted for this priority lane
+            raise HTTPException(
+                status_code=429,
+                detail=str(e),
+                headers={"Retry-After": str(max(1, round(e.retry_after)))}
+            )
+        except CircuitOpenError as e:
+            # Namecheap has been failing for this command; fail fast instead of waiting on it
+            raise HTTPException(
+                status_code=503,
+                detail=str(e),
+                headers={"Retry-After": str(max(1, round(e.retry_after)))}
+            )
         except requests.exceptions.RequestException as e:
             # Network errors
             raise HTTPException(
@@ -458,45 +490,85 @@ class NamecheapManagementService:
 
     def get_domain_info(self, sld: str, tld: str, username: str) -> DomainInfoResponse:
         """
-        Fetches detailed domain information from Namecheap.
-        Includes owner info, creation/expiry date, lock status, etc.
+        Returns detailed domain information: owner, creation/expiry date, lock status, etc.
+        Served from the local registrar mirror kept up to date by the sync task;
+        falls back to a live getInfo call (and stores its result) when the mirror
+        has no fresh copy.
+        """
+        domain = f"{sld}.{tld}"
+        domain_info = registrar_sync.read_mirror(domain)
+        if domain_info is None:
+            domain_info = self.fetch_domain_info(domain)
+            registrar_sync.store_domain_info(domain, domain_info)
+
+        return self._to_info_response(domain, domain_info)
+
+    @staticmethod
+    def _to_info_response(domain: str, domain_info: namecheap_parser.DomainInfo) -> DomainInfoResponse:
+        return DomainInfoResponse(
+            domain_name=domain,
+            owner_name=domain_info.owner_name,
+            is_owner=domain_info.is_owner,
+            status=domain_info.status,
+            created_date=domain_info.created,
+            expires_date=domain_info.expires,
+            is_locked=domain_info.is_locked,
+            auto_renew=domain_info.auto_renew,
+            whoisguard_enabled=domain_info.whoisguard_enabled,
+            is_premium=domain_info.is_premium,
+            nameservers=domain_info.nameservers
+        )
+
+    def fetch_domain_info(self, domain: str) -> namecheap_parser.DomainInfo:
+        """
+        Reads a domain's details with namecheap.domains.getInfo, bypassing the mirror.
         """
         url = self._build_api_url(
             "namecheap.domains.getInfo",
-            DomainName=f"{sld}.{tld}"
+            DomainName=domain
         )
 
-        data = self._make_api_request(url)
-
-        cmd_response = data['ApiResponse']['CommandResponse']
-        domain_info = cmd_response['DomainGetInfoResult']
-
-        created_date = self._parse_date(domain_info.get('@CreatedDate'))
-        expires_date = self._parse_date(domain_info.get('@ExpiredDate'))
+        root = self._make_api_request(url)
 
-        # Parse nameservers
-        nameservers_data = domain_info.get('DnsDetails', {}).get('Nameserver', [])
-        if isinstance(nameservers_data, dict):
-            nameservers_data = [nameservers_data]
-        nameservers = [ns.get('#text', '') for ns in nameservers_data if isinstance(ns, dict)]
+        domain_info = namecheap_parser.parse_domain_info(root)
+        if domain_info is None:
+            raise HTTPException(
+                status_code=502,
+                detail="Namecheap API Error: getInfo returned no domain details"
+            )
+        return domain_info
 
-        return DomainInfoResponse(
-            domain_name=f"{sld}.{tld}",
-            owner_name=domain_info.get('@OwnerName', ''),
-            is_owner=domain_info.get('@IsOwner', 'false').lower() == 'true',
-            status=domain_info.get('@Status', 'Unknown'),
-            created_date=created_date,
-            expires_date=expires_date,
-            is_locked=domain_info.get('@IsLocked', 'false').lower() == 'true',
-            auto_renew=domain_info.get('@AutoRenew', 'false').lower() == 'true',
-            whoisguard_enabled=domain_info.get('Whoisguard', {}).get('@Enabled', 'false').lower() == 'true',
-            is_premium=domain_info.get('@IsPremium', 'false').lower() == 'true',
-            nameservers=nameservers
+    def list_domains_page(self, page: int, page_size: int) -> namecheap_parser.DomainListPage:
+        """
+        Reads one page of the account's domains with namecheap.domains.getList.
+        """
+        url = self._build_api_url(
+            "namecheap.domains.getList",
+            ListType="ALL",
+            Page=page,
+            PageSize=page_size,
+            SortBy="NAME"
         )
 
+        return namecheap_parser.parse_domain_list(self._make_api_request(url))
+
     def get_dns_records(self, sld: str, tld: str) -> List[DNSRecordResponse]:
         """
         Retrieves full DNS host record list for a domain.
+        Served from the DNS cache when possible; a miss is read from Namecheap and cached.
+        """
+        domain = f"{sld}.{tld}"
+        cached, generation = self.dns_cache.get(domain)
+        if cached is not None:
+            return [DNSRecordResponse(**record) for record in cached]
+
+        records = self._fetch_dns_records(sld, tld)
+        self.dns_cache.fill(domain, [record.model_dump() for record in records], generation)
+        return records
+
+    def _fetch_dns_records(self, sld: str, tld: str) -> List[DNSRecordResponse]:
+        """
+        Reads the DNS host records from Namecheap, bypassing the cache.
         """
         url = self._build_api_url(
             "namecheap.domains.dns.getHosts",
@@ -504,32 +576,138 @@ class NamecheapManagementService:
             TLD=tld
         )
 
-        data = self._make_api_request(url)
+        root = self._make_api_request(url)
+
+        return [
+            DNSRecordResponse(
+                host_id=host.host_id,
+                hostname=host.name,
+                record_type=host.type,
+                address=host.address,
+                ttl=host.ttl,
+                mx_pref=host.mx_pref,
+                is_active=host.is_active
+            )
+            for host in namecheap_parser.parse_dns_hosts(root)
+        ]
 
-        cmd_response = data['ApiResponse']['CommandResponse']
-        hosts_data = cmd_response['DomainDNSGetHostsResult'].get('host', [])
+    def update_dns_records(self, sld: str, tld: str, records: List[DNSRecordRequest],
+                           if_match: Optional[str] = None) -> List[DNSRecordResponse]:
+        """
+        Updates domain DNS records.
+        NOTE: Namecheap REPLACES ALL EXISTING RECORDS in one request.
+        If if_match is given, the update is rejected with 412 unless it matches
+        the ETag of the current records.
+        """
+        return self._edit_dns_records(sld, tld, if_match, lambda current: records, check_current=bool(if_match))
 
-        if isinstance(hosts_data, dict):
-            hosts_data = [hosts_data]
+    def add_dns_record(self, sld: str, tld: str, record: DNSRecordRequest,
+                       if_match: Optional[str] = None) -> List[DNSRecordResponse]:
+        """Adds one DNS record, keeping all existing ones."""
+        return self._edit_dns_records(sld, tld, if_match, lambda current: list(current) + [record])
 
-        dns_records = []
-        for host in hosts_data:
-            dns_records.append(DNSRecordResponse(
-                host_id=host.get('@HostId'),
-                hostname=host.get('@Name', ''),
-                record_type=host.get('@Type', ''),
-                address=host.get('@Address', ''),
-                ttl=int(host.get('@TTL', 1800)),
-                mx_pref=int(host.get('@MXPref', 10)) if host.get('@MXPref') else None,
-                is_active=host.get('@IsActive', 'true').lower() == 'true'
-            ))
+    def modify_dns_record(self, sld: str, tld: str, host_id: str, record: DNSRecordRequest,
+                          if_match: Optional[str] = None) -> List[DNSRecordResponse]:
+        """Replaces the DNS record with this host id, keeping all other records."""
+        self._require_if_match(if_match)
 
-        return dns_records
+        def change(current):
+            self._find_dns_record(current, host_id)
+            return [record if r.host_id == host_id else r for r in current]
 
-    def update_dns_records(self, sld: str, tld: str, records: List[DNSRecordRequest]) -> List[DNSRecordResponse]:
+        return self._edit_dns_records(sld, tld, if_match, change)
+
+    def remove_dns_record(self, sld: str, tld: str, host_id: str,
+                          if_match: Optional[str] = None) -> List[DNSRecordResponse]:
+        """Removes the DNS record with this host id, keeping all other records."""
+        self._require_if_match(if_match)
+
+        def change(current):
+            self._find_dns_record(current, host_id)
+            return [r for r in current if r.host_id != host_id]
+
+        return self._edit_dns_records(sld, tld, if_match, change)
+
+    def apply_dns_template(self, sld: str, tld: str, records: List[DNSRecordRequest],
+                           mode: str = "merge") -> List[DNSRecordResponse]:
         """
-        Updates domain DNS records.
-        NOTE: Namecheap REPLACES ALL EXISTING RECORDS in one request.
+        Applies a DNS template's records to one domain with a single setHosts.
+        "merge" keeps existing records whose hostname and type the template does not set;
+        "replace" replaces all records.
+        """
+        return self._edit_dns_records(
+            sld, tld, None,
+            lambda current: merge_template(current, records, mode),
+            check_current=(mode == "merge")
+        )
+
+    @staticmethod
+    def dns_etag(records: List[DNSRecordResponse]) -> str:
+        """
+        Version of a DNS record set, used as the ETag of the DNS endpoints.
+        Computed from the record contents (not host ids), in any order.
+        """
+        canonical = sorted(
+            (r.hostname, r.record_type, r.address, r.ttl, r.mx_pref if r.record_type == "MX" else None)
+            for r in records
+        )
+        digest = hashlib.sha256(json.dumps(canonical).encode()).hexdigest()[:20]
+        return f'"{digest}"'
+
+    @staticmethod
+    def _require_if_match(if_match: Optional[str]):
+        # Host ids are reassigned by every setHosts, so an id is only meaningful
+        # together with the version of the list it came from
+        if not if_match:
+            raise HTTPException(
+                status_code=428,
+                detail="If-Match with the ETag of the DNS record list is required"
+            )
+
+    @staticmethod
+    def _find_dns_record(records: List[DNSRecordResponse], host_id: str) -> DNSRecordResponse:
+        for record in records:
+            if record.host_id == host_id:
+                return record
+        raise HTTPException(
+            status_code=404,
+            detail=f"DNS record {host_id} not found"
+        )
+
+    def _edit_dns_records(self, sld: str, tld: str, if_match: Optional[str],
+                          change: Callable[[List[DNSRecordResponse]], List], check_current: bool = True):
+        """
+        Read-modify-write of the host list under the domain's DNS edit lock:
+        merges the change into the (cached) current records, rejects the edit with
+        412 if they no longer match if_match, and writes the result with one setHosts.
+        """
+        domain = f"{sld}.{tld}"
+        try:
+            with self.dns_cache.edit_lock(domain):
+                current = self.get_dns_records(sld, tld) if check_current else []
+                if check_current and if_match and not self._etag_matches(if_match, current):
+                    raise HTTPException(
+                        status_code=412,
+                        detail="DNS records were changed since they were loaded",
+                        headers={"ETag": self.dns_etag(current)}
+                    )
+                return self._set_hosts(sld, tld, change(current))
+        except DnsEditInProgress as e:
+            raise HTTPException(status_code=409, detail=str(e))
+
+    def _etag_matches(self, if_match: str, records: List[DNSRecordResponse]) -> bool:
+        current = self.dns_etag(records)
+        for tag in if_match.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag.removeprefix("W/") == current:
+                return True
+        return False
+
+    def _set_hosts(self, sld: str, tld: str, records: List) -> List[DNSRecordResponse]:
+        """
+        Replaces the domain's host records with one setHosts call, then reads them
+        back (for the host ids Namecheap assigned) and refreshes the DNS cache.
+        records may be DNSRecordRequest or DNSRecordResponse objects.
         """
         if not records:
             raise HTTPException(
@@ -547,13 +725,19 @@ class NamecheapManagementService:
             params[f"TTL{idx}"] = str(record.ttl)
 
             if record.record_type == "MX":
-                params[f"MXPref{idx}"] = str(record.mx_pref)
+                params[f"MXPref{idx}"] = str(record.mx_pref if record.mx_pref is not None else 10)
 
         url = self._build_api_url("namecheap.domains.dns.setHosts", **params)
         self._make_api_request(url)
 
-        # Return updated DNS list
-        return self.get_dns_records(sld, tld)
+        # Drop the old records first so they are not served if the read-back below fails
+        domain = f"{sld}.{tld}"
+        self.dns_cache.invalidate(domain)
+
+        # Return updated DNS list (read back for the host ids Namecheap assigned) and cache it
+        records = self._fetch_dns_records(sld, tld)
+        self.dns_cache.put(domain, [record.model_dump() for record in records])
+        return records
 
     def set_url_forwarding(self, sld: str, tld: str, target_url: str, forward_type: str = "permanent") -> Dict:
         """
@@ -576,7 +760,15 @@ class NamecheapManagementService:
         else:
             url += "&URLForwardingType=302"
 
-        self._make_api_request(url)
+        domain = f"{sld}.{tld}"
+        try:
+            with self.dns_cache.edit_lock(domain):
+                self._make_api_request(url)
+        except DnsEditInProgress as e:
+            raise HTTPException(status_code=409, detail=str(e))
+
+        # All host records were replaced; the next read fetches them again
+        self.dns_cache.invalidate(domain)
 
         return {
             "success": True,
@@ -616,36 +808,199 @@ class NamecheapManagementService:
     def get_domain_status(self, sld: str, tld: str, username: str) -> DomainStatusResponse:
         """
         Combines domain info + DNS + hosting/forwarding detection.
+
+        Domain info and DNS records are fetched concurrently under one shared
+        deadline. If one of them fails or is too slow, the other is still
+        returned and the missing section is explained in `errors`. Only when
+        both fail is the first error raised.
         """
-        domain_info = self.get_domain_info(sld, tld, username)
-        dns_records = self.get_dns_records(sld, tld)
+        sections = {
+            "domain_info": lambda: self.get_domain_info(sld, tld, username),
+            "dns_records": lambda: self.get_dns_records(sld, tld),
+        }
+        results, errors, failures = self._gather(sections, self.status_timeout)
 
-        is_hosted = any(
-            r.hostname == "@" and r.record_type == "A"
-            for r in dns_records
-        )
+        if not results:
+            # Nothing to show: surface the upstream error instead of an empty status
+            raise failures.get("domain_info") or failures.get("dns_records") or HTTPException(
+                status_code=504,
+                detail=f"Namecheap did not respond within {self.status_timeout:g}s"
+            )
 
-        is_forwarding = any(
-            r.record_type == "URL"
-            for r in dns_records
-        )
+        return self._build_status(results.get("domain_info"), results.get("dns_records"), errors)
+
+    def get_domains_status(self, domains: List[str]) -> Dict[str, DomainStatusResponse]:
+        """
+        Status of several domains for the dashboard, keyed by domain name.
+
+        Domain info is read from the registrar mirror and DNS records from the DNS
+        cache, one bulk lookup each. Only what is missing there is fetched from
+        Namecheap, at most DASHBOARD_CONCURRENCY calls at a time and within one
+        shared deadline; sections that still fail are explained per domain in `errors`.
+        """
+        mirrored = registrar_sync.read_mirror_many(domains)
+        cached_dns = self.dns_cache.get_many(domains)
+
+        infos, dns = {}, {}
+        calls = {}
+        for domain in domains:
+            info = mirrored.get(domain.lower())
+            if info is not None:
+                infos[domain] = self._to_info_response(domain, info)
+            else:
+                calls[(domain, "domain_info")] = lambda domain=domain: self._load_domain_info(domain)
+
+            records, generation = cached_dns[domain]
+            if records is not None:
+                dns[domain] = [DNSRecordResponse(**record) for record in records]
+            else:
+                calls[(domain, "dns_records")] = (
+                    lambda domain=domain, generation=generation: self._load_dns_records(domain, generation))
+
+        results, errors = self._fan_out(calls, self.dashboard_timeout, self.dashboard_concurrency)
+        for (domain, section), result in results.items():
+            (infos if section == "domain_info" else dns)[domain] = result
+
+        statuses = {}
+        for domain in domains:
+            domain_errors = {section: message for (name, section), message in errors.items() if name == domain}
+            statuses[domain] = self._build_status(infos.get(domain), dns.get(domain), domain_errors)
+        return statuses
+
+    def _load_domain_info(self, domain: str) -> DomainInfoResponse:
+        domain_info = self.fetch_domain_info(domain)
+        registrar_sync.store_domain_info(domain, domain_info)
+        return self._to_info_response(domain, domain_info)
+
+    def _load_dns_records(self, domain: str, generation: str) -> List[DNSRecordResponse]:
+        sld, tld = domain.rsplit(".", 1)
+        records = self._fetch_dns_records(sld, tld)
+        self.dns_cache.fill(domain, [record.model_dump() for record in records], generation)
+        return records
+
+    @staticmethod
+    def _build_status(domain_info: Optional[DomainInfoResponse], dns_records: Optional[List[DNSRecordResponse]],
+                      errors: Dict[str, str]) -> DomainStatusResponse:
+        is_hosted = is_forwarding = None
+        if dns_records is not None:
+            is_hosted = any(
+                r.hostname == "@" and r.record_type == "A"
+                for r in dns_records
+            )
+
+            is_forwarding = any(
+                r.record_type == "URL"
+                for r in dns_records
+            )
 
         return DomainStatusResponse(
             domain_info=domain_info,
             dns_records=dns_records,
             is_hosted=is_hosted,
-            is_forwarding=is_forwarding
+            is_forwarding=is_forwarding,
+            errors=errors
         )
 
+    def _fan_out(self, calls: Dict, timeout: float, concurrency: int):
+        """
+        Runs the keyed calls on the shared "dashboard" executor with at most
+        `concurrency` in flight, until the deadline.
+        Returns (results, error messages) keyed like `calls`. Calls not finished or
+        not started by the deadline are reported as timed out.
+        """
+        executor = get_executor("dashboard", concurrency)
+        deadline = time.monotonic() + timeout
+        pending = deque(calls.items())
+        in_flight = {}
+        results, errors = {}, {}
+
+        def record(key, future):
+            try:
+                results[key] = future.result()
+            except HTTPException as e:
+                errors[key] = str(e.detail)
+            except Exception as e:
+                errors[key] = f"Unexpected error: {str(e)}"
+
+        while pending or in_flight:
+            while pending and len(in_flight) < concurrency and time.monotonic() < deadline:
+                key, call = pending[0]
+                try:
+                    # A copy of the caller's context keeps its rate-limit priority
+                    in_flight[executor.submit(contextvars.copy_context().run, call)] = key
+                except ExecutorSaturated:
+                    if in_flight:
+                        break
+                    # Other requests hold the whole pool: make progress in the request thread
+                    future = concurrent.futures.Future()
+                    try:
+                        future.set_result(call())
+                    except Exception as e:
+                        future.set_exception(e)
+                    record(key, future)
+                pending.popleft()
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if in_flight:
+                done, _ = concurrent.futures.wait(in_flight, timeout=remaining,
+                                                  return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    record(in_flight.pop(future), future)
+
+        for future, key in in_flight.items():
+            future.cancel()
+            errors[key] = f"Timed out after {timeout:g}s"
+        for key, _ in pending:
+            errors[key] = f"Timed out after {timeout:g}s"
+        return results, errors
+
+    def _gather(self, calls: Dict, timeout: float):
+        """
+        Runs the named calls in parallel on the shared "domain-status" executor and
+        waits for them until the deadline.
+        Returns (results, error messages, HTTPExceptions raised) keyed by name.
+        Calls still running at the deadline are reported as timed out.
+        """
+        executor = get_executor("domain-status", self.status_max_workers)
+        deadline = time.monotonic() + timeout
+        futures = {}
+        for name, call in calls.items():
+            try:
+                # A copy of the caller's context keeps its rate-limit priority
+                futures[name] = executor.submit(contextvars.copy_context().run, call)
+            except ExecutorSaturated:
+                # Pool is full: fetch this section in the request thread instead
+                future = concurrent.futures.Future()
+                try:
+                    future.set_result(call())
+                except Exception as e:
+                    future.set_exception(e)
+                futures[name] = future
+
+        concurrent.futures.wait(futures.values(), timeout=max(0.0, deadline - time.monotonic()))
+
+        results, errors, failures = {}, {}, {}
+        for name, future in futures.items():
+            if not future.done():
+                future.cancel()
+                errors[name] = f"Timed out after {timeout:g}s"
+                continue
+            try:
+                results[name] = future.result()
+            except HTTPException as e:
+                errors[name] = str(e.detail)
+                failures[name] = e
+            except Exception as e:
+                errors[name] = f"Unexpected error: {str(e)}"
+                failures[name] = HTTPException(status_code=500, detail=errors[name])
+        return results, errors, failures
+
     def _parse_date(self, date_str: Optional[str]) -> Optional[datetime]:
         """
         Namecheap returns dates as MM/DD/YYYY.
         Converts to Python datetime.
         """
-        if not date_str:
-            return None
-        try:
-            return datetime.strptime(date_str, "%m/%d/%Y")
-        except (ValueError, TypeError):
-            return None
+        return namecheap_parser.parse_date(date_str)
 
@@ -0,0 +1,355 @@
+import io
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterator, List, Optional, Union
+
+NAMESPACE = "http://api.namecheap.com/xml.response"
+
+XmlSource = Union[str, bytes, ET.Element]
+
+
+def _tag(name: str) -> str:
+    return f"{{{NAMESPACE}}}{name}"
+
+
+TAG_ERROR = _tag("Error")
+TAG_DOMAIN_CHECK_RESULT = _tag("DomainCheckResult")
+TAG_PRODUCT_CATEGORY = _tag("ProductCategory")
+TAG_PRODUCT = _tag("Product")
+TAG_PRICE = _tag("Price")
+TAG_DOMAIN_CREATE_RESULT = _tag("DomainCreateResult")
+TAG_DOMAIN_RENEW_RESULT = _tag("DomainRenewResult")
+TAG_DOMAIN_DETAILS = _tag("DomainDetails")
+TAG_EXPIRED_DATE = _tag("ExpiredDate")
+TAG_CREATED_DATE = _tag("CreatedDate")
+TAG_DOMAIN_INFO_RESULT = _tag("DomainGetInfoResult")
+TAG_WHOISGUARD = _tag("Whoisguard")
+TAG_DNS_DETAILS = _tag("DnsDetails")
+TAG_NAMESERVER = _tag("Nameserver")
+TAG_HOSTS_RESULT = _tag("DomainDNSGetHostsResult")
+TAG_HOST = _tag("host")
+TAG_SET_HOSTS_RESULT = _tag("DomainDNSSetHostsResult")
+TAG_DOMAIN_LIST_RESULT = _tag("DomainGetListResult")
+TAG_DOMAIN = _tag("Domain")
+TAG_PAGING = _tag("Paging")
+TAG_TOTAL_ITEMS = _tag("TotalItems")
+TAG_CURRENT_PAGE = _tag("CurrentPage")
+TAG_PAGE_SIZE = _tag("PageSize")
+
+
+class NamecheapApiError(Exception):
+    """Raised when Namecheap answers with Status="ERROR"."""
+
+    def __init__(self, messages: List[str], numbers: Optional[List[str]] = None):
+        self.messages = messages or ["Unknown error"]
+        self.numbers = numbers or []
+        super().__init__("; ".join(self.messages))
+
+    @property
+    def number(self) -> Optional[str]:
+        return self.numbers[0] if self.numbers else None
+
+
+@dataclass
+class DomainCheckResult:
+    domain: str
+    available: bool
+    is_premium: bool
+    premium_registration_price: float = 0.0
+
+
+@dataclass
+class ProductPrice:
+    category: str
+    tld: str
+    duration: int
+    duration_type: str
+    price: float
+
+
+@dataclass
+class DomainCreateResult:
+    domain: str
+    registered: bool
+    order_id: Optional[str] = None
+    transaction_id: Optional[str] = None
+    charged_amount: Optional[str] = None
+
+
+@dataclass
+class DomainRenewResult:
+    domain: str
+    renewed: bool
+    order_id: Optional[str] = None
+    transaction_id: Optional[str] = None
+    charged_amount: Optional[str] = None
+    expires: Optional[datetime] = None
+
+
+@dataclass
+class DomainInfo:
+    domain: str
+    owner_name: str
+    is_owner: bool
+    status: str
+    created: Optional[datetime]
+    expires: Optional[datetime]
+    is_locked: bool
+    auto_renew: bool
+    whoisguard_enabled: bool
+    is_premium: bool
+    nameservers: List[str] = field(default_factory=list)
+
+
+@dataclass
+class DomainListEntry:
+    domain: str
+    registrar_id: Optional[str]
+    owner_name: str
+    created: Optional[datetime]
+    expires: Optional[datetime]
+    is_expired: bool
+    is_locked: bool
+    auto_renew: bool
+    whoisguard: str
+    is_premium: bool
+    is_our_dns: bool
+
+
+@dataclass
+class DomainListPage:
+    entries: List[DomainListEntry]
+    total_items: int
+    current_page: int
+    page_size: int
+
+
+@dataclass
+class DnsHost:
+    host_id: Optional[str]
+    name: str
+    type: str
+    address: str
+    ttl: int
+    mx_pref: Optional[int]
+    is_active: bool
+
+
+def _bool(value: Optional[str], default: bool = False) -> bool:
+    if value is None:
+        return default
+    return value.lower() == "true"
+
+
+def parse_date(value: Optional[str]) -> Optional[datetime]:
+    """Parses Namecheap dates, either MM/DD/YYYY or MM/DD/YYYY HH:MM:SS AM/PM."""
+    if not value:
+        return None
+    for date_format in ("%m/%d/%Y", "%m/%d/%Y %I:%M:%S %p"):
+        try:
+            return datetime.strptime(value.strip(), date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def parse_response(source: XmlSource) -> ET.Element:
+    """
+    Parses a Namecheap response document and returns its root element.
+    Raises NamecheapApiError if the response reports an error.
+    """
+    if isinstance(source, ET.Element):
+        return source
+    root = ET.fromstring(source)
+    if root.get("Status") == "ERROR":
+        errors = list(root.iter(TAG_ERROR))
+        raise NamecheapApiError([(e.text or "Unknown error").strip() for e in errors],
+                                [e.get("Number") for e in errors if e.get("Number")])
+    return root
+
+
+def parse_domain_check(source: XmlSource) -> List[DomainCheckResult]:
+    """namecheap.domains.check"""
+    results = []
+    for element in parse_response(source).iter(TAG_DOMAIN_CHECK_RESULT):
+        is_premium = _bool(element.get("IsPremiumName"))
+        results.append(DomainCheckResult(
+            domain=element.get("Domain"),
+            available=_bool(element.get("Available")),
+            is_premium=is_premium,
+            premium_registration_price=float(element.get("PremiumRegistrationPrice") or 0) if is_premium else 0.0
+        ))
+    return results
+
+
+def iter_pricing(source: Union[str, bytes]) -> Iterator[ProductPrice]:
+    """
+    namecheap.users.getPricing
+
+    Streams Price entries with iterparse and frees each Product once it has been
+    read, so the full catalog (every TLD, category and duration) is never held
+    as a complete tree.
+    """
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+
+    category = None
+    tld = None
+    root = None
+    errors = []
+    for event, element in ET.iterparse(io.BytesIO(source), events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = element
+            elif element.tag == TAG_PRODUCT_CATEGORY:
+                category = (element.get("Name") or "").lower()
+            elif element.tag == TAG_PRODUCT:
+                tld = (element.get("Name") or "").lower()
+            continue
+
+        if element.tag == TAG_PRICE:
+            try:
+                price = ProductPrice(
+                    category=category,
+                    tld=tld,
+                    duration=int(element.get("Duration", "0")),
+                    duration_type=element.get("DurationType", "YEAR"),
+                    price=float(element.get("Price"))
+                )
+            except (TypeError, ValueError):
+                price = None
+            if price is not None:
+                yield price
+        elif element.tag == TAG_PRODUCT:
+            element.clear()
+        elif element.tag == TAG_ERROR:
+            errors.append(element)
+
+    if root is not None and root.get("Status") == "ERROR":
+        raise NamecheapApiError([(e.text or "Unknown error").strip() for e in errors],
+                                [e.get("Number") for e in errors if e.get("Number")])
+
+
+def parse_domain_create(source: XmlSource) -> DomainCreateResult:
+    """namecheap.domains.create"""
+    element = next(parse_response(source).iter(TAG_DOMAIN_CREATE_RESULT), None)
+    if element is None:
+        return DomainCreateResult(domain="", registered=False)
+    return DomainCreateResult(
+        domain=element.get("Domain", ""),
+        registered=_bool(element.get("Registered")),
+        order_id=element.get("OrderID"),
+        transaction_id=element.get("TransactionID"),
+        charged_amount=element.get("ChargedAmount")
+    )
+
+
+def parse_domain_renew(source: XmlSource) -> DomainRenewResult:
+    """namecheap.domains.renew"""
+    element = next(parse_response(source).iter(TAG_DOMAIN_RENEW_RESULT), None)
+    if element is None:
+        return DomainRenewResult(domain="", renewed=False)
+
+    expired_date = element.find(f"{TAG_DOMAIN_DETAILS}/{TAG_EXPIRED_DATE}")
+    return DomainRenewResult(
+        domain=element.get("DomainName", ""),
+        renewed=_bool(element.get("Renew")),
+        order_id=element.get("OrderID"),
+        transaction_id=element.get("TransactionID"),
+        charged_amount=element.get("ChargedAmount"),
+        expires=parse_date(expired_date.text) if expired_date is not None else None
+    )
+
+
+def parse_domain_info(source: XmlSource) -> Optional[DomainInfo]:
+    """namecheap.domains.getInfo"""
+    element = next(parse_response(source).iter(TAG_DOMAIN_INFO_RESULT), None)
+    if element is None:
+        return None
+
+    # Dates are attributes on older responses and DomainDetails children on current ones
+    created = element.get("CreatedDate")
+    expires = element.get("ExpiredDate")
+    details = element.find(TAG_DOMAIN_DETAILS)
+    if details is not None:
+        created = created or details.findtext(TAG_CREATED_DATE)
+        expires = expires or details.findtext(TAG_EXPIRED_DATE)
+
+    whoisguard = element.find(TAG_WHOISGUARD)
+    dns_details = element.find(TAG_DNS_DETAILS)
+    nameservers = []
+    if dns_details is not None:
+        nameservers = [(ns.text or "").strip() for ns in dns_details.iter(TAG_NAMESERVER)]
+
+    return DomainInfo(
+        domain=element.get("DomainName", ""),
+        owner_name=element.get("OwnerName", ""),
+        is_owner=_bool(element.get("IsOwner")),
+        status=element.get("Status", "Unknown"),
+        created=parse_date(created),
+        expires=parse_date(expires),
+        is_locked=_bool(element.get("IsLocked")),
+        auto_renew=_bool(element.get("AutoRenew")),
+        whoisguard_enabled=_bool(whoisguard.get("Enabled")) if whoisguard is not None else False,
+        is_premium=_bool(element.get("IsPremium")),
+        nameservers=nameservers
+    )
+
+
+def parse_domain_list(source: XmlSource) -> DomainListPage:
+    """namecheap.domains.getList"""
+    root = parse_response(source)
+    entries = []
+    result = next(root.iter(TAG_DOMAIN_LIST_RESULT), None)
+    if result is not None:
+        for element in result.iter(TAG_DOMAIN):
+            entries.append(DomainListEntry(
+                domain=element.get("Name", "").lower(),
+                registrar_id=element.get("ID"),
+                owner_name=element.get("User", ""),
+                created=parse_date(element.get("Created")),
+                expires=parse_date(element.get("Expires")),
+                is_expired=_bool(element.get("IsExpired")),
+                is_locked=_bool(element.get("IsLocked")),
+                auto_renew=_bool(element.get("AutoRenew")),
+                whoisguard=element.get("WhoisGuard", "NOTPRESENT"),
+                is_premium=_bool(element.get("IsPremium")),
+                is_our_dns=_bool(element.get("IsOurDNS"))
+            ))
+
+    paging = next(root.iter(TAG_PAGING), None)
+
+    def _paging_int(tag: str, default: int) -> int:
+        value = paging.findtext(tag) if paging is not None else None
+        return int(value) if value and value.strip().isdigit() else default
+
+    return DomainListPage(
+        entries=entries,
+        total_items=_paging_int(TAG_TOTAL_ITEMS, len(entries)),
+        current_page=_paging_int(TAG_CURRENT_PAGE, 1),
+        page_size=_paging_int(TAG_PAGE_SIZE, len(entries))
+    )
+
+
+def parse_dns_hosts(source: XmlSource) -> List[DnsHost]:
+    """namecheap.domains.dns.getHosts"""
+    hosts = []
+    for element in parse_response(source).iter(TAG_HOST):
+        mx_pref = element.get("MXPref")
+        hosts.append(DnsHost(
+            host_id=element.get("HostId"),
+            name=element.get("Name", ""),
+            type=element.get("Type", ""),
+            address=element.get("Address", ""),
+            ttl=int(element.get("TTL") or 1800),
+            mx_pref=int(mx_pref) if mx_pref else None,
+            is_active=_bool(element.get("IsActive"), default=True)
+        ))
+    return hosts
+
+
+def parse_set_hosts(source: XmlSource) -> bool:
+    """namecheap.domains.dns.setHosts. Returns True if Namecheap reports success."""
+    element = next(parse_response(source).iter(TAG_SET_HOSTS_RESULT), None)
+    return element is not None and _bool(element.get("IsSuccess"))
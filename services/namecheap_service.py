@@ -1,10 +1,19 @@
 import os
-import requests
 import xml.etree.ElementTree as ET
 from dotenv import load_dotenv
-import concurrent.futures
 from datetime import datetime, timedelta
 from services.database_service import DatabaseService
+from services.namecheap_client import get_namecheap_client, resolve_namecheap_api_url
+from services.domain_batcher import get_domain_batcher
+from services.pricing_catalog import get_pricing_catalog
+from services.availability_cache import get_availability_cache
+from services.registered_index import get_registered_index
+from services.single_flight import get_single_flight
+from services import registrar_sync
+from services import namecheap_parser
+from services.namecheap_parser import NamecheapApiError
+from services.rate_limiter import Priority, RateLimitExceeded, request_priority
+from services.circuit_breaker import CircuitOpenError
 import utils.utils as utils
 import models.db_models as models
 database_service = DatabaseService()
@@ -18,8 +27,14 @@ class NamecheapService:
         self.api_key = os.getenv("API_KEY")
         self.username = os.getenv("NAMEOFUSER")
         self.client_ip = os.getenv("CLIENT_IP")
-        self.api_url = "https://api.sandbox.namecheap.com/xml.response"
-        self.tld_price_cache = {}
+        self.api_url = resolve_namecheap_api_url()
+        self.client = get_namecheap_client()
+        self.batcher = get_domain_batcher()
+        self.pricing_catalog = get_pricing_catalog()
+        self.availability_cache = get_availability_cache()
+        self.registered_index = get_registered_index()
+        self.search_flight = get_single_flight("domain-search")
+        self.pricing_flight = get_single_flight("tld-pricing")
 
     def _build_api_url(self, command, **params):
         """Builds a Namecheap API request URL with common parameters."""
@@ -31,83 +46,41 @@ class NamecheapService:
 
     def _make_api_request(self, url):
         """Make request to Namecheap API."""
-        response = requests.get(url)
+        response = self.client.get(url)
 
         if response.status_code != 200:
             raise Exception(f"Failed to fetch response from Namecheap API. Status code: {response.status_code}")
 
         return response
 
-    def check_domain_availability(self, domain: str):
+    def _split_search_query(self, domain: str):
+        """Returns (base_name, original_domain) for a search query."""
         if "." in domain:
-            base_name = domain.split('.')[0]
-            original_domain = domain
-        else:
-            base_name = domain
-            original_domain = f"{domain}.com"
+            return domain.split('.')[0], domain
+        return domain, f"{domain}.com"
+
+    def check_domain_availability(self, domain: str):
+        """
+        Checks a domain and its suggestions. Identical searches that are already
+        in flight share one upstream check instead of sending their own batches.
+        """
+        key = domain.strip().lower()
+        return self.search_flight.do(key, lambda: self._check_domain_availability(domain))
+
+    def _check_domain_availability(self, domain: str):
+        base_name, original_domain = self._split_search_query(domain)
 
         similar_domains = utils.generate_similar_domains(base_name)
         all_domains_to_check = [original_domain] + similar_domains
 
-        batch_size = 2
-        domain_results = {}
-        tlds_to_check = set()
-
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            # Split domains into batches
-            batches = [all_domains_to_check[i:i + batch_size]
-                       for i in range(0, len(all_domains_to_check), batch_size)]
-            future_to_batch = {executor.submit(self._check_domain_batch, batch): batch
-                               for batch in batches}
-
-            for future in concurrent.futures.as_completed(future_to_batch):
-                batch_results = future.result()
-                domain_results.update(batch_results)
-
-                for domain_name in batch_results:
-                    tld = domain_name.split(".")[-1]
-                    tlds_to_check.add(tld)
-
-        tlds_needing_price = [tld for tld in tlds_to_check if tld not in self.tld_price_cache]
-        if tlds_needing_price:
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future_to_tld = {executor.submit(self.get_tld_price, tld): tld
-                                 for tld in tlds_needing_price}
-
-                for future in concurrent.futures.as_completed(future_to_tld):
-                    tld = future_to_tld[future]
-                    try:
-                        result = future.result()
-                        if not isinstance(result, dict) or "error" not in result:  # If not an error dict
-                            # Assuming get_tld_price now returns a dict with price and duration
-                            self.tld_price_cache[tld] = result
-                    except Exception as e:
-                        print(f"Error fetching price for TLD {tld}: {e}")
-
-        for domain_name, domain_data in domain_results.items():
-            if not domain_data["is_premium"]:
-                tld = domain_name.split(".")[-1]
-                if tld in self.tld_price_cache:
-                    price_info = self.tld_price_cache[tld]
-                    if isinstance(price_info, dict):
-                        # If price cache now stores a dict with price and duration
-                        domain_data["price"] = price_info["price"]
-                        domain_data["min_duration"] = price_info["min_duration"]
-                    else:
-                        # Backward compatibility if price cache still has just the price
-                        domain_data["price"] = price_info
-                        domain_data["min_duration"] = 1  # Default duration
+        domain_results = self._check_domains(all_domains_to_check)
 
         original_result = None
         suggestions = []
 
         for domain_name, domain_data in domain_results.items():
-            if domain_data["available"]:
-                domain_info = {
-                    "domain": domain_name,
-                    "price": domain_data.get("price"),
-                    "min_duration": domain_data.get("min_duration", 1)  # Default to 1 if not found
-                }
+            if domain_data["available"] or "listing" in domain_data:
+                domain_info = self._to_domain_info(domain_name, domain_data)
 
                 if domain_name.lower() == original_domain.lower():
                     original_result = domain_info
@@ -120,37 +93,184 @@ class NamecheapService:
 
         return response
 
-    def _check_domain_batch(self, domain_batch):
-        """Check availability for a batch of domains, including premium details."""
-        url = self._build_api_url("namecheap.domains.check", DomainList=",".join(domain_batch))
+    def iter_domain_availability(self, domain: str):
+        """
+        Streaming variant of check_domain_availability.
+
+        Yields the exact-match result first, then available suggestions batch by
+        batch as soon as each Namecheap call completes, and finally a "done" event.
+        If the search is shed by the rate limiter or an open circuit, an "error"
+        event is sent before "done".
+        """
+        base_name, original_domain = self._split_search_query(domain)
+        original_key = original_domain.lower()
+
+        candidates = [original_domain] + [d for d in utils.generate_similar_domains(base_name)
+                                          if d.lower() != original_key]
+        candidates = list(dict.fromkeys(candidates))
+
+        cached, misses = self._lookup_local(candidates)
+        checked = len(cached)
+
+        # Suggestions that complete before the exact match are held back until it has been sent
+        pending_suggestions = []
+        exact_sent = False
+
+        def split_results(results):
+            exact, suggestions = None, []
+            for domain_name, domain_data in results.items():
+                if domain_name.lower() == original_key:
+                    exact = (domain_name, domain_data)
+                elif domain_data["available"] or "listing" in domain_data:
+                    suggestions.append(self._to_domain_info(domain_name, domain_data))
+            return exact, suggestions
+
+        def exact_event(exact):
+            if exact is None:
+                return {"event": "domain", "domain": original_domain, "available": None}
+            domain_name, domain_data = exact
+            event = {"event": "domain", "available": domain_data["available"]}
+            event.update(self._to_domain_info(domain_name, domain_data))
+            return event
+
+        exact, suggestions = split_results(cached)
+        pending_suggestions.extend(suggestions)
+        if original_domain not in misses:
+            yield exact_event(exact)
+            exact_sent = True
+            if pending_suggestions:
+                yield {"event": "suggestions", "suggestions": pending_suggestions}
+                pending_suggestions = []
+
+        # The exact match gets its own batch so its result is not held up by the suggestions
+        batches = []
+        if not exact_sent:
+            batches.append([original_domain])
+        batches.extend(self.batcher.split([d for d in misses if d.lower() != original_key]))
 
         try:
-            response = self._make_api_request(url)
-            print(response.text)  # Debugging line, can be removed
-            root = ET.fromstring(response.text)
-            namespace = {"nc": "http://api.namecheap.com/xml.response"}
-
-            batch_results = {}
-            for domain_result in root.findall(".//nc:DomainCheckResult", namespace):
-                domain_name = domain_result.get("Domain")
-                available = domain_result.get("Available") == "true"
-                is_premium = domain_result.get("IsPremiumName") == "true"
-
-                if is_premium:
-                    premium_price = float(domain_result.get("PremiumRegistrationPrice", 0))
-                else:
-                    premium_price = 0
+            for batch, batch_results in self.batcher.iter_batches(batches, self._check_domain_batch):
+                self.availability_cache.set_many(batch_results)
+                checked += len(batch_results)
+                exact, suggestions = split_results(batch_results)
+
+                if not exact_sent:
+                    if original_domain not in batch:
+                        pending_suggestions.extend(suggestions)
+                        continue
+                    yield exact_event(exact)
+                    exact_sent = True
+                    suggestions = pending_suggestions + suggestions
+                    pending_suggestions = []
+
+                if suggestions:
+                    yield {"event": "suggestions", "suggestions": suggestions}
+        except (RateLimitExceeded, CircuitOpenError) as e:
+            if not exact_sent:
+                yield exact_event(None)
+            yield {"event": "error", "error": str(e), "retry_after": round(e.retry_after, 1)}
+
+        yield {"event": "done", "checked": checked}
+
+    def iter_bulk_availability(self, domains):
+        """
+        Checks a pre-normalized list of domains (see services.bulk_availability) and
+        yields lists of results: cached ones first, then each Namecheap batch as it completes.
+        Domains whose batch failed are returned with "available": None.
+        RateLimitExceeded/CircuitOpenError propagate so the caller can stop or retry.
+        """
+        cached, misses = self._lookup_local(domains)
+        if cached:
+            yield [self._to_bulk_result(name, data) for name, data in cached.items()]
+
+        for batch, batch_results in self.batcher.iter_batches(self.batcher.split(misses), self._check_domain_batch):
+            self.availability_cache.set_many(batch_results)
+            yield [
+                self._to_bulk_result(name, batch_results[name]) if name in batch_results
+                else {"domain": name, "available": None, "error": "Availability check failed"}
+                for name in batch
+            ]
+
+    def _to_bulk_result(self, domain_name, domain_data):
+        result = {"domain": domain_name, "available": domain_data["available"], "is_premium": domain_data["is_premium"]}
+        if domain_data["available"] or "listing" in domain_data:
+            result.update(self._to_domain_info(domain_name, domain_data))
+        return result
+
+    def _to_domain_info(self, domain_name, domain_data):
+        """
+        Formats a domains.check result for the API, pricing regular names from the local catalog.
+        Names listed on our marketplace are reported with the listing's price instead.
+        """
+        listing = domain_data.get("listing")
+        if listing is not None:
+            return {
+                "domain": domain_name,
+                "price": listing["price"],
+                "min_duration": 1,
+                "available_on_market": True,
+                "listing_id": listing["listing_id"]
+            }
+
+        price = domain_data.get("price")
+        min_duration = 1
+
+        if not domain_data["is_premium"]:
+            price_info = self.get_tld_price(domain_name.split(".")[-1])
+            if "error" not in price_info:
+                price = price_info["price"]
+                min_duration = price_info["min_duration"]
+
+        return {
+            "domain": domain_name,
+            "price": price,
+            "min_duration": min_duration
+        }
 
-                batch_results[domain_name] = {
-                    "available": available,
-                    "is_premium": is_premium,
-                    "price": premium_price
-                }
+    def _check_domains(self, domains):
+        """
+        Returns availability for the domains, serving cached results where possible.
+        Only the cache misses are sent to Namecheap.
+        """
+        domains = list(dict.fromkeys(domains))
+        domain_results, misses = self._lookup_local(domains)
 
-            return batch_results
-        except Exception as e:
-            print(f"Error checking domain batch: {e}")
-            return {}
+        if misses:
+            # Misses are packed into as few domains.check calls as the batcher allows
+            fetched = self.batcher.check(misses, self._check_domain_batch)
+            self.availability_cache.set_many(fetched)
+            domain_results.update(fetched)
+
+        return domain_results
+
+    def _lookup_local(self, domains):
+        """
+        Resolves what we can without Namecheap: names registered or listed through
+        this marketplace (registered index), then the shared availability cache.
+        Returns (results keyed by domain, domains that still need an upstream check).
+        """
+        known, remaining = self.registered_index.lookup(domains)
+        cached, misses = self.availability_cache.get_many(remaining)
+        known.update(cached)
+        return known, misses
+
+    def _check_domain_batch(self, domain_batch):
+        """
+        Check availability for a batch of domains, including premium details.
+        Raises on request or API errors so the batcher can split and retry the batch.
+        """
+        url = self._build_api_url("namecheap.domains.check", DomainList=",".join(domain_batch))
+
+        response = self._make_api_request(url)
+
+        return {
+            result.domain: {
+                "available": result.available,
+                "is_premium": result.is_premium,
+                "price": result.premium_registration_price
+            }
+            for result in namecheap_parser.parse_domain_check(response.content)
+        }
 
     def get_trending_tlds(self):
         """Fetches trending TLDs and their pricing."""
@@ -187,26 +307,25 @@ class NamecheapService:
                 print("Failed to get a valid response from Namecheap API.")
                 return []  # Return empty if the API call failed
 
-            # 2. PARSING XML: Use ElementTree to parse the response
-            root = ET.fromstring(response_availability.text)
-            namespace = {'ns': 'http://api.namecheap.com/xml.response'}
-
-            for result in root.findall('.//ns:DomainCheckResult', namespace):
-                # The critical check, identical to the logic in _check_domain_batch
-                if result.get('Available').lower() == 'true':
-                    domain_name = result.get('Domain')
-                    price_info = self.get_tld_price("com")
-
-                    if isinstance(price_info, dict) and "price" in price_info:
-                        available_domains.append({
-                            "domain": domain_name,
-                            "price": price_info["price"]
-                        })
+            # 2. PARSING XML: Same parser as the main search function
+            results = namecheap_parser.parse_domain_check(response_availability.content)
+
+            price_info = self.get_tld_price("com")
+
+            for result in results:
+                if result.available and isinstance(price_info, dict) and "price" in price_info:
+                    available_domains.append({
+                        "domain": result.domain,
+                        "price": price_info["price"]
+                    })
             return available_domains
 
         except ET.ParseError as e:
             print(f"Error parsing XML from Namecheap: {e}")
             return []
+        except NamecheapApiError as e:
+            print(f"Namecheap API Error in get_trending_available_domains: {e}")
+            return []
         except Exception as e:
             print(f"An unexpected error occurred in get_trending_available_domains: {e}")
             return []
@@ -235,18 +354,11 @@ class NamecheapService:
 
         url = self._build_api_url("namecheap.domains.create", **params)
         try:
-            response = self._make_api_request(url)
-            root = ET.fromstring(response.text)
-            ns = {'ns': 'http://api.namecheap.com/xml.response'}
+            with request_priority(Priority.CRITICAL):
+                response = self._make_api_request(url)
+            result = namecheap_parser.parse_domain_create(response.content)
 
-            # Check for API errors
-            error = root.find(".//ns:Error", ns)
-            if error is not None:
-                return {"success": False, "error": error.text}
-
-            # Check registration result
-            result = root.find(".//ns:DomainCreateResult", ns)
-            if result is not None and result.attrib.get("Registered") == "true":
+            if result.registered:
 
                 user = db.query(models.User).filter(models.User.username == username).first()
                 if user:
@@ -262,74 +374,86 @@ class NamecheapService:
                     )
                     db.add(new_domain_record)
                     db.commit()
+                    self.registered_index.add(domain)
 
                 return {
                     "success": True,
                     "message": "Domain registered successfully",
-                    "order_id": result.attrib.get("OrderID")
+                    "order_id": result.order_id
                 }
 
             return {"success": False, "error": "Domain registration failed."}
 
+        except NamecheapApiError as e:
+            return {"success": False, "error": e.messages[0]}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-    def get_tld_price(self, tld):
-        """Fetches the registration price and minimum duration of a given TLD"""
-        # Return cached info if available
-        if tld in self.tld_price_cache:
-            return self.tld_price_cache[tld]
+    def get_tld_price(self, tld, category="register"):
+        """
+        Returns the price (CAD) and minimum duration of a TLD from the local pricing catalog.
+        category is "register" or "renew".
+        """
+        price_info = self.pricing_catalog.get_price(tld, category)
+
+        # The beat job has not published a catalog yet, build it once from this process.
+        # Concurrent lookups wait for that single getPricing call instead of making their own.
+        if price_info is None and not self.pricing_catalog.is_loaded():
+            result = self.pricing_flight.do("bootstrap", self._bootstrap_pricing_catalog)
+            # Another process may have published the catalog while this one lost the bootstrap lock
+            price_info = self.pricing_catalog.get_price(tld, category)
+            if price_info is None and "error" in result and not self.pricing_catalog.is_loaded():
+                return result
+
+        if price_info is None:
+            return {"error": f"Product not found for {tld}"}
+        return price_info
+
+    def _bootstrap_pricing_catalog(self):
+        if not self.pricing_catalog.should_bootstrap():
+            return {"error": "Pricing catalog is not available yet"}
+        return self.refresh_pricing_catalog()
+
+    def fetch_pricing_catalog(self):
+        """
+        Pulls the full domain price list (all TLDs) in a single getPricing call.
+
+        Returns:
+            {"register": {tld: {"price", "min_duration", "duration_type"}}, "renew": {...}}
+            with prices in USD, using the minimum duration of each TLD.
+        """
+        url = self._build_api_url("namecheap.users.getPricing", ProductType="DOMAIN")
+        response = self._make_api_request(url)
+
+        # The price list covers every TLD and duration; stream it instead of building the whole tree
+        categories = {}
+        for entry in namecheap_parser.iter_pricing(response.content):
+            if entry.category not in ("register", "renew"):
+                continue
+
+            products = categories.setdefault(entry.category, {})
+            current = products.get(entry.tld)
+            if current is None or (entry.duration, entry.price) < (current["min_duration"], current["price"]):
+                products[entry.tld] = {
+                    "price": entry.price,
+                    "min_duration": entry.duration,
+                    "duration_type": entry.duration_type
+                }
 
-        url = self._build_api_url(
-            "namecheap.users.getPricing",
-            ProductType="DOMAIN",
-            ProductCategory="REGISTER",
-            ProductName=tld.upper()
-        )
+        return categories
 
+    def refresh_pricing_catalog(self):
+        """Fetches the full price list and publishes it as a new catalog version."""
         try:
-            response = self._make_api_request(url)
-            ns = {'ns': 'http://api.namecheap.com/xml.response'}  # Namespace dictionary
-            root = ET.fromstring(response.text)
-
-            product_element = root.find(
-                ".//ns:ProductCategory[@Name='register']/ns:Product[@Name='{0}']".format(tld.lower()),
-                namespaces=ns)
-
-            if product_element is not None:
-                # Find the price element with the minimum duration
-                price_elements = product_element.findall("ns:Price", namespaces=ns)
-                if price_elements:
-                    # Sort by Duration to find the minimum available
-                    price_elements.sort(key=lambda x: int(x.get("Duration", "0")))
-                    price_element = price_elements[0]  # Get the one with the lowest duration
-
-                    price_str = price_element.get("Price")
-                    duration_str = price_element.get("Duration")
-
-                    if price_str is not None and duration_str is not None:
-                        try:
-                            price = float(price_str)
-                            duration = int(duration_str)
-                            converted_price = utils.convert_usd_to_cad(price)
-
-                            # Store both price and duration in the cache
-                            result = {
-                                "price": converted_price,
-                                "min_duration": duration,
-                                "duration_type": price_element.get("DurationType", "YEAR")
-                            }
-
-                            self.tld_price_cache[tld] = result  # Cache the result
-                            return result
-                        except ValueError:
-                            return {"error": f"Invalid format for price or duration: {price_str}, {duration_str}"}
-                    return {"error": f"Price or duration attribute missing for {tld}"}
-                else:
-                    return {"error": f"No price elements found for {tld}"}
-            else:
-                return {"error": f"Product not found for {tld}"}
+            categories = self.fetch_pricing_catalog()
+            if not categories:
+                return {"error": "Namecheap returned an empty price list"}
+
+            exchange_rate = utils.get_usd_to_cad_rate()
+            if exchange_rate is None:
+                return {"error": "Could not fetch USD to CAD exchange rate"}
 
+            return self.pricing_catalog.publish(categories, exchange_rate)
         except ET.ParseError as e:
             return {"error": f"Failed to parse XML response: {str(e)}"}
         except Exception as e:
@@ -355,47 +479,26 @@ class NamecheapService:
         url = self._build_api_url("namecheap.domains.renew", **params)
 
         try:
-            response = self._make_api_request(url)
-            root = ET.fromstring(response.text)
-            ns = {'ns': 'http://api.namecheap.com/xml.response'}
-
-            # Check for API errors
-            error = root.find(".//ns:Error", ns)
-            if error is not None:
-                return {"success": False, "error": error.text, "code": error.attrib.get("Number")}
-
-            # Check renew result
-            renew_result = root.find(".//ns:DomainRenewResult", ns)
-
-            if renew_result is not None and renew_result.attrib.get("Renew") == "true":
-                charged_amount = renew_result.attrib.get("ChargedAmount")
-                order_id = renew_result.attrib.get("OrderID")
-                transaction_id = renew_result.attrib.get("TransactionID")
-
-                # Extract new expiration date from response details
-                domain_details = renew_result.find("ns:DomainDetails", ns)
-                expired_date_str = domain_details.find("ns:ExpiredDate",
-                                                       ns).text if domain_details is not None else None
-
-                new_expiry_date = None
-                if expired_date_str:
-                    try:
-                        # Namecheap usually returns "MM/DD/YYYY HH:MM:SS AM/PM"
-                        new_expiry_date = datetime.strptime(expired_date_str, "%m/%d/%Y %I:%M:%S %p")
-                    except ValueError:
-                        pass
+            with request_priority(Priority.CRITICAL):
+                response = self._make_api_request(url)
+            result = namecheap_parser.parse_domain_renew(response.content)
 
+            if result.renewed:
+                # The mirrored expiry is now out of date; serve live data until the next sync
+                registrar_sync.mark_stale(domain_name)
                 return {
                     "success": True,
                     "message": "Domain renewed successfully",
-                    "charged_amount": charged_amount,
-                    "order_id": order_id,
-                    "transaction_id": transaction_id,
-                    "new_expiry_date": new_expiry_date
+                    "charged_amount": result.charged_amount,
+                    "order_id": result.order_id,
+                    "transaction_id": result.transaction_id,
+                    "new_expiry_date": result.expires
                 }
 
             return {"success": False, "error": "Domain renewal failed (API returned false)."}
 
+        except NamecheapApiError as e:
+            return {"success": False, "error": e.messages[0], "code": e.number}
         except Exception as e:
             return {"success": False, "error": f"Exception during renewal: {str(e)}"}
 
@@ -6,6 +6,7 @@ import stripe
 from stripe import SetupIntent, PaymentMethod
 
 from services.namecheap_service import NamecheapService
+from services.circuit_breaker import get_circuit_breaker
 from models.db_models import Transaction, TransactionType, Domain, User
 from models.api_dto import PaymentRequest
 
@@ -35,6 +36,13 @@ class PaymentService:
         if total_price <= 0:
             return {"error": "Invalid domain price provided."}
 
+        # Don't charge the card while registrations are known to be failing
+        if get_circuit_breaker("namecheap.domains.create").is_open():
+            raise HTTPException(
+                status_code=503,
+                detail="Domain registration is temporarily unavailable. Please try again in a few minutes."
+            )
+
         payment_response = self.create_and_confirm_payment(
             amount=amount_in_cents,
             customer_id=user.stripe_customer_id,
@@ -0,0 +1,198 @@
+import os
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+import redis
+from dotenv import load_dotenv
+
+from database.redis_connection import get_redis
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+CATALOG_KEY = "namecheap:pricing:catalog"
+VERSION_KEY = "namecheap:pricing:version"
+REFRESH_LOCK_KEY = "namecheap:pricing:refresh-lock"
+
+
+class PricingCatalog:
+    """
+    Local copy of the full Namecheap TLD price list (REGISTER and RENEW).
+
+    The catalog is published to Redis by the Celery beat job together with an
+    incrementing version and a timestamp. Every process keeps the decoded
+    catalog in memory and only re-reads it from Redis when the version changes,
+    so price lookups are plain dict reads. A catalog this process fetched itself
+    is used right away; if Redis is down it is kept locally and published on a
+    later sync.
+    """
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None):
+        self.redis = redis_client or get_redis()
+        self.version_check_interval = float(os.getenv("PRICING_CATALOG_CHECK_INTERVAL", "60"))
+        self.bootstrap_retry_interval = float(os.getenv("PRICING_CATALOG_BOOTSTRAP_RETRY", "60"))
+
+        self._catalog: Optional[Dict] = None
+        self._version: Optional[int] = None
+        self._unpublished: Optional[Dict] = None
+        self._checked_at = 0.0
+        self._bootstrap_attempted_at = 0.0
+        self._lock = threading.Lock()
+
+    def get_price(self, tld: str, category: str = "register") -> Optional[Dict]:
+        """
+        Returns {"price", "min_duration", "duration_type"} in CAD for a TLD,
+        or None if the TLD is not in the catalog.
+        """
+        self._sync()
+        if not self._catalog:
+            return None
+        return self._catalog["categories"].get(category.lower(), {}).get(tld.lower())
+
+    def is_loaded(self) -> bool:
+        self._sync()
+        return self._catalog is not None
+
+    def should_bootstrap(self) -> bool:
+        """True if this process should try to build the catalog itself (beat has not run yet)."""
+        if self.is_loaded():
+            return False
+        now = time.time()
+        with self._lock:
+            if now - self._bootstrap_attempted_at < self.bootstrap_retry_interval:
+                return False
+            self._bootstrap_attempted_at = now
+        try:
+            # Only one process bootstraps at a time; the others keep using the API error path.
+            return bool(self.redis.set(REFRESH_LOCK_KEY, "1", nx=True, ex=120))
+        except redis.RedisError as e:
+            logger.warning("Pricing catalog bootstrap lock unavailable: %s", e)
+            return True
+
+    def publish(self, categories: Dict[str, Dict[str, Dict]], usd_to_cad_rate: float) -> Dict:
+        """
+        Converts a parsed USD price list to CAD and stores it as the new catalog version.
+
+        Args:
+            categories: {"register": {tld: {"price", "min_duration", "duration_type"}}, "renew": {...}}
+                        with prices in USD.
+            usd_to_cad_rate: Exchange rate applied to every price.
+
+        Returns:
+            Summary with the new version and the number of TLDs per category.
+        """
+        converted = {}
+        for category, products in categories.items():
+            converted[category] = {
+                tld: {
+                    "price": round(info["price"] * usd_to_cad_rate, 2),
+                    "min_duration": info["min_duration"],
+                    "duration_type": info["duration_type"]
+                }
+                for tld, info in products.items()
+            }
+
+        catalog = {
+            "currency": "CAD",
+            "usd_to_cad_rate": usd_to_cad_rate,
+            "updated_at": datetime.utcnow().isoformat(),
+            "categories": converted,
+            "version": None
+        }
+
+        # Serve it from this process first, whatever happens to the publish
+        with self._lock:
+            self._catalog = catalog
+            self._version = None
+            self._unpublished = catalog
+            self._checked_at = time.time()
+            version = self._publish_unpublished()
+
+        return {
+            "version": version,
+            "published": version is not None,
+            "updated_at": catalog["updated_at"],
+            "tld_counts": {category: len(products) for category, products in converted.items()}
+        }
+
+    def _publish_unpublished(self) -> Optional[int]:
+        """Stores the locally fetched catalog in Redis as a new version. Call with the lock held."""
+        catalog = self._unpublished
+        try:
+            version = self.redis.incr(VERSION_KEY)
+            stored = dict(catalog, version=version)
+            pipe = self.redis.pipeline()
+            pipe.set(CATALOG_KEY, json.dumps(stored))
+            pipe.delete(REFRESH_LOCK_KEY)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning("Could not publish pricing catalog, serving it locally for now: %s", e)
+            return None
+        catalog["version"] = version
+        self._version = version
+        self._unpublished = None
+        return version
+
+    def get_info(self) -> Dict:
+        """Version and freshness of the catalog loaded in this process."""
+        self._sync()
+        if not self._catalog:
+            return {"loaded": False}
+        return {
+            "loaded": True,
+            "version": self._version,
+            "published": self._unpublished is None,
+            "updated_at": self._catalog["updated_at"],
+            "tld_counts": {category: len(products) for category, products in self._catalog["categories"].items()}
+        }
+
+    def _sync(self):
+        """
+        Reloads the catalog from Redis if a newer version has been published.
+        Until a catalog is loaded the version is checked on every call, so a
+        catalog bootstrapped by another process is picked up right away.
+        """
+        now = time.time()
+        if self._catalog is not None and now - self._checked_at < self.version_check_interval:
+            return
+
+        with self._lock:
+            if self._catalog is not None and now - self._checked_at < self.version_check_interval:
+                return
+            self._checked_at = now
+            try:
+                if self._unpublished is not None:
+                    # Redis was down when this process fetched the catalog
+                    self._publish_unpublished()
+                    return
+                remote_version = self.redis.get(VERSION_KEY)
+                if remote_version is None or int(remote_version) == self._version:
+                    return
+                raw = self.redis.get(CATALOG_KEY)
+                if raw is None:
+                    return
+                catalog = json.loads(raw)
+                self._catalog = catalog
+                self._version = catalog.get("version")
+            except (redis.RedisError, ValueError) as e:
+                # Keep serving the copy we already have
+                logger.warning("Could not sync pricing catalog from Redis: %s", e)
+
+
+_catalog_lock = threading.Lock()
+_catalog: Optional[PricingCatalog] = None
+
+
+def get_pricing_catalog() -> PricingCatalog:
+    """Returns the process-wide PricingCatalog."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = PricingCatalog()
+    return _catalog
@@ -0,0 +1,272 @@
+import os
+import time
+import random
+import asyncio
+import logging
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Dict, Optional
+
+import redis
+from dotenv import load_dotenv
+
+from database.redis_connection import get_redis
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+BUCKET_KEY = "namecheap:ratelimit:bucket"
+
+# Token bucket shared by every API worker and Celery process.
+# Takes one token only if at least `reserve` tokens remain afterwards; otherwise
+# returns how long (seconds) until enough tokens have been refilled.
+TAKE_TOKEN_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local reserve = tonumber(ARGV[3])
+
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local wait = 0
+if tokens - 1 >= reserve then
+    tokens = tokens - 1
+else
+    wait = (reserve + 1 - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class Priority(IntEnum):
+    """Namecheap request priority lanes, highest first."""
+    CRITICAL = 0      # billing: registrations and renewals
+    INTERACTIVE = 1   # user-facing searches and DNS edits
+    BACKGROUND = 2    # Celery refresh jobs
+
+
+_current_priority: contextvars.ContextVar = contextvars.ContextVar("namecheap_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def request_priority(priority: Priority):
+    """Runs the enclosed Namecheap calls in the given priority lane."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> Priority:
+    return _current_priority.get()
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request is shed because the Namecheap budget is exhausted for its lane."""
+
+    def __init__(self, priority: Priority, retry_after: float):
+        self.priority = priority
+        self.retry_after = retry_after
+        super().__init__(f"Namecheap rate limit reached for {priority.name.lower()} requests, "
+                         f"retry in {retry_after:.1f}s")
+
+
+class _LocalTokenBucket:
+    """In-process version of TAKE_TOKEN_SCRIPT, used when Redis is unavailable."""
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self._tokens = capacity
+        self._ts = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self, reserve: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + max(0.0, now - self._ts) * self.rate)
+            self._ts = now
+            if self._tokens - 1 >= reserve:
+                self._tokens -= 1
+                return 0.0
+            return (reserve + 1 - self._tokens) / self.rate
+
+
+class NamecheapRateLimiter:
+    """
+    Token-bucket limiter for the Namecheap API key (by default 50 calls per minute).
+
+    The bucket lives in Redis so API workers and Celery share one budget. Each
+    priority lane keeps a reserve of tokens for the lanes above it: background
+    jobs stop before interactive traffic does, and interactive traffic can never
+    use the last tokens needed for renewals and registrations. A request waits
+    for a token up to its lane's max wait and is then shed with RateLimitExceeded.
+
+    If Redis is unreachable, a per-process bucket with the same settings is used.
+    """
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None, shared: Optional[bool] = None):
+        self.enabled = os.getenv("NAMECHEAP_RATE_LIMIT_ENABLED", "true").lower() == "true"
+        self.shared = shared if shared is not None else os.getenv("NAMECHEAP_RATE_LIMIT_SHARED", "true").lower() == "true"
+        self.redis = redis_client or (get_redis() if self.shared else None)
+
+        self.capacity = float(os.getenv("NAMECHEAP_RATE_LIMIT", "50"))
+        self.period = float(os.getenv("NAMECHEAP_RATE_LIMIT_PERIOD", "60"))
+        self.rate = self.capacity / self.period
+
+        critical_reserve = float(os.getenv("NAMECHEAP_RATE_RESERVE_CRITICAL", "5"))
+        interactive_reserve = float(os.getenv("NAMECHEAP_RATE_RESERVE_INTERACTIVE", "10"))
+        self.reserves = {
+            Priority.CRITICAL: 0.0,
+            Priority.INTERACTIVE: critical_reserve,
+            Priority.BACKGROUND: critical_reserve + interactive_reserve,
+        }
+        # A reserve of the whole bucket would starve the lane completely
+        self.reserves = {priority: min(reserve, self.capacity - 1) for priority, reserve in self.reserves.items()}
+        self.max_waits = {
+            Priority.CRITICAL: float(os.getenv("NAMECHEAP_RATE_MAX_WAIT_CRITICAL", "60")),
+            Priority.INTERACTIVE: float(os.getenv("NAMECHEAP_RATE_MAX_WAIT_INTERACTIVE", "3")),
+            Priority.BACKGROUND: float(os.getenv("NAMECHEAP_RATE_MAX_WAIT_BACKGROUND", "10")),
+        }
+        self.max_sleep = 1.0
+
+        self._script = self.redis.register_script(TAKE_TOKEN_SCRIPT) if self.redis is not None else None
+        self._local_bucket = _LocalTokenBucket(self.capacity, self.rate)
+
+        self._lock = threading.Lock()
+        self._redis_errors = 0
+        self._stats = {
+            priority: {"acquired": 0, "shed": 0, "waited": 0, "queue_times": deque(maxlen=500)}
+            for priority in Priority
+        }
+
+    def acquire(self, priority: Optional[Priority] = None) -> float:
+        """
+        Blocks until a token is available for the priority (defaults to the current
+        request_priority). Returns the time spent queued, in seconds.
+        Raises RateLimitExceeded if the lane's max wait would be exceeded.
+        """
+        if not self.enabled:
+            return 0.0
+        priority = current_priority() if priority is None else priority
+        start = time.monotonic()
+        while True:
+            delay = self._attempt(priority, start)
+            if delay == 0:
+                return self._record_acquired(priority, start)
+            time.sleep(delay)
+
+    async def acquire_async(self, priority: Optional[Priority] = None) -> float:
+        """asyncio version of acquire()."""
+        if not self.enabled:
+            return 0.0
+        priority = current_priority() if priority is None else priority
+        start = time.monotonic()
+        while True:
+            delay = self._attempt(priority, start)
+            if delay == 0:
+                return self._record_acquired(priority, start)
+            await asyncio.sleep(delay)
+
+    def try_acquire(self, priority: Optional[Priority] = None) -> bool:
+        """Takes a token only if one is available right now. Used for optional extra calls such as hedges."""
+        if not self.enabled:
+            return True
+        priority = current_priority() if priority is None else priority
+        if self._take(self.reserves[priority]) > 0:
+            return False
+        self._record_acquired(priority, time.monotonic())
+        return True
+
+    def _attempt(self, priority: Priority, start: float) -> float:
+        """Tries to take a token. Returns 0 on success, otherwise how long to sleep before retrying."""
+        wait = self._take(self.reserves[priority])
+        if wait <= 0:
+            return 0
+
+        if time.monotonic() + wait - start > self.max_waits[priority]:
+            with self._lock:
+                self._stats[priority]["shed"] += 1
+            raise RateLimitExceeded(priority, wait)
+
+        # Jitter so waiters woken by the same refill do not all retry at once
+        return min(wait, self.max_sleep) + random.uniform(0, 0.05)
+
+    def _take(self, reserve: float) -> float:
+        if self._script is not None:
+            try:
+                return float(self._script(keys=[BUCKET_KEY], args=[self.capacity, self.rate, reserve]))
+            except redis.RedisError as e:
+                with self._lock:
+                    self._redis_errors += 1
+                logger.warning("Namecheap rate limiter falling back to local bucket: %s", e)
+        return self._local_bucket.take(reserve)
+
+    def _record_acquired(self, priority: Priority, start: float) -> float:
+        queue_time = time.monotonic() - start
+        with self._lock:
+            stats = self._stats[priority]
+            stats["acquired"] += 1
+            if queue_time > 0.001:
+                stats["waited"] += 1
+            stats["queue_times"].append(queue_time * 1000)
+        return queue_time
+
+    def get_stats(self) -> Dict:
+        """Per-lane acquired/shed counts and queue-time percentiles (ms) for this process."""
+        with self._lock:
+            lanes = {}
+            for priority, stats in self._stats.items():
+                queue_times = sorted(stats["queue_times"])
+                lane = {
+                    "acquired": stats["acquired"],
+                    "shed": stats["shed"],
+                    "waited": stats["waited"],
+                    "reserve": self.reserves[priority],
+                    "max_wait_s": self.max_waits[priority],
+                }
+                if queue_times:
+                    lane["queue_p50_ms"] = round(queue_times[len(queue_times) // 2], 1)
+                    lane["queue_p95_ms"] = round(queue_times[min(len(queue_times) - 1, int(len(queue_times) * 0.95))], 1)
+                    lane["queue_max_ms"] = round(queue_times[-1], 1)
+                lanes[priority.name.lower()] = lane
+
+            return {
+                "enabled": self.enabled,
+                "shared": self._script is not None,
+                "capacity": self.capacity,
+                "period_s": self.period,
+                "redis_errors": self._redis_errors,
+                "lanes": lanes,
+            }
+
+
+_limiter_lock = threading.Lock()
+_limiter: Optional[NamecheapRateLimiter] = None
+
+
+def get_rate_limiter() -> NamecheapRateLimiter:
+    """Returns the process-wide Namecheap rate limiter."""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = NamecheapRateLimiter()
+    return _limiter
@@ -0,0 +1,195 @@
+import os
+import time
+import bisect
+import hashlib
+import logging
+import threading
+from array import array
+from typing import Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy.exc import SQLAlchemyError
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+# loader(since_id) -> ([(domain_id, domain_name), ...] with id > since_id, {domain_name: listing})
+IndexLoader = Callable[[int], Tuple[List[Tuple[int, str]], Dict[str, Dict]]]
+
+
+def load_from_database(since_id: int) -> Tuple[List[Tuple[int, str]], Dict[str, Dict]]:
+    """Reads new domain rows and all active listings from the database."""
+    from database.connection import SessionLocal
+    from models.db_models import Domain, Listing, ListingStatus
+
+    db = SessionLocal()
+    try:
+        rows = db.query(Domain.id, Domain.domain_name).filter(Domain.id > since_id).all()
+        listings = {
+            domain_name.lower(): {"listing_id": listing_id, "price": float(price)}
+            for listing_id, price, domain_name in db.query(Listing.id, Listing.price, Domain.domain_name)
+            .join(Domain, Listing.domain_id == Domain.id)
+            .filter(Listing.status == ListingStatus.ACTIVE)
+            .all()
+        }
+    finally:
+        db.close()
+    return [(row_id, name) for row_id, name in rows], listings
+
+
+def domain_hash(domain: str) -> int:
+    """Stable 64-bit hash of a lower-cased domain name."""
+    return int.from_bytes(hashlib.blake2b(domain.strip().lower().encode(), digest_size=8).digest(), "big")
+
+
+class RegisteredDomainIndex:
+    """
+    In-memory index of domain names we know are registered, so searches can skip
+    the Namecheap check for them.
+
+    Every row in the domains table is a registered name. They are kept as a sorted
+    array of 64-bit hashes (8 bytes per name, binary-searched), loaded once and
+    then extended incrementally with rows whose id is above the last one seen. A
+    full rebuild every few minutes picks up deleted rows. Active fixed-price
+    listings are kept exactly (name -> listing id and price) because searches
+    report them as available to buy on our marketplace.
+
+    Refreshes happen lazily on lookup, by one thread at a time; concurrent lookups
+    keep using the previous snapshot. If the database is unreachable the old
+    snapshot is kept.
+    """
+
+    def __init__(self, loader: IndexLoader = load_from_database,
+                 refresh_interval: Optional[float] = None, rebuild_interval: Optional[float] = None):
+        self.loader = loader
+        self.enabled = os.getenv("REGISTERED_INDEX_ENABLED", "true").lower() == "true"
+        self.refresh_interval = refresh_interval or float(os.getenv("REGISTERED_INDEX_REFRESH_SECONDS", "30"))
+        self.rebuild_interval = rebuild_interval or float(os.getenv("REGISTERED_INDEX_REBUILD_SECONDS", "600"))
+
+        self._hashes = array("Q")
+        self._listings: Dict[str, Dict] = {}
+        self._last_domain_id = 0
+        self._refreshed_at = 0.0
+        self._rebuilt_at = 0.0
+        self._refresh_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._listed_hits = 0
+        self._lookups = 0
+        self._refresh_errors = 0
+
+    def lookup(self, domains: List[str]) -> Tuple[Dict[str, Dict], List[str]]:
+        """
+        Splits domains into those we already know about and the rest.
+
+        Returns:
+            (domains.check-style results for known names, domains that still need an upstream check)
+            Known results are "available": False; listed ones also carry a "listing" entry.
+        """
+        if not self.enabled or not domains:
+            return {}, list(domains)
+
+        self._maybe_refresh()
+        hashes, listings = self._hashes, self._listings
+
+        known, remaining = {}, []
+        for domain in domains:
+            name = domain.lower()
+            listing = listings.get(name)
+            if listing is not None:
+                known[domain] = {"available": False, "is_premium": False, "price": None, "listing": listing}
+            elif self._contains(hashes, domain_hash(name)):
+                known[domain] = {"available": False, "is_premium": False, "price": None}
+            else:
+                remaining.append(domain)
+
+        listed = sum(1 for data in known.values() if "listing" in data)
+        with self._stats_lock:
+            self._lookups += len(domains)
+            self._hits += len(known)
+            self._listed_hits += listed
+        return known, remaining
+
+    def add(self, domain: str):
+        """Adds a name we just registered, without waiting for the next refresh."""
+        value = domain_hash(domain)
+        with self._refresh_lock:
+            hashes = array("Q", self._hashes)
+            position = bisect.bisect_left(hashes, value)
+            if position == len(hashes) or hashes[position] != value:
+                hashes.insert(position, value)
+                self._hashes = hashes
+
+    def invalidate(self):
+        """Forces a refresh on the next lookup, e.g. after a listing was created, sold or cancelled."""
+        self._refreshed_at = 0.0
+
+    @staticmethod
+    def _contains(hashes: array, value: int) -> bool:
+        position = bisect.bisect_left(hashes, value)
+        return position < len(hashes) and hashes[position] == value
+
+    def _maybe_refresh(self):
+        if time.monotonic() - self._refreshed_at < self.refresh_interval:
+            return
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            rebuild = time.monotonic() - self._rebuilt_at >= self.rebuild_interval
+            self._refresh(rebuild)
+        except SQLAlchemyError as e:
+            logger.warning("Registered domain index refresh failed: %s", e)
+            with self._stats_lock:
+                self._refresh_errors += 1
+        finally:
+            # Failed refreshes are retried after the normal interval, not on every lookup
+            self._refreshed_at = time.monotonic()
+            self._refresh_lock.release()
+
+    def _refresh(self, rebuild: bool):
+        since_id = 0 if rebuild else self._last_domain_id
+        rows, listings = self.loader(since_id)
+
+        new_hashes = [domain_hash(name) for _, name in rows if name]
+        if rebuild:
+            hashes = array("Q", sorted(set(new_hashes)))
+            self._rebuilt_at = time.monotonic()
+        elif new_hashes:
+            hashes = array("Q", sorted(set(self._hashes).union(new_hashes)))
+        else:
+            hashes = self._hashes
+
+        self._last_domain_id = max([since_id] + [row_id for row_id, _ in rows])
+        self._hashes = hashes
+        self._listings = listings
+
+    def get_stats(self) -> Dict:
+        with self._stats_lock:
+            return {
+                "enabled": self.enabled,
+                "registered_names": len(self._hashes),
+                "active_listings": len(self._listings),
+                "memory_bytes": self._hashes.itemsize * len(self._hashes),
+                "lookups": self._lookups,
+                "hits": self._hits,
+                "listed_hits": self._listed_hits,
+                "refresh_errors": self._refresh_errors,
+                "last_refresh_age_seconds": round(time.monotonic() - self._refreshed_at, 1)
+                if self._refreshed_at else None,
+            }
+
+
+_index_lock = threading.Lock()
+_index: Optional[RegisteredDomainIndex] = None
+
+
+def get_registered_index() -> RegisteredDomainIndex:
+    """Returns the process-wide index so every search in this worker shares one snapshot."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = RegisteredDomainIndex()
+    return _index
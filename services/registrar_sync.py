@@ -0,0 +1,341 @@
+import os
+import json
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional
+
+import redis
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from sqlalchemy import or_
+from sqlalchemy.exc import SQLAlchemyError
+
+from database.redis_connection import get_redis
+from services.namecheap_parser import DomainInfo, DomainListEntry, DomainListPage
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+LAST_RUN_KEY = "registrar:sync:last_run"
+
+# Upstream failures that mean "back off for now" rather than "this domain is broken"
+BACKOFF_STATUSES = {429, 503}
+
+# fetch_page(page, page_size) -> one page of namecheap.domains.getList
+PageFetcher = Callable[[int, int], DomainListPage]
+# fetch_info(domain_name) -> namecheap.domains.getInfo for one domain
+InfoFetcher = Callable[[str], DomainInfo]
+
+
+def list_fingerprint(entry: DomainListEntry) -> str:
+    """Hash of the getList fields; when it changes the domain's getInfo details are refreshed."""
+    values = (entry.registrar_id, entry.owner_name, entry.expires, entry.is_expired, entry.is_locked,
+              entry.auto_renew, entry.whoisguard, entry.is_premium, entry.is_our_dns)
+    return hashlib.sha1(repr(values).encode()).hexdigest()
+
+
+def apply_list_entry(state, entry: DomainListEntry, now: datetime) -> bool:
+    """
+    Copies a getList entry onto a mirror row. Returns True if the entry changed
+    since the last sync, in which case the row's getInfo details are marked stale.
+    """
+    fingerprint = list_fingerprint(entry)
+    changed = state.fingerprint != fingerprint
+
+    state.registrar_id = entry.registrar_id
+    state.owner_name = entry.owner_name
+    state.created = entry.created
+    state.expires = entry.expires
+    state.is_expired = entry.is_expired
+    state.is_locked = entry.is_locked
+    state.auto_renew = entry.auto_renew
+    state.whoisguard_enabled = entry.whoisguard.upper() == "ENABLED"
+    state.is_premium = entry.is_premium
+    state.is_our_dns = entry.is_our_dns
+    state.fingerprint = fingerprint
+    state.list_synced_at = now
+    if changed:
+        state.info_synced_at = None
+    return changed
+
+
+def apply_domain_info(state, info: DomainInfo, now: datetime, new: bool = False):
+    """
+    Copies getInfo details onto a mirror row. Lock, auto-renew and WhoisGuard come
+    from getList, which reports them reliably, so they are only taken from getInfo
+    for rows that getList has not seen yet.
+    """
+    state.status = info.status
+    state.is_owner = info.is_owner
+    state.owner_name = info.owner_name or state.owner_name
+    state.nameservers = list(info.nameservers)
+    state.created = info.created or state.created
+    state.expires = info.expires or state.expires
+    state.info_synced_at = now
+    if new:
+        state.is_locked = info.is_locked
+        state.auto_renew = info.auto_renew
+        state.whoisguard_enabled = info.whoisguard_enabled
+        state.is_premium = info.is_premium
+        state.list_synced_at = now
+
+
+def needs_info(state, now: datetime, info_max_age: timedelta) -> bool:
+    return state.info_synced_at is None or state.info_synced_at < now - info_max_age
+
+
+def expiry_drifted(local: Optional[datetime], registrar: Optional[datetime]) -> bool:
+    """getList only reports dates, so a local expiry on the same day is in sync."""
+    return registrar is not None and (local is None or local.date() != registrar.date())
+
+
+def to_domain_info(state) -> DomainInfo:
+    return DomainInfo(
+        domain=state.domain_name,
+        owner_name=state.owner_name or "",
+        is_owner=bool(state.is_owner),
+        status=state.status or "Unknown",
+        created=state.created,
+        expires=state.expires,
+        is_locked=bool(state.is_locked),
+        auto_renew=bool(state.auto_renew),
+        whoisguard_enabled=bool(state.whoisguard_enabled),
+        is_premium=bool(state.is_premium),
+        nameservers=list(state.nameservers or [])
+    )
+
+
+class RegistrarSync:
+    """
+    Mirrors the Namecheap account into the registrar_domain_states table.
+
+    Each run pages through namecheap.domains.getList (one call per page of up to
+    100 domains) and updates every row from it. getInfo, which costs one call per
+    domain, is only made for new domains, domains whose getList entry changed and
+    rows whose details are older than REGISTRAR_INFO_MAX_AGE, at most
+    REGISTRAR_SYNC_INFO_BUDGET per run; the rest are picked up by later runs.
+
+    Local expiry dates that drifted from the registrar are corrected page by page.
+    After a complete pass, rows for domains no longer in the account are removed.
+    """
+
+    def __init__(self, fetch_page: PageFetcher, fetch_info: InfoFetcher,
+                 page_size: Optional[int] = None, info_budget: Optional[int] = None,
+                 info_max_age: Optional[float] = None):
+        self.fetch_page = fetch_page
+        self.fetch_info = fetch_info
+        self.page_size = min(100, max(10, page_size or int(os.getenv("REGISTRAR_SYNC_PAGE_SIZE", "100"))))
+        self.info_budget = info_budget if info_budget is not None else int(
+            os.getenv("REGISTRAR_SYNC_INFO_BUDGET", "100"))
+        self.info_max_age = timedelta(
+            seconds=info_max_age or float(os.getenv("REGISTRAR_INFO_MAX_AGE", "86400")))
+
+    def iter_account(self) -> Iterator[List[DomainListEntry]]:
+        """Yields the account's domains one getList page at a time."""
+        page_number = 1
+        while True:
+            page = self.fetch_page(page_number, self.page_size)
+            if page.entries:
+                yield page.entries
+            if not page.entries or page_number * self.page_size >= page.total_items:
+                return
+            page_number += 1
+
+    def run(self, db) -> Dict:
+        """Runs one sync pass and returns its counters."""
+        from models.db_models import Domain, RegistrarDomainState
+
+        started = datetime.utcnow()
+        stats = {"pages": 0, "domains": 0, "changed": 0, "info_refreshed": 0, "info_errors": 0,
+                 "expiry_corrected": 0, "auto_renew_mismatches": 0, "removed": 0, "complete": False}
+
+        try:
+            for entries in self.iter_account():
+                self._sync_page(db, entries, started, stats, Domain, RegistrarDomainState)
+                stats["pages"] += 1
+            stats["complete"] = True
+        except HTTPException as e:
+            # Keep what was synced so far; the next run starts over from page 1
+            db.rollback()
+            stats["error"] = str(e.detail)
+            logger.warning("Registrar sync stopped after %d pages: %s", stats["pages"], e.detail)
+
+        self._refresh_details(db, started, stats, RegistrarDomainState)
+
+        if stats["complete"]:
+            stats["removed"] = db.query(RegistrarDomainState).filter(or_(
+                RegistrarDomainState.list_synced_at == None,  # noqa: E711
+                RegistrarDomainState.list_synced_at < started
+            )).delete(synchronize_session=False)
+            db.commit()
+
+        stats["duration_seconds"] = round((datetime.utcnow() - started).total_seconds(), 1)
+        stats["finished_at"] = datetime.utcnow().isoformat()
+        return stats
+
+    def _sync_page(self, db, entries: List[DomainListEntry], now: datetime, stats: Dict, Domain, RegistrarDomainState):
+        names = [entry.domain for entry in entries]
+        states = {state.domain_name: state for state in
+                  db.query(RegistrarDomainState).filter(RegistrarDomainState.domain_name.in_(names))}
+
+        for entry in entries:
+            state = states.get(entry.domain)
+            if state is None:
+                state = states[entry.domain] = RegistrarDomainState(domain_name=entry.domain)
+                db.add(state)
+            if apply_list_entry(state, entry, now):
+                stats["changed"] += 1
+
+        # Correct drift for the marketplace's copies of these domains in one query
+        for domain in db.query(Domain).filter(Domain.domain_name.in_(names)):
+            state = states[domain.domain_name]
+            if expiry_drifted(domain.expiry_date, state.expires):
+                logger.info("Correcting expiry of %s: %s -> %s", domain.domain_name,
+                            domain.expiry_date, state.expires.date())
+                # Keep the local time of day so the daily renewal window does not shift
+                time_of_day = domain.expiry_date.time() if domain.expiry_date else datetime.min.time()
+                domain.expiry_date = datetime.combine(state.expires.date(), time_of_day)
+                stats["expiry_corrected"] += 1
+            # Local auto_renew_enabled is the owner's choice for our own renewal task, so it is
+            # reported, not overwritten, when Namecheap's auto-renew disagrees with it
+            if bool(domain.auto_renew_enabled) != bool(state.auto_renew):
+                stats["auto_renew_mismatches"] += 1
+
+        db.commit()
+        stats["domains"] += len(entries)
+
+    def _refresh_details(self, db, started: datetime, stats: Dict, RegistrarDomainState):
+        if self.info_budget <= 0:
+            return
+
+        stale_before = started - self.info_max_age
+        stale = db.query(RegistrarDomainState).filter(
+            RegistrarDomainState.list_synced_at >= started,
+            or_(RegistrarDomainState.info_synced_at == None,  # noqa: E711
+                RegistrarDomainState.info_synced_at < stale_before)
+        ).order_by(RegistrarDomainState.info_synced_at.asc().nullsfirst()).limit(self.info_budget).all()
+
+        for state in stale:
+            try:
+                info = self.fetch_info(state.domain_name)
+            except HTTPException as e:
+                stats["info_errors"] += 1
+                if e.status_code in BACKOFF_STATUSES:
+                    logger.warning("Registrar sync pausing getInfo refreshes: %s", e.detail)
+                    break
+                logger.warning("getInfo failed for %s: %s", state.domain_name, e.detail)
+                continue
+
+            apply_domain_info(state, info, datetime.utcnow())
+            db.commit()
+            stats["info_refreshed"] += 1
+
+
+def _open_session():
+    """Session for single-domain mirror reads and writes, or None if the database is unavailable."""
+    try:
+        from database.connection import SessionLocal
+        from models.db_models import RegistrarDomainState  # noqa: F401
+        return SessionLocal()
+    except SQLAlchemyError as e:
+        logger.warning("Registrar mirror unavailable: %s", e)
+        return None
+
+
+def read_mirror(domain: str, max_age: Optional[float] = None) -> Optional[DomainInfo]:
+    """
+    Returns the mirrored registrar state of a domain, or None if it is missing,
+    older than REGISTRAR_MIRROR_MAX_AGE or the database is unavailable.
+    """
+    return read_mirror_many([domain], max_age).get(domain.lower())
+
+
+def read_mirror_many(domains: List[str], max_age: Optional[float] = None) -> Dict[str, DomainInfo]:
+    """read_mirror() for several domains with one query, keyed by lower-cased name."""
+    if os.getenv("REGISTRAR_MIRROR_ENABLED", "true").lower() != "true" or not domains:
+        return {}
+    db = _open_session()
+    if db is None:
+        return {}
+
+    from models.db_models import RegistrarDomainState
+
+    now = datetime.utcnow()
+    max_age = timedelta(seconds=max_age or float(os.getenv("REGISTRAR_MIRROR_MAX_AGE", "3600")))
+    info_max_age = timedelta(seconds=float(os.getenv("REGISTRAR_INFO_MAX_AGE", "86400")))
+    try:
+        states = db.query(RegistrarDomainState).filter(
+            RegistrarDomainState.domain_name.in_([domain.lower() for domain in domains])).all()
+        return {
+            state.domain_name: to_domain_info(state) for state in states
+            if state.list_synced_at is not None and state.list_synced_at >= now - max_age
+            and not needs_info(state, now, info_max_age)
+        }
+    except SQLAlchemyError as e:
+        logger.warning("Registrar mirror read failed for %d domains: %s", len(domains), e)
+        return {}
+    finally:
+        db.close()
+
+
+def store_domain_info(domain: str, info: DomainInfo):
+    """Saves a live getInfo result so the next read is served locally."""
+    db = _open_session()
+    if db is None:
+        return
+
+    from models.db_models import RegistrarDomainState
+
+    try:
+        state = db.query(RegistrarDomainState).filter(
+            RegistrarDomainState.domain_name == domain.lower()).first()
+        new = state is None
+        if new:
+            state = RegistrarDomainState(domain_name=domain.lower())
+            db.add(state)
+        apply_domain_info(state, info, datetime.utcnow(), new=new)
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.warning("Registrar mirror write failed for %s: %s", domain, e)
+    finally:
+        db.close()
+
+
+def mark_stale(domain: str):
+    """Makes reads fall back to Namecheap until the next sync, e.g. after a renewal."""
+    db = _open_session()
+    if db is None:
+        return
+
+    from models.db_models import RegistrarDomainState
+
+    try:
+        db.query(RegistrarDomainState).filter(
+            RegistrarDomainState.domain_name == domain.lower()
+        ).update({"list_synced_at": None, "info_synced_at": None}, synchronize_session=False)
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.warning("Registrar mirror invalidation failed for %s: %s", domain, e)
+    finally:
+        db.close()
+
+
+def save_last_run(stats: Dict, redis_client: Optional[redis.Redis] = None):
+    try:
+        (redis_client or get_redis()).set(LAST_RUN_KEY, json.dumps(stats))
+    except redis.RedisError as e:
+        logger.warning("Could not store registrar sync stats: %s", e)
+
+
+def get_last_run(redis_client: Optional[redis.Redis] = None) -> Optional[Dict]:
+    """Counters of the last sync run, shared by all processes through Redis."""
+    try:
+        raw = (redis_client or get_redis()).get(LAST_RUN_KEY)
+    except redis.RedisError as e:
+        logger.warning("Could not read registrar sync stats: %s", e)
+        return None
+    return json.loads(raw) if raw else None
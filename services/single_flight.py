@@ -0,0 +1,170 @@
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import redis
+from dotenv import load_dotenv
+
+from database.redis_connection import get_redis
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+LOCK_KEY = "singleflight:{name}:{key}:lock"
+RESULT_KEY = "singleflight:{name}:{key}:result"
+
+# Deletes the lock only if it is still held by the caller's token
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Request coalescing: concurrent callers asking for the same key share one
+    execution of the underlying function.
+
+    Inside a process, followers wait on the leader's in-flight call. With
+    shared=True, the leader also takes a short Redis lock and publishes its
+    (JSON-serializable) result, so followers in other API workers can reuse it
+    instead of calling Namecheap themselves.
+    """
+
+    def __init__(self, name: str, redis_client: Optional[redis.Redis] = None, shared: Optional[bool] = None):
+        self.name = name
+        self.shared = shared if shared is not None else os.getenv("SINGLE_FLIGHT_SHARED", "false").lower() == "true"
+        self.redis = redis_client or (get_redis() if self.shared else None)
+        self.lock_ttl_ms = int(os.getenv("SINGLE_FLIGHT_LOCK_TTL_MS", "15000"))
+        self.result_ttl_ms = int(os.getenv("SINGLE_FLIGHT_RESULT_TTL_MS", "2000"))
+        self.wait_timeout = float(os.getenv("SINGLE_FLIGHT_WAIT_TIMEOUT", "15"))
+        self.poll_interval = float(os.getenv("SINGLE_FLIGHT_POLL_INTERVAL", "0.05"))
+
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self._executions = 0
+        self._coalesced_local = 0
+        self._coalesced_remote = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Runs fn() for the key, or waits for and returns the result of an identical in-flight call."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self._coalesced_local += 1
+
+        if not leader:
+            if not call.done.wait(self.wait_timeout):
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run_shared(key, fn) if self.shared else self._execute(fn)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def _execute(self, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self._executions += 1
+        return fn()
+
+    def _run_shared(self, key: str, fn: Callable[[], Any]) -> Any:
+        lock_key = LOCK_KEY.format(name=self.name, key=key)
+        result_key = RESULT_KEY.format(name=self.name, key=key)
+        token = uuid.uuid4().hex
+
+        try:
+            acquired = self.redis.set(lock_key, token, nx=True, px=self.lock_ttl_ms)
+        except redis.RedisError as e:
+            logger.warning("Single-flight lock unavailable for %s: %s", self.name, e)
+            return self._execute(fn)
+
+        if acquired:
+            try:
+                result = self._execute(fn)
+                try:
+                    self.redis.set(result_key, json.dumps(result), px=self.result_ttl_ms)
+                except (redis.RedisError, TypeError) as e:
+                    logger.warning("Could not publish single-flight result for %s: %s", self.name, e)
+                return result
+            finally:
+                try:
+                    self.redis.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                except redis.RedisError:
+                    pass
+
+        # Another worker is already running this call; wait for its published result
+        deadline = time.monotonic() + self.wait_timeout
+        try:
+            while time.monotonic() < deadline:
+                raw = self.redis.get(result_key)
+                if raw is None and not self.redis.exists(lock_key):
+                    raw = self.redis.get(result_key)
+                    if raw is None:
+                        break
+                if raw is not None:
+                    with self._lock:
+                        self._coalesced_remote += 1
+                    return json.loads(raw)
+                time.sleep(self.poll_interval)
+        except redis.RedisError as e:
+            logger.warning("Single-flight wait failed for %s: %s", self.name, e)
+
+        # The leader failed or timed out without a result
+        return self._execute(fn)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "shared": self.shared,
+                "in_flight": len(self._calls),
+                "executions": self._executions,
+                "coalesced_local": self._coalesced_local,
+                "coalesced_remote": self._coalesced_remote
+            }
+
+
+_flights_lock = threading.Lock()
+_flights: Dict[str, SingleFlight] = {}
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Returns the process-wide SingleFlight group for a name."""
+    with _flights_lock:
+        flight = _flights.get(name)
+        if flight is None:
+            flight = SingleFlight(name)
+            _flights[name] = flight
+        return flight
+
+
+def get_single_flight_stats() -> Dict[str, Dict]:
+    with _flights_lock:
+        flights = dict(_flights)
+    return {name: flight.get_stats() for name, flight in flights.items()}
@@ -0,0 +1,135 @@
+import os
+import re
+import heapq
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# TLD popularity, roughly by how often our users buy them (1.0 = best)
+TLD_WEIGHTS = {
+    "com": 1.0, "io": 0.72, "ai": 0.7, "co": 0.62, "net": 0.6, "app": 0.58,
+    "dev": 0.55, "org": 0.52, "xyz": 0.4, "tech": 0.4, "shop": 0.38, "store": 0.36,
+}
+
+# Prefix/suffix word lists with a quality weight. Combined names are always .com.
+PREFIX_WEIGHTS = {
+    "get": 0.62, "try": 0.55, "my": 0.52, "the": 0.5, "go": 0.46, "use": 0.42, "hey": 0.36,
+}
+SUFFIX_WEIGHTS = {
+    "app": 0.58, "hq": 0.54, "hub": 0.52, "labs": 0.48, "pro": 0.46, "ly": 0.42,
+    "online": 0.34, "site": 0.32, "web": 0.3,
+}
+
+# Keyword affinity: when the base name contains a keyword, these TLDs and words get a boost
+KEYWORD_AFFINITY = {
+    "ai": {"ai": 0.35, "labs": 0.15},
+    "bot": {"ai": 0.3, "app": 0.15},
+    "gpt": {"ai": 0.35},
+    "data": {"ai": 0.15, "io": 0.2, "labs": 0.15},
+    "code": {"dev": 0.3, "io": 0.2, "labs": 0.1},
+    "dev": {"dev": 0.3, "io": 0.15},
+    "cloud": {"io": 0.25, "tech": 0.15},
+    "crypto": {"io": 0.2, "xyz": 0.2},
+    "web3": {"xyz": 0.3, "io": 0.15},
+    "nft": {"xyz": 0.3},
+    "shop": {"shop": 0.35, "store": 0.2, "hq": 0.1},
+    "store": {"store": 0.35, "shop": 0.2},
+    "buy": {"shop": 0.25, "store": 0.2},
+    "tech": {"tech": 0.3, "io": 0.15},
+    "app": {"app": 0.3, "io": 0.1},
+    "green": {"org": 0.2, "co": 0.1},
+    "news": {"co": 0.1, "net": 0.15},
+}
+
+MAX_LABEL_LENGTH = 63
+IDEAL_LABEL_LENGTH = 8
+LENGTH_PENALTY = 0.04
+
+_INVALID_CHARS = re.compile(r"[^a-z0-9-]")
+
+
+class SuggestionEngine:
+    """
+    Ranked, deterministic domain suggestions for a base name.
+
+    All candidate patterns (base.tld, prefix+base.com, base+suffix.com) and their
+    static weights are precomputed once. Per query only the length penalty and
+    keyword affinity are evaluated, and the top_k candidates are returned ordered
+    by score, ties broken alphabetically.
+    """
+
+    def __init__(self, top_k: Optional[int] = None):
+        self.top_k = top_k or int(os.getenv("SUGGESTION_TOP_K", "12"))
+
+        # (static weight, kind, word, fixed label length added to the base)
+        self._templates: List[Tuple[float, str, str, int]] = []
+        for tld, weight in TLD_WEIGHTS.items():
+            self._templates.append((weight, "tld", tld, 0))
+        for prefix, weight in PREFIX_WEIGHTS.items():
+            self._templates.append((weight, "prefix", prefix, len(prefix)))
+        for suffix, weight in SUFFIX_WEIGHTS.items():
+            self._templates.append((weight, "suffix", suffix, len(suffix)))
+
+        self._keywords = tuple(KEYWORD_AFFINITY.items())
+
+    def normalize(self, base_name: str) -> str:
+        return _INVALID_CHARS.sub("", base_name.strip().lower()).strip("-")
+
+    def suggest(self, base_name: str, top_k: Optional[int] = None) -> List[str]:
+        """Returns the best top_k candidate domains for base_name, best first."""
+        return [domain for domain, _ in self.score(base_name, top_k)]
+
+    def score(self, base_name: str, top_k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Returns the best top_k (domain, score) pairs for base_name, best first."""
+        base = self.normalize(base_name)
+        if not base:
+            return []
+
+        affinity: Dict[str, float] = {}
+        for keyword, boosts in self._keywords:
+            if keyword in base:
+                for word, boost in boosts.items():
+                    affinity[word] = affinity.get(word, 0.0) + boost
+
+        base_length = len(base)
+        candidates = []
+        for weight, kind, word, extra_length in self._templates:
+            if kind == "tld":
+                domain = f"{base}.{word}"
+            elif kind == "prefix":
+                if base.startswith(word):
+                    continue
+                domain = f"{word}{base}.com"
+            else:
+                if base.endswith(word):
+                    continue
+                domain = f"{base}{word}.com"
+
+            label_length = base_length + extra_length
+            if label_length > MAX_LABEL_LENGTH:
+                continue
+
+            score = weight + affinity.get(word, 0.0)
+            if label_length > IDEAL_LABEL_LENGTH:
+                score -= (label_length - IDEAL_LABEL_LENGTH) * LENGTH_PENALTY
+            candidates.append((round(score, 4), domain))
+
+        best = heapq.nsmallest(top_k or self.top_k, candidates, key=lambda c: (-c[0], c[1]))
+        return [(domain, score) for score, domain in best]
+
+
+_engine_lock = threading.Lock()
+_engine: Optional[SuggestionEngine] = None
+
+
+def get_suggestion_engine() -> SuggestionEngine:
+    """Returns the process-wide SuggestionEngine."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = SuggestionEngine()
+    return _engine
@@ -0,0 +1,113 @@
+import os
+import json
+import time
+import logging
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import redis
+from dotenv import load_dotenv
+
+from database.redis_connection import get_redis
+from services.single_flight import get_single_flight
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY = "trending:domains:snapshot"
+REFRESH_LOCK_KEY = "trending:domains:refresh-lock"
+
+
+class TrendingSnapshot:
+    """
+    Precomputed trending-domains result stored in Redis with its generation time.
+
+    The Celery beat job rebuilds it periodically. Readers always get the stored
+    snapshot; once it is older than max_age a background refresh is queued
+    (stale-while-revalidate) instead of making the request wait for Namecheap.
+    """
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None):
+        self.redis = redis_client or get_redis()
+        self.max_age = float(os.getenv("TRENDING_SNAPSHOT_MAX_AGE", "900"))
+
+    def get(self) -> Optional[Dict]:
+        """
+        Returns {"domains", "generated_at", "age", "stale"} or None if no snapshot exists yet.
+        Queues a refresh when the snapshot is stale.
+        """
+        try:
+            raw = self.redis.get(SNAPSHOT_KEY)
+        except redis.RedisError as e:
+            logger.warning("Could not read trending snapshot: %s", e)
+            return None
+        if raw is None:
+            return None
+
+        snapshot = json.loads(raw)
+        age = time.time() - snapshot["generated_at_ts"]
+        snapshot["age"] = round(age, 1)
+        snapshot["stale"] = age > self.max_age
+        if snapshot["stale"]:
+            self.request_refresh()
+        return snapshot
+
+    def has_snapshot(self) -> bool:
+        return bool(self.redis.exists(SNAPSHOT_KEY))
+
+    def get_or_build(self, build_fn: Callable[[], List[Dict]]) -> Dict:
+        """
+        Returns the current snapshot. Only before the first beat run, when there is
+        no snapshot at all, is it built inline (once, shared by concurrent callers).
+        """
+        snapshot = self.get()
+        if snapshot is not None:
+            return snapshot
+
+        def build():
+            domains = build_fn()
+            try:
+                return self.store(domains)
+            except redis.RedisError as e:
+                logger.warning("Could not store trending snapshot: %s", e)
+                return {"domains": domains, "generated_at": datetime.utcnow().isoformat()}
+
+        snapshot = dict(get_single_flight("trending-snapshot").do("build", build))
+        snapshot["age"] = 0.0
+        snapshot["stale"] = False
+        return snapshot
+
+    def store(self, domains: List[Dict]) -> Dict:
+        """Saves a freshly computed list of trending domains as the current snapshot."""
+        now = time.time()
+        snapshot = {
+            "domains": domains,
+            "generated_at": datetime.utcfromtimestamp(now).isoformat(),
+            "generated_at_ts": now
+        }
+        self.redis.set(SNAPSHOT_KEY, json.dumps(snapshot))
+        return snapshot
+
+    def request_refresh(self):
+        """Queues one background rebuild, even if many requests see the stale snapshot at once."""
+        from celery_worker import refresh_trending_domains_snapshot
+
+        try:
+            if not self.redis.set(REFRESH_LOCK_KEY, "1", nx=True, ex=120):
+                return
+        except redis.RedisError as e:
+            logger.warning("Could not take trending refresh lock: %s", e)
+            return
+
+        try:
+            refresh_trending_domains_snapshot.delay()
+        except Exception as e:
+            logger.warning("Could not queue trending snapshot refresh: %s", e)
+            self.redis.delete(REFRESH_LOCK_KEY)
+
+    def release_refresh_lock(self):
+        try:
+            self.redis.delete(REFRESH_LOCK_KEY)
+        except redis.RedisError:
+            pass
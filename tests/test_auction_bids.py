@@ -0,0 +1,121 @@
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest import mock
+
+# Bids are checked against a throwaway in-memory database (SQLite ignores FOR UPDATE)
+os.environ["DATABASE_URL"] = "sqlite://"
+
+from fastapi import HTTPException
+
+from database.connection import Base, SessionLocal, engine
+from models.api_dto import BidCreateRequest
+from models.db_models import Auction, AuctionStatus, Bid, Domain, User
+from services.auction_service import AuctionService
+
+
+@unittest.skipIf(engine.dialect.name != "sqlite", "needs the in-memory test database")
+class TestPlaceBid(unittest.TestCase):
+    def setUp(self):
+        Base.metadata.create_all(bind=engine)
+        self.addCleanup(Base.metadata.drop_all, bind=engine)
+        self.db = SessionLocal()
+        self.addCleanup(self.db.close)
+
+        self.seller = self.user("seller")
+        self.alice = self.user("alice")
+        self.bob = self.user("bob")
+        domain = Domain(user_id=self.seller.id, domain_name="alpha.com", price=Decimal("10.00"),
+                        expiry_date=datetime.utcnow() + timedelta(days=365))
+        self.db.add(domain)
+        self.db.flush()
+        self.auction = Auction(domain_id=domain.id, seller_id=self.seller.id, start_price=Decimal("10.00"),
+                               end_time=datetime.utcnow() + timedelta(days=1), status=AuctionStatus.ACTIVE)
+        self.db.add(self.auction)
+        self.db.commit()
+
+        self.service = AuctionService()
+        self.service.order_book.enabled = False
+        patcher = mock.patch("services.auction_service.publish_auction_event")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # place_bid imports its Celery tasks lazily from the worker module
+        self.worker = mock.Mock()
+        patcher = mock.patch.dict(sys.modules, {"celery_worker": self.worker})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def user(self, username):
+        user = User(username=username, email=f"{username}@example.com", stripe_payment_method_id="pm_test")
+        self.db.add(user)
+        self.db.flush()
+        return user
+
+    def bid(self, username, amount):
+        return self.service.place_bid(self.auction.id, BidCreateRequest(amount=amount), username, self.db)
+
+    def bids(self):
+        return self.db.query(Bid).filter(Bid.auction_id == self.auction.id).order_by(Bid.id).all()
+
+    def test_bids_advance_the_auction_columns(self):
+        self.bid("alice", 20)
+        self.bid("bob", 25.5)
+
+        self.db.refresh(self.auction)
+        self.assertEqual(self.auction.current_highest_bid, Decimal("25.50"))
+        self.assertEqual(self.auction.current_leader_id, self.bob.id)
+        self.assertEqual(self.auction.bid_count, 2)
+        self.assertEqual([(bid.bidder_id, bid.order_book_seq) for bid in self.bids()],
+                         [(self.alice.id, 1), (self.bob.id, 2)])
+        # Only the outbid leader is told
+        self.worker.send_push_notification_task.delay.assert_called_once()
+        self.assertEqual(self.worker.send_push_notification_task.delay.call_args.kwargs["user_id"], self.alice.id)
+
+    def test_bids_not_above_the_locked_highest_bid_are_rejected(self):
+        self.bid("alice", 20)
+
+        for amount in (20, 15, 10):
+            with self.subTest(amount=amount), self.assertRaises(HTTPException) as raised:
+                self.bid("bob", amount)
+            self.assertEqual(raised.exception.status_code, 400)
+
+        self.db.refresh(self.auction)
+        self.assertEqual(self.auction.current_highest_bid, Decimal("20.00"))
+        self.assertEqual(self.auction.current_leader_id, self.alice.id)
+        self.assertEqual(self.auction.bid_count, 1)
+        self.assertEqual(len(self.bids()), 1)
+
+    def test_first_bid_must_beat_the_start_price(self):
+        with self.assertRaises(HTTPException) as raised:
+            self.bid("alice", 10)
+
+        self.assertEqual(raised.exception.status_code, 400)
+        self.assertEqual(self.bids(), [])
+
+    def test_auctions_with_bids_from_before_the_columns_are_backfilled(self):
+        self.db.add_all([
+            Bid(auction_id=self.auction.id, bidder_id=self.alice.id, bid_amount=Decimal("15.00")),
+            Bid(auction_id=self.auction.id, bidder_id=self.bob.id, bid_amount=Decimal("30.00")),
+        ])
+        self.db.commit()
+        # As left behind by the ALTER TABLE: the new columns are empty
+        self.db.query(Auction).filter(Auction.id == self.auction.id).update(
+            {Auction.bid_count: None, Auction.current_highest_bid: None, Auction.current_leader_id: None})
+        self.db.commit()
+
+        with self.assertRaises(HTTPException):
+            self.bid("alice", 25)
+        self.bid("alice", 35)
+
+        self.db.refresh(self.auction)
+        self.assertEqual(self.auction.current_highest_bid, Decimal("35.00"))
+        self.assertEqual(self.auction.current_leader_id, self.alice.id)
+        self.assertEqual(self.auction.bid_count, 3)
+        self.assertEqual(self.bids()[-1].order_book_seq, 3)
+        self.assertEqual(self.worker.send_push_notification_task.delay.call_args.kwargs["user_id"], self.bob.id)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+from services.auction_events import AuctionEventHub, AuctionSubscription
+
+
+def bid(auction_id, bidder="u1", seller="u0"):
+    return {"type": "bid", "auction_id": auction_id, "bidder_username": bidder, "seller_username": seller}
+
+
+class TestAuctionEventHub(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.hub = AuctionEventHub()
+
+    def _subscribe(self, auction_ids=(), username=None):
+        # Registered directly so no Redis listener is started
+        subscription = AuctionSubscription(auction_ids, username, queue_size=3)
+        self.hub.subscriptions.add(subscription)
+        return subscription
+
+    async def test_events_reach_matching_subscriptions(self):
+        one = self._subscribe([1])
+        mine = self._subscribe(username="u2")
+
+        self.hub.dispatch(bid(1))
+        self.hub.dispatch(bid(2, bidder="u2"))
+        self.hub.dispatch({"type": "closed", "auction_id": 2, "seller_username": "u0"})
+
+        self.assertEqual([one.queue.get_nowait()["auction_id"]], [1])
+        self.assertTrue(one.queue.empty())
+        self.assertEqual([mine.queue.get_nowait()["type"] for _ in range(2)], ["bid", "closed"])
+
+        self.hub.unsubscribe(one)
+        self.hub.dispatch(bid(1))
+        self.assertTrue(one.queue.empty())
+
+    async def test_slow_client_gets_resync_instead_of_backlog(self):
+        subscription = self._subscribe([1])
+
+        for _ in range(5):
+            self.hub.dispatch(bid(1))
+
+        self.assertEqual(subscription.queue.qsize(), 2)
+        self.assertEqual(subscription.queue.get_nowait()["type"], "resync")
+
+    async def test_stream_sends_keepalive_when_idle(self):
+        subscription = self._subscribe([1])
+        stream = subscription.stream(keepalive=0.01)
+
+        self.assertIsNone(await stream.__anext__())
+        self.hub.dispatch(bid(1))
+        self.assertEqual((await stream.__anext__())["type"], "bid")
+        await stream.aclose()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+from services.auction_order_book import (
+    AuctionOrderBook, BidRejected, BookMissing, from_cents, from_ms, latest_bids, new_bids, to_cents, to_ms
+)
+
+try:
+    import fakeredis
+    import lupa  # noqa: F401  (fakeredis needs it to run Lua scripts)
+except ImportError:
+    fakeredis = None
+
+
+def auction(auction_id=1, highest=None, leader_id=None, bid_count=0, ends_in=timedelta(days=1)):
+    return SimpleNamespace(
+        id=auction_id, status=SimpleNamespace(value="ACTIVE"), end_time=datetime.utcnow() + ends_in, seller_id=10,
+        start_price=Decimal("10.00"), current_highest_bid=highest, current_leader_id=leader_id, bid_count=bid_count,
+        domain=SimpleNamespace(domain_name="alpha.com"), seller=SimpleNamespace(username="seller")
+    )
+
+
+class TestAuctionOrderBook(unittest.TestCase):
+    def test_amounts_round_trip_through_cents(self):
+        self.assertEqual(to_cents(30.5), 3050)
+        self.assertEqual(to_cents(Decimal("19.99")), 1999)
+        self.assertEqual(to_cents(0.1 + 0.2), 30)
+        self.assertEqual(from_cents(3050), Decimal("30.50"))
+        self.assertEqual(str(from_cents("2000")), "20.00")
+
+    def test_timestamps_are_naive_utc(self):
+        created = datetime(2026, 5, 1, 12, 30, 15, 250000)
+
+        self.assertEqual(to_ms(created), 1777638615250)
+        self.assertEqual(from_ms(str(to_ms(created))), created)
+
+    def test_replayed_bids_are_written_once(self):
+        bids = [{"auction_id": 1, "order_book_seq": seq, "bidder_id": seq, "bid_amount": Decimal(seq)}
+                for seq in (3, 4, 4, 5)] + [{"auction_id": 2, "order_book_seq": 4, "bidder_id": 9,
+                                             "bid_amount": Decimal(1)}]
+
+        written = new_bids(bids, existing={(1, 3)})
+
+        self.assertEqual([(b["auction_id"], b["order_book_seq"]) for b in written], [(1, 4), (1, 5), (2, 4)])
+        self.assertEqual({k: v["order_book_seq"] for k, v in latest_bids(bids).items()}, {1: 5, 2: 4})
+
+
+@unittest.skipIf(fakeredis is None, "fakeredis with Lua support is not installed")
+class TestAuctionOrderBookScripts(unittest.TestCase):
+    def setUp(self):
+        self.book = AuctionOrderBook(fakeredis.FakeRedis(decode_responses=True))
+
+    def test_bids_are_validated_in_redis(self):
+        with self.assertRaises(BookMissing):
+            self.book.place_bid(1, 20, "bidder", 15)
+        self.assertTrue(self.book.load(auction(), []))
+        self.assertFalse(self.book.load(auction(highest=Decimal("99")), []))
+
+        with self.assertRaises(BidRejected) as low:
+            self.book.place_bid(1, 20, "bidder", 10)
+        self.assertEqual((low.exception.reason, low.exception.minimum), ("low", Decimal("10.00")))
+        with self.assertRaises(BidRejected) as own:
+            self.book.place_bid(1, 10, "seller", 50)
+        self.assertEqual(own.exception.reason, "own")
+        with self.assertRaises(BidRejected) as ended:
+            self.book.place_bid(1, 20, "bidder", 50, now=datetime.utcnow() + timedelta(days=2))
+        self.assertEqual(ended.exception.reason, "ended")
+
+        self.assertEqual(self.book.place_bid(1, 20, "bidder", 15), (None, 1))
+        self.assertEqual(self.book.place_bid(1, 21, "other", 15.5), (20, 2))
+        with self.assertRaises(BidRejected) as outbid:
+            self.book.place_bid(1, 20, "bidder", 15.5)
+        self.assertEqual(outbid.exception.minimum, Decimal("15.50"))
+
+        snapshot = self.book.snapshot(1)
+        self.assertEqual(snapshot["current_highest_bid"], 15.5)
+        self.assertEqual([b["bidder_username"] for b in snapshot["bids"]], ["other", "bidder"])
+
+    def test_closed_book_rejects_bids_and_reports_final_bid(self):
+        self.book.load(auction(highest=Decimal("40.00"), leader_id=30, bid_count=3), [])
+        self.book.place_bid(1, 20, "bidder", 45)
+
+        self.book.close(1)
+
+        with self.assertRaises(BidRejected) as closed:
+            self.book.place_bid(1, 21, "other", 100)
+        self.assertEqual(closed.exception.reason, "inactive")
+        final = self.book.final_bid(1)
+        self.assertEqual((final["bidder_id"], final["bid_amount"], final["order_book_seq"]),
+                         (20, Decimal("45.00"), 4))
+        self.assertFalse(self.book.load(auction(), []), "a closed book must not be rebuilt")
+
+        self.book.close(2)
+        self.assertIsNone(self.book.final_bid(2))
+
+    def test_unacknowledged_bids_are_reclaimed_and_written_again(self):
+        self.book.reclaim_idle_ms = 0
+        self.book.load(auction(), [])
+        for bidder, amount in ((20, 15), (21, 16), (20, 17)):
+            self.book.place_bid(1, bidder, "bidder", amount)
+        db = SimpleNamespace(commit=lambda: None)
+        written = []
+
+        def crash(db, bids):
+            raise RuntimeError("worker died")
+
+        self.book.write_bids = crash
+        with self.assertRaises(RuntimeError):
+            self.book.persist_pending(db, consumer="first")
+
+        self.book.write_bids = lambda db, bids: written.extend(bids) or len(bids)
+        self.assertEqual(self.book.persist_pending(db, consumer="second"), 3)
+        self.assertEqual([b["order_book_seq"] for b in written], [1, 2, 3])
+        self.assertEqual(self.book.persist_pending(db, consumer="second"), 0)
+        self.assertEqual(self.book.redis.xlen("auction:bids:pending"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
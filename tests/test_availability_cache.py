@@ -0,0 +1,53 @@
+import unittest
+
+from services.availability_cache import AvailabilityCache
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+
+def result(available, price=10.98):
+    return {"available": available, "is_premium": False, "price": price, "error": None}
+
+
+@unittest.skipIf(fakeredis is None, "fakeredis is not installed")
+class TestAvailabilityCache(unittest.TestCase):
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis(decode_responses=True)
+        self.cache = AvailabilityCache(self.redis, available_ttl=60, taken_ttl=900)
+
+    def test_available_and_taken_results_get_their_own_ttl(self):
+        self.cache.set_many({"free.com": result(True), "taken.com": result(False, None)})
+
+        self.assertTrue(0 < self.redis.ttl("namecheap:availability:free.com") <= 60)
+        self.assertTrue(60 < self.redis.ttl("namecheap:availability:taken.com") <= 900)
+
+    def test_hits_and_misses(self):
+        self.cache.set_many({"Free.com": result(True)})
+
+        hits, misses = self.cache.get_many(["free.com", "other.com"])
+
+        self.assertEqual(hits, {"free.com": {"available": True, "is_premium": False, "price": 10.98}})
+        self.assertEqual(misses, ["other.com"])
+        stats = self.cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["errors"]), (1, 1, 0))
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+    def test_redis_errors_fall_back_to_upstream(self):
+        server = fakeredis.FakeServer()
+        server.connected = False
+        cache = AvailabilityCache(fakeredis.FakeRedis(server=server, decode_responses=True))
+
+        cache.set_many({"free.com": result(True)})
+        hits, misses = cache.get_many(["free.com", "other.com"])
+
+        self.assertEqual(hits, {})
+        self.assertEqual(misses, ["free.com", "other.com"])
+        stats = cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["errors"]), (0, 2, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+
+from services.bulk_availability import normalize_domain, normalize_domain_list, parse_domain_file
+
+
+class TestBulkAvailabilityInput(unittest.TestCase):
+    def test_normalize_domain(self):
+        self.assertEqual(normalize_domain(" HTTPS://www.Example.com/path "), "example.com")
+        self.assertEqual(normalize_domain("CloudKitchen"), "cloudkitchen.com")
+        self.assertEqual(normalize_domain("shop.example.co.uk."), "shop.example.co.uk")
+        self.assertIsNone(normalize_domain("-bad-.com"))
+        self.assertIsNone(normalize_domain("spaces in.name"))
+        self.assertIsNone(normalize_domain("example.c"))
+
+    def test_normalize_list_dedupes_in_order(self):
+        domains, invalid = normalize_domain_list(["b.io", "A.com", "a", "www.b.io", "", "not valid!", "a.com"])
+
+        self.assertEqual(domains, ["b.io", "a.com"])
+        self.assertEqual(invalid, ["not valid!"])
+
+    def test_parse_domain_file(self):
+        content = "﻿domain\r\nalpha.com\r\nbeta.io, gamma.ai;delta\n\n".encode("utf-8")
+
+        self.assertEqual(parse_domain_file(content), ["alpha.com", "beta.io", "gamma.ai", "delta"])
+
+
+if __name__ == "__main__":
+    unittest.main()
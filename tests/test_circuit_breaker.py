@@ -0,0 +1,106 @@
+import os
+import time
+import unittest
+from unittest import mock
+
+from services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from services.namecheap_client import NamecheapClient, NamecheapClientSettings
+from services.rate_limiter import NamecheapRateLimiter
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker("namecheap.domains.check", failure_threshold=3, reset_timeout=0.1, enabled=True)
+
+    def test_opens_after_consecutive_failures(self):
+        for _ in range(2):
+            self.breaker.record_failure()
+        self.breaker.record_success()
+        for _ in range(2):
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CLOSED)
+
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+    def test_half_open_lets_one_probe_through(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        time.sleep(0.15)
+
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.breaker.before_call()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_failed_probe_reopens(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        time.sleep(0.15)
+        self.breaker.before_call()
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertEqual(self.breaker.get_stats()["times_opened"], 2)
+
+
+class _FakeResponse:
+    def __init__(self, body):
+        self.status_code = 200
+        self.content = body
+
+
+class _FakeSession:
+    """The first request hangs, any later one answers quickly."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, timeout=None):
+        self.calls += 1
+        if self.calls == 1:
+            time.sleep(0.5)
+            return _FakeResponse(b"slow")
+        return _FakeResponse(b"fast")
+
+    def close(self):
+        pass
+
+
+class TestHedgedRequests(unittest.TestCase):
+    def test_slow_read_is_hedged(self):
+        env = {"NAMECHEAP_HEDGING_ENABLED": "true", "NAMECHEAP_HEDGE_DEFAULT_DELAY_MS": "50",
+               "NAMECHEAP_HEDGE_MIN_DELAY_MS": "10"}
+        with mock.patch.dict(os.environ, env):
+            client = NamecheapClient(NamecheapClientSettings(), rate_limiter=NamecheapRateLimiter(shared=False))
+        client.session = _FakeSession()
+
+        start = time.perf_counter()
+        response = client.get("https://example.test/xml.response?Command=namecheap.domains.getInfo")
+        elapsed = time.perf_counter() - start
+        client.close()
+
+        self.assertEqual(response.content, b"fast")
+        self.assertLess(elapsed, 0.4)
+        stats = client.get_stats()["commands"]["namecheap.domains.getInfo"]
+        self.assertEqual((stats["hedged"], stats["hedge_wins"]), (1, 1))
+
+    def test_writes_are_never_hedged(self):
+        with mock.patch.dict(os.environ, {"NAMECHEAP_HEDGING_ENABLED": "true", "NAMECHEAP_HEDGE_DEFAULT_DELAY_MS": "50"}):
+            client = NamecheapClient(NamecheapClientSettings(), rate_limiter=NamecheapRateLimiter(shared=False))
+        client.session = _FakeSession()
+
+        response = client.get("https://example.test/xml.response?Command=namecheap.domains.create")
+        client.close()
+
+        self.assertEqual(response.content, b"slow")
+        self.assertEqual(client.session.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
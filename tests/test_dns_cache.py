@@ -0,0 +1,106 @@
+import unittest
+
+from services.dns_cache import DnsEditInProgress, DnsHostCache
+
+try:
+    import fakeredis
+    import lupa  # noqa: F401  (fakeredis needs it to run Lua scripts)
+except ImportError:
+    fakeredis = None
+
+RECORDS = [{"HostName": "@", "RecordType": "A", "Address": "1.2.3.4", "TTL": "1800"}]
+NEW_RECORDS = [{"HostName": "@", "RecordType": "A", "Address": "5.6.7.8", "TTL": "1800"}]
+
+
+@unittest.skipIf(fakeredis is None, "fakeredis with lupa is not installed")
+class TestDnsHostCache(unittest.TestCase):
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis(decode_responses=True)
+        self.cache = DnsHostCache(self.redis, ttl=300)
+        self.cache.enabled = True
+
+    def test_fill_then_hit(self):
+        records, generation = self.cache.get("Alpha.com")
+        self.assertIsNone(records)
+
+        self.cache.fill("Alpha.com", RECORDS, generation)
+
+        self.assertEqual(self.cache.get("alpha.com"), (RECORDS, ""))
+        stats = self.cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_fill_uses_the_ttl(self):
+        self.cache.fill("alpha.com", RECORDS, "")
+
+        ttl = self.redis.ttl("namecheap:dns:alpha.com")
+        self.assertTrue(0 < ttl <= 300)
+
+    def test_invalidate_drops_the_records(self):
+        self.cache.fill("alpha.com", RECORDS, "")
+
+        self.cache.invalidate("alpha.com")
+
+        records, generation = self.cache.get("alpha.com")
+        self.assertIsNone(records)
+        self.assertEqual(generation, "1")
+
+    def test_put_replaces_the_records(self):
+        self.cache.fill("alpha.com", RECORDS, "")
+
+        self.cache.put("alpha.com", NEW_RECORDS)
+
+        self.assertEqual(self.cache.get("alpha.com")[0], NEW_RECORDS)
+        self.assertTrue(0 < self.redis.ttl("namecheap:dns:alpha.com") <= 300)
+
+    def test_fill_from_before_a_write_is_dropped(self):
+        # A getHosts starts, then a setHosts lands before its result is cached
+        _, generation = self.cache.get("alpha.com")
+        self.cache.invalidate("alpha.com")
+
+        self.cache.fill("alpha.com", RECORDS, generation)
+
+        records, current = self.cache.get("alpha.com")
+        self.assertIsNone(records)
+
+        # A read that starts after the write may fill
+        self.cache.fill("alpha.com", NEW_RECORDS, current)
+        self.assertEqual(self.cache.get("alpha.com")[0], NEW_RECORDS)
+
+    def test_get_many(self):
+        self.cache.fill("alpha.com", RECORDS, "")
+
+        results = self.cache.get_many(["alpha.com", "beta.com"])
+
+        self.assertEqual(results, {"alpha.com": (RECORDS, ""), "beta.com": (None, "")})
+        stats = self.cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_edit_lock_is_exclusive(self):
+        self.cache.lock_wait = 0.1
+
+        with self.cache.edit_lock("alpha.com"):
+            with self.assertRaises(DnsEditInProgress):
+                with self.cache.edit_lock("alpha.com"):
+                    pass
+
+        with self.cache.edit_lock("alpha.com"):
+            pass
+
+    def test_redis_errors_are_misses(self):
+        server = fakeredis.FakeServer()
+        server.connected = False
+        cache = DnsHostCache(fakeredis.FakeRedis(server=server, decode_responses=True), ttl=300)
+        cache.enabled = True
+
+        self.assertEqual(cache.get("alpha.com"), (None, ""))
+        cache.fill("alpha.com", RECORDS, "")
+        cache.invalidate("alpha.com")
+        with cache.edit_lock("alpha.com"):
+            pass
+
+        stats = cache.get_stats()
+        self.assertEqual((stats["misses"], stats["errors"]), (1, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
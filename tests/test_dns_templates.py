@@ -0,0 +1,69 @@
+import threading
+import unittest
+
+from models.api_dto import DNSRecordRequest, DNSRecordResponse
+from services.dns_templates import apply_to_domains, merge_template, render_template
+
+
+class TestDnsTemplates(unittest.TestCase):
+    def test_merge_replaces_only_matching_hostname_and_type(self):
+        current = [
+            DNSRecordResponse(host_id="1", hostname="@", record_type="A", address="10.0.0.1", ttl=1800),
+            DNSRecordResponse(host_id="2", hostname="@", record_type="MX", address="old-mx.", ttl=1800, mx_pref=10),
+            DNSRecordResponse(host_id="3", hostname="@", record_type="MX", address="old-mx2.", ttl=1800, mx_pref=20),
+            DNSRecordResponse(host_id="4", hostname="verify", record_type="TXT", address="token", ttl=1800),
+        ]
+        template = [
+            DNSRecordRequest(hostname="@", record_type="MX", address="mx1.mail.com.", mx_pref=1),
+            DNSRecordRequest(hostname="@", record_type="MX", address="mx2.mail.com.", mx_pref=5),
+        ]
+
+        merged = merge_template(current, template)
+
+        self.assertEqual([(r.record_type, r.address) for r in merged], [
+            ("A", "10.0.0.1"), ("TXT", "token"), ("MX", "mx1.mail.com."), ("MX", "mx2.mail.com."),
+        ])
+        self.assertEqual(merge_template(current, template, "replace"), template)
+
+    def test_render_fills_in_domain(self):
+        records = [{"hostname": "www", "record_type": "CNAME", "address": "{domain}.", "ttl": 1800, "mx_pref": 10}]
+
+        self.assertEqual(render_template(records, "alpha.com")[0]["address"], "alpha.com.")
+        self.assertEqual(records[0]["address"], "{domain}.")
+
+    def test_apply_retries_retryable_failures_with_bounded_concurrency(self):
+        lock = threading.Lock()
+        attempts, active, peak = {}, [0], [0]
+        results = []
+
+        def apply(domain):
+            with lock:
+                attempts[domain] = attempts.get(domain, 0) + 1
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            try:
+                if domain == "flaky.com" and attempts[domain] == 1:
+                    return RuntimeError("rate limited")
+                if domain == "broken.com":
+                    return ValueError("bad record")
+                return None
+            finally:
+                with lock:
+                    active[0] -= 1
+
+        def is_retryable(error):
+            return isinstance(error, RuntimeError), 0.0
+
+        domains = [f"name{i}.com" for i in range(8)] + ["flaky.com", "broken.com"]
+        apply_to_domains(domains, apply, lambda *result: results.append(result),
+                         concurrency=3, max_attempts=3, backoff=0, is_retryable=is_retryable)
+
+        final = {domain: (attempt, error is None) for domain, attempt, error, is_final in results if is_final}
+        self.assertEqual(len(final), 10)
+        self.assertEqual(final["flaky.com"], (2, True))
+        self.assertEqual(final["broken.com"], (1, False))
+        self.assertLessEqual(peak[0], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
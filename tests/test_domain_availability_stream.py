@@ -0,0 +1,80 @@
+import os
+import unittest
+from unittest import mock
+
+# Importing the service module sets up the database engine; never touch a real database here
+os.environ["DATABASE_URL"] = "sqlite://"
+
+from services.domain_batcher import AdaptiveDomainBatcher
+from services.namecheap_service import NamecheapService
+
+SUGGESTIONS = [f"alpha{i}.com" for i in range(4)]
+
+
+class EmptyLookup:
+    """Stands in for the registered index and the availability cache: nothing is known locally."""
+
+    def lookup(self, domains):
+        return {}, list(domains)
+
+    def get_many(self, domains):
+        return {}, list(domains)
+
+    def set_many(self, results):
+        pass
+
+
+class ExactLastBatcher(AdaptiveDomainBatcher):
+    """Completes the batches in reverse, so the exact match (always the first batch) finishes last."""
+
+    def iter_batches(self, batches, check_fn):
+        for batch in reversed(batches):
+            yield batch, self._run_batch(batch, check_fn)
+
+
+class TestIterDomainAvailability(unittest.TestCase):
+    def setUp(self):
+        self.service = NamecheapService.__new__(NamecheapService)
+        self.service.registered_index = EmptyLookup()
+        self.service.availability_cache = EmptyLookup()
+        self.service.batcher = ExactLastBatcher(max_batch_size=2, min_batch_size=2, max_workers=1,
+                                                target_latency_ms=60000)
+        self.service.get_tld_price = lambda tld: {"price": 10.98, "min_duration": 1}
+        patcher = mock.patch("services.namecheap_service.utils.generate_similar_domains",
+                             return_value=["alpha.com"] + SUGGESTIONS)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def check(self, exact_error=None):
+        def check_batch(batch):
+            if batch == ["alpha.com"]:
+                if exact_error is not None:
+                    raise exact_error
+                return {"alpha.com": {"available": False, "is_premium": False, "price": None}}
+            return {domain: {"available": True, "is_premium": False, "price": None} for domain in batch}
+
+        return check_batch
+
+    def events(self, exact_error=None):
+        self.service._check_domain_batch = self.check(exact_error)
+        return list(self.service.iter_domain_availability("alpha"))
+
+    def test_exact_match_comes_before_earlier_suggestions(self):
+        events = self.events()
+
+        self.assertEqual([event["event"] for event in events], ["domain", "suggestions", "done"])
+        self.assertEqual((events[0]["domain"], events[0]["available"]), ("alpha.com", False))
+        self.assertEqual(sorted(s["domain"] for s in events[1]["suggestions"]), SUGGESTIONS)
+        self.assertEqual(events[-1]["checked"], 5)
+
+    def test_suggestions_are_flushed_when_the_exact_match_fails(self):
+        events = self.events(exact_error=Exception("Namecheap API Error"))
+
+        self.assertEqual([event["event"] for event in events], ["domain", "suggestions", "done"])
+        self.assertEqual(events[0], {"event": "domain", "domain": "alpha.com", "available": None})
+        self.assertEqual(sorted(s["domain"] for s in events[1]["suggestions"]), SUGGESTIONS)
+        self.assertEqual(events[-1]["checked"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+from services.domain_batcher import AdaptiveDomainBatcher
+
+
+class TestAdaptiveDomainBatcher(unittest.TestCase):
+    def setUp(self):
+        self.domains = [f"name{i}.com" for i in range(21)]
+
+    def _available(self, batch):
+        return {domain: {"available": True, "is_premium": False, "price": 0} for domain in batch}
+
+    def test_packs_search_into_single_call(self):
+        """A typical 21-domain search should cost one domains.check call."""
+        batcher = AdaptiveDomainBatcher(max_batch_size=50, min_batch_size=5, max_workers=4, target_latency_ms=1000)
+        calls = []
+
+        def check(batch):
+            calls.append(batch)
+            return self._available(batch)
+
+        results = batcher.check(self.domains, check)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(set(results), set(self.domains))
+
+    def test_failed_batch_is_split_and_retried(self):
+        """A failing batch is retried as two halves and the bad half is dropped."""
+        batcher = AdaptiveDomainBatcher(max_batch_size=50, min_batch_size=2, max_workers=1, target_latency_ms=1000)
+        poisoned = "name20.com"
+
+        def check(batch):
+            if poisoned in batch:
+                raise Exception("Namecheap API Error")
+            return self._available(batch)
+
+        results = batcher.check(self.domains, check)
+
+        self.assertEqual(len(results), 10)
+        self.assertNotIn(poisoned, results)
+        self.assertEqual(batcher.get_stats()["total_errors"], 2)
+
+    def test_batch_size_shrinks_on_errors_and_grows_back(self):
+        batcher = AdaptiveDomainBatcher(max_batch_size=40, min_batch_size=5, max_workers=1, target_latency_ms=1000)
+
+        batcher._record(40, 50, ok=False)
+        self.assertEqual(batcher.batch_size, 20)
+        batcher._record(20, 5000, ok=True)
+        self.assertEqual(batcher.batch_size, 10)
+        batcher._record(10, 50, ok=True)
+        self.assertEqual(batcher.batch_size, 10 + batcher.growth_step)
+
+
+if __name__ == "__main__":
+    unittest.main()
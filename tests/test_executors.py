@@ -0,0 +1,113 @@
+import threading
+import time
+import unittest
+
+from services.domain_batcher import AdaptiveDomainBatcher
+from services.executors import BoundedExecutor, ExecutorSaturated, get_executor, shutdown_executors
+from services.namecheap_management_service import NamecheapManagementService
+
+
+class TestBoundedExecutor(unittest.TestCase):
+    def test_rejects_work_beyond_workers_and_queue(self):
+        executor = BoundedExecutor("test-bounded", max_workers=1, max_queue=1)
+        self.addCleanup(executor.shutdown)
+        release = threading.Event()
+
+        running = executor.submit(release.wait)
+        queued = executor.submit(lambda: "queued")
+        with self.assertRaises(ExecutorSaturated):
+            executor.submit(lambda: "rejected")
+
+        stats = executor.get_stats()
+        self.assertEqual((stats["queue_depth"], stats["rejected"]), (1, 1))
+
+        release.set()
+        self.assertTrue(running.result(timeout=1))
+        self.assertEqual(queued.result(timeout=1), "queued")
+        self.assertEqual(executor.get_stats()["completed"], 2)
+        self.assertEqual(executor.submit(lambda: "free again").result(timeout=1), "free again")
+
+    def test_cancelled_queued_futures_give_back_their_slots(self):
+        executor = BoundedExecutor("test-cancel", max_workers=1, max_queue=2)
+        self.addCleanup(executor.shutdown)
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        running = executor.submit(release.wait)
+        queued = [executor.submit(lambda: "queued") for _ in range(2)]
+        self.assertTrue(all(future.cancel() for future in queued))
+
+        stats = executor.get_stats()
+        self.assertEqual((stats["queue_depth"], stats["cancelled"]), (0, 2))
+        more = [executor.submit(lambda: "accepted") for _ in range(2)]
+        with self.assertRaises(ExecutorSaturated):
+            executor.submit(lambda: "rejected")
+
+        release.set()
+        self.assertTrue(running.result(timeout=1))
+        self.assertEqual([future.result(timeout=1) for future in more], ["accepted", "accepted"])
+
+    def test_batcher_runs_inline_when_shared_pool_is_saturated(self):
+        self.addCleanup(shutdown_executors)
+        shutdown_executors()
+        pool = get_executor("domain-check", max_workers=1, max_queue=0)
+        release = threading.Event()
+        pool.submit(release.wait)
+        self.addCleanup(release.set)
+
+        batcher = AdaptiveDomainBatcher(max_batch_size=5, min_batch_size=5, max_workers=4, target_latency_ms=1000)
+        callers = set()
+
+        def check(batch):
+            callers.add(threading.current_thread().name)
+            return {domain: {"available": True} for domain in batch}
+
+        results = batcher.check([f"name{i}.com" for i in range(20)], check)
+
+        self.assertEqual(len(results), 20)
+        self.assertEqual(callers, {threading.current_thread().name})
+        self.assertEqual(pool.get_stats()["rejected"], 4)
+
+
+
+class TestDeadlineCancellation(unittest.TestCase):
+    """Calls cancelled at a status or dashboard deadline must not shrink the shared pools."""
+
+    def setUp(self):
+        shutdown_executors()
+        self.addCleanup(shutdown_executors)
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+        self.service = NamecheapManagementService()
+
+    def _assert_pool_recovers(self, pool, run):
+        stats = pool.get_stats()
+        self.assertEqual((stats["queue_depth"], stats["cancelled"]), (0, 1))
+
+        self.release.set()
+        deadline = time.monotonic() + 1
+        while pool.get_stats()["active_workers"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        results = run({"a": lambda: "a", "b": lambda: "b"})
+        self.assertEqual(results, {"a": "a", "b": "b"})
+        self.assertEqual(pool.get_stats()["rejected"], 0)
+
+    def test_domain_status_deadline(self):
+        pool = get_executor("domain-status", max_workers=1, max_queue=1)
+
+        results, errors, _ = self.service._gather({"slow": self.release.wait, "queued": lambda: "x"}, 0.05)
+
+        self.assertEqual(set(errors), {"slow", "queued"})
+        self._assert_pool_recovers(pool, lambda calls: self.service._gather(calls, 1)[0])
+
+    def test_dashboard_deadline(self):
+        pool = get_executor("dashboard", max_workers=1, max_queue=1)
+
+        results, errors = self.service._fan_out({"slow": self.release.wait, "queued": lambda: "x"}, 0.05, 2)
+
+        self.assertEqual(set(errors), {"slow", "queued"})
+        self._assert_pool_recovers(pool, lambda calls: self.service._fan_out(calls, 1, 2)[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
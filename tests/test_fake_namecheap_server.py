@@ -0,0 +1,171 @@
+import os
+import unittest
+from unittest import mock
+
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import fake_namecheap_server
+from models.api_dto import DNSRecordRequest
+from services import namecheap_parser
+from services.namecheap_client import NamecheapClient
+from services.namecheap_management_service import NamecheapManagementService
+from services.rate_limiter import NamecheapRateLimiter
+from services.registrar_sync import RegistrarSync
+
+FAKE_ENV = {
+    "FAKE_NAMECHEAP_LATENCY": "fixed:0",
+    "FAKE_NAMECHEAP_SEED": "7",
+    "FAKE_NAMECHEAP_PRICING_TLDS": "60",
+    "FAKE_NAMECHEAP_AVAILABLE_PERCENT": "100",
+    "NAMECHEAP_API_URL": "http://testserver/xml.response",
+}
+
+
+class TestFakeNamecheapServer(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(os.environ, FAKE_ENV)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        fake_namecheap_server.fake = fake_namecheap_server.FakeNamecheap()
+        self.http = TestClient(fake_namecheap_server.app)
+
+    def _call(self, command, **params):
+        response = self.http.get("/xml.response", params={"Command": command, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.content
+
+    def test_commands_parse_with_the_real_parser(self):
+        checks = namecheap_parser.parse_domain_check(
+            self._call("namecheap.domains.check", DomainList="alpha.com,beta.io,gamma.ai"))
+        self.assertEqual([c.domain for c in checks], ["alpha.com", "beta.io", "gamma.ai"])
+
+        prices = list(namecheap_parser.iter_pricing(self._call("namecheap.users.getPricing", ProductType="DOMAIN")))
+        self.assertEqual(len({(p.category, p.tld) for p in prices}), 60 * 3)
+
+        created = namecheap_parser.parse_domain_create(
+            self._call("namecheap.domains.create", DomainName="alpha.com", Years="2"))
+        self.assertTrue(created.registered)
+        checks = namecheap_parser.parse_domain_check(self._call("namecheap.domains.check", DomainList="alpha.com"))
+        self.assertFalse(checks[0].available)
+
+        renewed = namecheap_parser.parse_domain_renew(
+            self._call("namecheap.domains.renew", DomainName="alpha.com", Years="1"))
+        info = namecheap_parser.parse_domain_info(self._call("namecheap.domains.getInfo", DomainName="alpha.com"))
+        self.assertEqual(info.expires.date(), renewed.expires.date())
+
+    def test_create_follows_the_availability_check(self):
+        fake_namecheap_server.fake.available_percent = 60
+        checks = namecheap_parser.parse_domain_check(
+            self._call("namecheap.domains.check", DomainList="alpha.com,gamma.ai"))
+        self.assertEqual([c.available for c in checks], [True, False])
+
+        with self.assertRaises(namecheap_parser.NamecheapApiError):
+            namecheap_parser.parse_domain_create(
+                self._call("namecheap.domains.create", DomainName="gamma.ai", Years="1"))
+        namecheap_parser.parse_domain_create(self._call("namecheap.domains.create", DomainName="alpha.com", Years="1"))
+        with self.assertRaises(namecheap_parser.NamecheapApiError):
+            namecheap_parser.parse_domain_create(
+                self._call("namecheap.domains.create", DomainName="alpha.com", Years="1"))
+
+    def test_injected_errors(self):
+        fake_namecheap_server.fake.error_rate = 1.0
+        with self.assertRaises(namecheap_parser.NamecheapApiError):
+            namecheap_parser.parse_domain_check(self._call("namecheap.domains.check", DomainList="alpha.com"))
+
+        fake_namecheap_server.fake.http_error_rate = 1.0
+        response = self.http.get("/xml.response", params={"Command": "namecheap.domains.check"})
+        self.assertEqual(response.status_code, 503)
+
+    def test_management_service_against_fake(self):
+        service = NamecheapManagementService()
+        self.assertEqual(service.api_url, FAKE_ENV["NAMECHEAP_API_URL"])
+        service.client = NamecheapClient(rate_limiter=NamecheapRateLimiter(shared=False))
+        service.client.session = self.http
+
+        records = service.update_dns_records("alpha", "com", [
+            DNSRecordRequest(hostname="@", record_type="A", address="10.0.0.1", ttl=600),
+            DNSRecordRequest(hostname="mail", record_type="MX", address="mx.alpha.com.", ttl=600, mx_pref=5),
+        ])
+
+        self.assertEqual([(r.hostname, r.record_type, r.address) for r in records],
+                         [("@", "A", "10.0.0.1"), ("mail", "MX", "mx.alpha.com.")])
+        self.assertEqual(records[1].mx_pref, 5)
+
+    def test_registrar_sync_pages_through_account(self):
+        service = NamecheapManagementService()
+        service.client = NamecheapClient(rate_limiter=NamecheapRateLimiter(shared=False))
+        service.client.session = self.http
+        for i in range(25):
+            self._call("namecheap.domains.create", DomainName=f"name{i:02d}.com", Years="1")
+
+        sync = RegistrarSync(fetch_page=service.list_domains_page, fetch_info=service.fetch_domain_info, page_size=10)
+        names = [e.domain for page in sync.iter_account() for e in page]
+
+        self.assertEqual(names, [f"name{i:02d}.com" for i in range(25)])
+        self.assertEqual(service.fetch_domain_info("name03.com").nameservers[0], "dns1.registrar-servers.com")
+
+    def test_domain_status_returns_partial_results_at_deadline(self):
+        fake_namecheap_server.fake.command_latency = fake_namecheap_server.parse_command_latencies(
+            "namecheap.domains.getinfo=fixed:1000")
+        service = NamecheapManagementService()
+        service.client = NamecheapClient(rate_limiter=NamecheapRateLimiter(shared=False))
+        service.client.session = self.http
+        service.status_timeout = 0.3
+        self._call("namecheap.domains.create", DomainName="alpha.com", Years="1")
+
+        status = service.get_domain_status("alpha", "com", "omkar")
+
+        self.assertIsNone(status.domain_info)
+        self.assertIn("Timed out", status.errors["domain_info"])
+        self.assertTrue(status.dns_records)
+        self.assertIsNotNone(status.is_hosted)
+
+    def test_dashboard_fetches_missing_sections_with_bounded_concurrency(self):
+        fake_namecheap_server.fake.command_latency = fake_namecheap_server.parse_command_latencies(
+            "namecheap.domains.dns.gethosts=fixed:50")
+        service = NamecheapManagementService()
+        service.client = NamecheapClient(rate_limiter=NamecheapRateLimiter(shared=False))
+        service.client.session = self.http
+        service.dashboard_concurrency = 2
+        domains = ["alpha.com", "beta.io", "gamma.ai"]
+
+        statuses = service.get_domains_status(domains)
+
+        self.assertEqual(list(statuses), domains)
+        for domain in domains:
+            self.assertEqual(statuses[domain].domain_info.domain_name, domain)
+            self.assertTrue(statuses[domain].is_hosted)
+            self.assertEqual(statuses[domain].errors, {})
+        requests = fake_namecheap_server.fake.requests
+        self.assertEqual((requests["namecheap.domains.getinfo"], requests["namecheap.domains.dns.gethosts"]), (3, 3))
+
+        service.dashboard_timeout = 0.01
+        statuses = service.get_domains_status(domains)
+        self.assertTrue(all("Timed out" in s.errors.get("dns_records", "") for s in statuses.values()))
+
+    def test_single_record_edits_check_etag(self):
+        service = NamecheapManagementService()
+        service.client = NamecheapClient(rate_limiter=NamecheapRateLimiter(shared=False))
+        service.client.session = self.http
+        self._call("namecheap.domains.create", DomainName="alpha.com", Years="1")
+        etag = service.dns_etag(service.get_dns_records("alpha", "com"))
+
+        records = service.add_dns_record("alpha", "com", DNSRecordRequest(
+            hostname="@", record_type="TXT", address="v=spf1 include:_spf.alpha.com ~all"), if_match=etag)
+        self.assertEqual(records[-1].address, "v=spf1 include:_spf.alpha.com ~all")
+        self.assertEqual(len(records), 5)
+
+        with self.assertRaises(HTTPException) as stale:
+            service.remove_dns_record("alpha", "com", records[0].host_id, if_match=etag)
+        self.assertEqual(stale.exception.status_code, 412)
+        self.assertEqual(stale.exception.headers["ETag"], service.dns_etag(records))
+
+        records = service.remove_dns_record("alpha", "com", records[0].host_id, if_match=service.dns_etag(records))
+        self.assertEqual(len(records), 4)
+        self.assertNotIn("A", [r.record_type for r in records])
+
+
+if __name__ == "__main__":
+    unittest.main()
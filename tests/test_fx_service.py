@@ -0,0 +1,72 @@
+import time
+import unittest
+
+from services.fx_service import FxRateService, StaticFxRateProvider
+
+
+class TestFxRateService(unittest.TestCase):
+    def setUp(self):
+        self.provider = StaticFxRateProvider({"USD": {"USD": 1.0, "CAD": 1.25}})
+        self.service = FxRateService(provider=self.provider, ttl=60, refresh_ahead_ratio=0.8)
+
+    def test_rate_is_fetched_once_per_ttl(self):
+        self.assertEqual(self.service.convert(10, "USD", "CAD"), 12.5)
+        self.assertEqual(self.service.convert(20, "USD", "CAD"), 25.0)
+        self.assertEqual(self.provider.calls, 1)
+
+    def test_convert_many_uses_single_rate_lookup(self):
+        result = self.service.convert_many([1, 2.5, 10.99], "USD", "CAD")
+
+        self.assertEqual(result, [1.25, 3.12, 13.74])
+        self.assertEqual(self.provider.calls, 1)
+
+    def test_last_known_good_rate_is_served_when_provider_fails(self):
+        self.service.get_rate("USD", "CAD")
+        rates, _ = self.service._rates["USD"]
+        self.service._rates["USD"] = (rates, time.time() - 120)  # expired
+        self.provider.fail = True
+
+        # Served straight from the stale entry; the refresh runs in the background
+        for _ in range(20):
+            self.assertEqual(self.service.get_rate("USD", "CAD"), 1.25)
+        self._wait_for_refresh()
+        self.assertEqual(self.service.get_rate("USD", "CAD"), 1.25)
+        self.assertEqual(self.provider.calls, 2)
+
+    def test_no_rate_available_returns_none(self):
+        self.provider.fail = True
+
+        self.assertIsNone(self.service.convert(10, "USD", "CAD"))
+        self.assertEqual(self.service.convert_many([1, 2], "USD", "CAD"), [None, None])
+
+    def test_failed_fetch_backs_off_when_nothing_is_cached(self):
+        self.provider.fail = True
+
+        self.assertIsNone(self.service.get_rate("USD", "CAD"))
+        self.assertIsNone(self.service.get_rate("USD", "CAD"))
+        self.assertEqual(self.provider.calls, 1)
+
+        self.provider.fail = False
+        self.service.failure_backoff = 0
+        self.assertEqual(self.service.get_rate("USD", "CAD"), 1.25)
+
+    def test_rate_is_refreshed_in_background_before_expiry(self):
+        self.service.get_rate("USD", "CAD")
+        rates, _ = self.service._rates["USD"]
+        self.service._rates["USD"] = (rates, time.time() - 50)  # inside the refresh-ahead window
+        self.provider.rates["USD"]["CAD"] = 1.30
+
+        # The cached rate is returned immediately while the refresh runs
+        self.assertEqual(self.service.get_rate("USD", "CAD"), 1.25)
+
+        self._wait_for_refresh()
+        self.assertEqual(self.service.get_rate("USD", "CAD"), 1.30)
+
+    def _wait_for_refresh(self):
+        deadline = time.time() + 2
+        while self.service._refreshing and time.time() < deadline:
+            time.sleep(0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
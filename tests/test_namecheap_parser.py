@@ -0,0 +1,183 @@
+import os
+import timeit
+import unittest
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+import xmltodict
+
+from services import namecheap_parser
+from services.namecheap_parser import NamecheapApiError
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "namecheap")
+NS = {"nc": "http://api.namecheap.com/xml.response"}
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+class TestNamecheapParser(unittest.TestCase):
+    def test_domain_check(self):
+        results = namecheap_parser.parse_domain_check(load_fixture("domains_check.xml"))
+
+        self.assertEqual(len(results), 50)
+        self.assertEqual(results[0].domain, "cloudcloud.com")
+        self.assertFalse(results[0].available)
+        self.assertTrue(results[1].available)
+        premium = [r for r in results if r.is_premium]
+        self.assertTrue(premium)
+        self.assertGreater(premium[0].premium_registration_price, 1000)
+
+    def test_pricing_streams_every_price(self):
+        prices = list(namecheap_parser.iter_pricing(load_fixture("users_get_pricing.xml")))
+
+        # 25 TLDs: 10 durations for register and renew, 1 for transfer
+        self.assertEqual(len(prices), 25 * 21)
+        first = prices[0]
+        self.assertEqual((first.category, first.tld, first.duration, first.duration_type), ("register", "com", 1, "YEAR"))
+        self.assertAlmostEqual(first.price, 6.98)
+        self.assertEqual({p.category for p in prices}, {"register", "renew", "transfer"})
+
+    def test_create_and_renew(self):
+        created = namecheap_parser.parse_domain_create(load_fixture("domains_create.xml"))
+        self.assertTrue(created.registered)
+        self.assertEqual(created.order_id, "196074")
+
+        renewed = namecheap_parser.parse_domain_renew(load_fixture("domains_renew.xml"))
+        self.assertTrue(renewed.renewed)
+        self.assertEqual(renewed.charged_amount, "13.0800")
+        self.assertEqual(renewed.expires, datetime(2028, 11, 4, 7, 33, 14))
+
+    def test_domain_info_reads_domain_details(self):
+        info = namecheap_parser.parse_domain_info(load_fixture("domains_get_info.xml"))
+
+        self.assertEqual(info.domain, "cloudkitchen.com")
+        self.assertTrue(info.is_owner)
+        self.assertEqual(info.created, datetime(2025, 11, 4))
+        self.assertEqual(info.expires, datetime(2027, 11, 4))
+        self.assertTrue(info.whoisguard_enabled)
+        self.assertEqual(info.nameservers, ["dns1.registrar-servers.com", "dns2.registrar-servers.com"])
+
+    def test_domain_list_page(self):
+        page = namecheap_parser.parse_domain_list(load_fixture("domains_get_list.xml"))
+
+        self.assertEqual([e.domain for e in page.entries], ["cloudkitchen.com", "studionorth.io", "bytefarm.dev"])
+        self.assertEqual((page.total_items, page.current_page, page.page_size), (23, 2, 20))
+        expired = page.entries[1]
+        self.assertEqual(expired.expires, datetime(2026, 1, 18))
+        self.assertTrue(expired.is_expired and expired.is_locked and expired.auto_renew and expired.is_premium)
+        self.assertFalse(expired.is_our_dns)
+        self.assertEqual([e.whoisguard for e in page.entries], ["ENABLED", "NOTPRESENT", "DISABLED"])
+
+    def test_dns_hosts(self):
+        hosts = namecheap_parser.parse_dns_hosts(load_fixture("domains_dns_get_hosts.xml"))
+
+        self.assertEqual([h.type for h in hosts], ["A", "CNAME", "MX", "TXT"])
+        self.assertEqual(hosts[2].mx_pref, 10)
+        self.assertEqual(hosts[2].ttl, 3600)
+
+    def test_error_response_raises(self):
+        for parse in (namecheap_parser.parse_domain_info, lambda xml: list(namecheap_parser.iter_pricing(xml))):
+            with self.assertRaises(NamecheapApiError) as ctx:
+                parse(load_fixture("error.xml"))
+            self.assertEqual(ctx.exception.messages, ["Domain not found"])
+            self.assertEqual(ctx.exception.number, "2019166")
+
+
+def xpath_domain_check(xml):
+    """The ElementTree + XPath parsing previously done in NamecheapService."""
+    root = ET.fromstring(xml)
+    results = {}
+    for result in root.findall(".//nc:DomainCheckResult", NS):
+        is_premium = result.get("IsPremiumName") == "true"
+        results[result.get("Domain")] = (result.get("Available") == "true", is_premium,
+                                         float(result.get("PremiumRegistrationPrice", 0)) if is_premium else 0)
+    return results
+
+
+def xpath_pricing(xml):
+    root = ET.fromstring(xml)
+    prices = []
+    for category in root.findall(".//nc:ProductCategory", NS):
+        for product in category.findall("nc:Product", NS):
+            for price in product.findall("nc:Price", NS):
+                prices.append((category.get("Name"), product.get("Name"), int(price.get("Duration")),
+                               float(price.get("Price"))))
+    return prices
+
+
+def xmltodict_domain_check(xml):
+    """The xmltodict dict-walking previously done in NamecheapManagementService."""
+    data = xmltodict.parse(xml)
+    entries = data["ApiResponse"]["CommandResponse"]["DomainCheckResult"]
+    if isinstance(entries, dict):
+        entries = [entries]
+    results = {}
+    for entry in entries:
+        is_premium = entry["@IsPremiumName"] == "true"
+        results[entry["@Domain"]] = (entry["@Available"] == "true", is_premium,
+                                     float(entry["@PremiumRegistrationPrice"]) if is_premium else 0)
+    return results
+
+
+def xmltodict_pricing(xml):
+    data = xmltodict.parse(xml)
+    prices = []
+    product_type = data["ApiResponse"]["CommandResponse"]["UserGetPricingResult"]["ProductType"]
+    for category in product_type["ProductCategory"]:
+        for product in category["Product"]:
+            entries = product["Price"]
+            if isinstance(entries, dict):
+                entries = [entries]
+            for price in entries:
+                prices.append((category["@Name"], product["@Name"], int(price["@Duration"]), float(price["@Price"])))
+    return prices
+
+
+def parser_domain_check(xml):
+    return {r.domain: (r.available, r.is_premium, r.premium_registration_price)
+            for r in namecheap_parser.parse_domain_check(xml)}
+
+
+def parser_pricing(xml):
+    return [(p.category, p.tld, p.duration, p.price) for p in namecheap_parser.iter_pricing(xml)]
+
+
+class PerformanceTestNamecheapParser(unittest.TestCase):
+    """Benchmark: the shared parser against the ElementTree+XPath and xmltodict approaches it replaces."""
+
+    ITERATIONS = {"domains_check.xml": 100, "users_get_pricing.xml": 5}
+
+    def _bench(self, fn, xml, iterations):
+        best = min(timeit.repeat(lambda: fn(xml), number=iterations, repeat=5))
+        return best / iterations * 1000
+
+    def _compare(self, fixture, parser_fn, xpath_fn, xmltodict_fn):
+        xml = load_fixture(fixture)
+        expected = parser_fn(xml)
+        self.assertEqual(expected, xpath_fn(xml))
+        self.assertEqual(expected, xmltodict_fn(xml))
+
+        iterations = self.ITERATIONS[fixture]
+        timings = {
+            "namecheap_parser": self._bench(parser_fn, xml, iterations),
+            "etree+xpath": self._bench(xpath_fn, xml, iterations),
+            "xmltodict": self._bench(xmltodict_fn, xml, iterations),
+        }
+        print(f"\n{fixture} ({len(xml) // 1024}KB): " +
+              ", ".join(f"{name} {ms:.2f}ms" for name, ms in timings.items()))
+        return timings
+
+    def test_domain_check_parsing(self):
+        timings = self._compare("domains_check.xml", parser_domain_check, xpath_domain_check, xmltodict_domain_check)
+        self.assertLess(timings["namecheap_parser"], timings["xmltodict"])
+
+    def test_pricing_parsing(self):
+        timings = self._compare("users_get_pricing.xml", parser_pricing, xpath_pricing, xmltodict_pricing)
+        self.assertLess(timings["namecheap_parser"], timings["xmltodict"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from services.pricing_catalog import PricingCatalog
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+PRICES = {"register": {"com": {"price": 10.0, "min_duration": 1, "duration_type": "YEAR"}}}
+
+
+@unittest.skipIf(fakeredis is None, "fakeredis is not installed")
+class TestPricingCatalog(unittest.TestCase):
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis(decode_responses=True)
+
+    def test_catalog_published_by_another_process_is_seen_right_away(self):
+        waiting = PricingCatalog(self.redis)
+        self.assertIsNone(waiting.get_price("com"))
+        self.assertTrue(PricingCatalog(self.redis).should_bootstrap())
+        self.assertFalse(waiting.should_bootstrap())
+
+        PricingCatalog(self.redis).publish(PRICES, usd_to_cad_rate=1.5)
+
+        self.assertEqual(waiting.get_price("com")["price"], 15.0)
+
+    def test_loaded_catalog_checks_for_new_versions_at_the_interval(self):
+        catalog = PricingCatalog(self.redis)
+        PricingCatalog(self.redis).publish(PRICES, usd_to_cad_rate=1.5)
+        self.assertEqual(catalog.get_price("com")["price"], 15.0)
+
+        PricingCatalog(self.redis).publish(PRICES, usd_to_cad_rate=2.0)
+
+        self.assertEqual(catalog.get_price("com")["price"], 15.0)
+        catalog._checked_at = 0
+        self.assertEqual(catalog.get_price("com")["price"], 20.0)
+
+
+    def test_catalog_is_served_locally_when_redis_is_down(self):
+        server = fakeredis.FakeServer()
+        catalog = PricingCatalog(fakeredis.FakeRedis(server=server, decode_responses=True))
+        server.connected = False
+
+        summary = catalog.publish(PRICES, usd_to_cad_rate=1.5)
+
+        self.assertFalse(summary["published"])
+        self.assertEqual(catalog.get_price("com")["price"], 15.0)
+        self.assertFalse(catalog.should_bootstrap())
+
+        server.connected = True
+        catalog._checked_at = 0
+        self.assertEqual(catalog.get_price("com")["price"], 15.0)
+        other = PricingCatalog(fakeredis.FakeRedis(server=server, decode_responses=True))
+        self.assertEqual(other.get_price("com")["price"], 15.0)
+        self.assertTrue(catalog.get_info()["published"])
+
+
+if __name__ == "__main__":
+    unittest.main()
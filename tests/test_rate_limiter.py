@@ -0,0 +1,75 @@
+import os
+import unittest
+from unittest import mock
+
+from services.domain_batcher import AdaptiveDomainBatcher
+from services.rate_limiter import (NamecheapRateLimiter, Priority, RateLimitExceeded, current_priority,
+                                   request_priority)
+
+
+def make_limiter(**env):
+    settings = {
+        "NAMECHEAP_RATE_LIMIT": "10",
+        "NAMECHEAP_RATE_LIMIT_PERIOD": "600",
+        "NAMECHEAP_RATE_RESERVE_CRITICAL": "2",
+        "NAMECHEAP_RATE_RESERVE_INTERACTIVE": "3",
+        "NAMECHEAP_RATE_MAX_WAIT_INTERACTIVE": "0.5",
+        "NAMECHEAP_RATE_MAX_WAIT_BACKGROUND": "0.5",
+    }
+    settings.update(env)
+    with mock.patch.dict(os.environ, settings):
+        return NamecheapRateLimiter(shared=False)
+
+
+class TestNamecheapRateLimiter(unittest.TestCase):
+    def test_lanes_keep_reserves_for_higher_priorities(self):
+        limiter = make_limiter()
+
+        # 10 tokens: background stops at 5 left, interactive at 2, critical uses the rest
+        for _ in range(5):
+            limiter.acquire(Priority.BACKGROUND)
+        with self.assertRaises(RateLimitExceeded):
+            limiter.acquire(Priority.BACKGROUND)
+
+        for _ in range(3):
+            limiter.acquire(Priority.INTERACTIVE)
+        with self.assertRaises(RateLimitExceeded):
+            limiter.acquire(Priority.INTERACTIVE)
+
+        limiter.acquire(Priority.CRITICAL)
+        limiter.acquire(Priority.CRITICAL)
+
+        lanes = limiter.get_stats()["lanes"]
+        self.assertEqual(lanes["background"]["shed"], 1)
+        self.assertEqual(lanes["interactive"]["acquired"], 3)
+        self.assertEqual(lanes["critical"]["acquired"], 2)
+
+    def test_waits_for_refill_and_records_queue_time(self):
+        # 2 tokens refilled at 10 per second
+        limiter = make_limiter(NAMECHEAP_RATE_LIMIT="2", NAMECHEAP_RATE_LIMIT_PERIOD="0.2",
+                               NAMECHEAP_RATE_RESERVE_CRITICAL="0", NAMECHEAP_RATE_RESERVE_INTERACTIVE="0")
+
+        limiter.acquire()
+        limiter.acquire()
+        queue_time = limiter.acquire()
+
+        self.assertGreater(queue_time, 0.05)
+        self.assertEqual(limiter.get_stats()["lanes"]["interactive"]["waited"], 1)
+
+    def test_priority_follows_batches_into_worker_threads(self):
+        seen = []
+        batcher = AdaptiveDomainBatcher(max_batch_size=2, max_workers=2)
+
+        def check(batch):
+            seen.append(current_priority())
+            return {domain: {"available": True} for domain in batch}
+
+        with request_priority(Priority.BACKGROUND):
+            batcher.check(["a.com", "b.com", "c.com", "d.com"], check)
+
+        self.assertEqual(seen, [Priority.BACKGROUND, Priority.BACKGROUND])
+        self.assertEqual(current_priority(), Priority.INTERACTIVE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from services.registered_index import RegisteredDomainIndex
+
+
+class TestRegisteredDomainIndex(unittest.TestCase):
+    def setUp(self):
+        self.rows = [(1, "Alpha.com"), (2, "beta.io")]
+        self.listings = {"beta.io": {"listing_id": 7, "price": 250.0}}
+        self.loads = []
+
+        def loader(since_id):
+            self.loads.append(since_id)
+            return [row for row in self.rows if row[0] > since_id], dict(self.listings)
+
+        self.index = RegisteredDomainIndex(loader=loader, refresh_interval=60, rebuild_interval=600)
+
+    def test_lookup_splits_known_and_unknown(self):
+        known, remaining = self.index.lookup(["alpha.com", "BETA.io", "gamma.ai"])
+
+        self.assertEqual(remaining, ["gamma.ai"])
+        self.assertFalse(known["alpha.com"]["available"])
+        self.assertNotIn("listing", known["alpha.com"])
+        self.assertEqual(known["BETA.io"]["listing"], {"listing_id": 7, "price": 250.0})
+
+    def test_incremental_refresh_and_add(self):
+        self.index.lookup(["alpha.com"])
+        self.rows.append((3, "gamma.ai"))
+        self.listings.clear()
+
+        self.index.add("delta.dev")
+        self.index.invalidate()
+        known, remaining = self.index.lookup(["gamma.ai", "delta.dev", "beta.io", "epsilon.xyz"])
+
+        self.assertEqual(self.loads, [0, 2])
+        self.assertEqual(set(known), {"gamma.ai", "delta.dev", "beta.io"})
+        self.assertNotIn("listing", known["beta.io"])
+        self.assertEqual(remaining, ["epsilon.xyz"])
+
+
+if __name__ == "__main__":
+    unittest.main()
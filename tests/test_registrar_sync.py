@@ -0,0 +1,76 @@
+import unittest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from services.namecheap_parser import DomainInfo, DomainListEntry, DomainListPage
+from services.registrar_sync import (
+    RegistrarSync, apply_domain_info, apply_list_entry, expiry_drifted, needs_info
+)
+
+
+def entry(name, expires=datetime(2027, 3, 1), locked=False):
+    return DomainListEntry(domain=name, registrar_id="1", owner_name="omkar", created=datetime(2025, 3, 1),
+                           expires=expires, is_expired=False, is_locked=locked, auto_renew=False,
+                           whoisguard="ENABLED", is_premium=False, is_our_dns=True)
+
+
+def mirror_row(name):
+    return SimpleNamespace(domain_name=name, fingerprint=None, info_synced_at=None, list_synced_at=None,
+                           owner_name=None, created=None, expires=None, nameservers=None)
+
+
+class TestRegistrarSync(unittest.TestCase):
+    def test_iter_account_pages_until_total(self):
+        account = [entry(f"name{i:02d}.com") for i in range(23)]
+        calls = []
+
+        def fetch_page(page, page_size):
+            calls.append((page, page_size))
+            start = (page - 1) * page_size
+            return DomainListPage(account[start:start + page_size], len(account), page, page_size)
+
+        sync = RegistrarSync(fetch_page=fetch_page, fetch_info=None, page_size=10)
+        pages = list(sync.iter_account())
+
+        self.assertEqual([len(p) for p in pages], [10, 10, 3])
+        self.assertEqual(calls, [(1, 10), (2, 10), (3, 10)])
+
+    def test_list_changes_mark_details_stale(self):
+        now = datetime(2026, 5, 1)
+        row = mirror_row("alpha.com")
+
+        self.assertTrue(apply_list_entry(row, entry("alpha.com"), now))
+        self.assertTrue(row.whoisguard_enabled)
+        row.info_synced_at = now
+
+        self.assertFalse(apply_list_entry(row, entry("alpha.com"), now + timedelta(minutes=30)))
+        self.assertEqual(row.info_synced_at, now)
+        self.assertFalse(needs_info(row, now + timedelta(hours=1), timedelta(days=1)))
+
+        self.assertTrue(apply_list_entry(row, entry("alpha.com", locked=True), now + timedelta(hours=1)))
+        self.assertIsNone(row.info_synced_at)
+        self.assertTrue(needs_info(row, now + timedelta(hours=1), timedelta(days=1)))
+
+    def test_domain_info_keeps_list_flags(self):
+        now = datetime(2026, 5, 1)
+        row = mirror_row("alpha.com")
+        apply_list_entry(row, entry("alpha.com", locked=True), now)
+        info = DomainInfo(domain="alpha.com", owner_name="omkar", is_owner=True, status="Ok",
+                          created=datetime(2025, 3, 1), expires=datetime(2027, 3, 1), is_locked=False,
+                          auto_renew=False, whoisguard_enabled=False, is_premium=False,
+                          nameservers=["dns1.registrar-servers.com"])
+
+        apply_domain_info(row, info, now)
+
+        self.assertTrue(row.is_locked)
+        self.assertTrue(row.whoisguard_enabled)
+        self.assertEqual((row.status, row.nameservers, row.info_synced_at), ("Ok", ["dns1.registrar-servers.com"], now))
+
+    def test_expiry_drift_ignores_time_of_day(self):
+        self.assertFalse(expiry_drifted(datetime(2027, 3, 1, 14, 30), datetime(2027, 3, 1)))
+        self.assertTrue(expiry_drifted(datetime(2026, 3, 1, 14, 30), datetime(2027, 3, 1)))
+        self.assertFalse(expiry_drifted(datetime(2026, 3, 1), None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import threading
+import time
+import unittest
+
+from services.single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        self.flight = SingleFlight("test", shared=False)
+        self.calls = 0
+
+    def _slow_search(self):
+        self.calls += 1
+        time.sleep(0.2)
+        return {"suggestions": [], "call": self.calls}
+
+    def test_concurrent_identical_calls_share_one_execution(self):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.flight.do("example", self._slow_search)))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(result["call"] == 1 for result in results))
+        self.assertEqual(self.flight.get_stats()["coalesced_local"], 4)
+
+    def test_sequential_calls_are_not_cached(self):
+        self.flight.do("example", self._slow_search)
+        self.flight.do("example", self._slow_search)
+
+        self.assertEqual(self.calls, 2)
+
+    def test_leader_error_is_raised_to_followers(self):
+        def failing():
+            time.sleep(0.1)
+            raise ValueError("upstream failed")
+
+        errors = []
+
+        def call():
+            try:
+                self.flight.do("broken", failing)
+            except ValueError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(self.flight.get_stats()["in_flight"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
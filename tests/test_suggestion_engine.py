@@ -0,0 +1,57 @@
+import time
+import unittest
+
+from services.suggestion_engine import SuggestionEngine
+
+
+class TestSuggestionEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = SuggestionEngine(top_k=12)
+
+    def test_returns_top_k_ranked_candidates(self):
+        scored = self.engine.score("example")
+
+        self.assertEqual(len(scored), 12)
+        self.assertEqual(scored[0][0], "example.com")
+        scores = [score for _, score in scored]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_is_deterministic(self):
+        self.assertEqual(self.engine.suggest("cloudkitchen"), self.engine.suggest("cloudkitchen"))
+        self.assertEqual(self.engine.suggest("CloudKitchen "), self.engine.suggest("cloudkitchen"))
+
+    def test_keyword_affinity_boosts_matching_tld(self):
+        suggestions = self.engine.suggest("chatbot")
+
+        self.assertLess(suggestions.index("chatbot.ai"), suggestions.index("chatbot.net"))
+
+    def test_skips_redundant_prefixes_and_suffixes(self):
+        suggestions = self.engine.suggest("getfitapp", top_k=50)
+
+        self.assertNotIn("getgetfitapp.com", suggestions)
+        self.assertNotIn("getfitappapp.com", suggestions)
+
+    def test_invalid_base_name_returns_nothing(self):
+        self.assertEqual(self.engine.suggest("!!!"), [])
+
+
+class PerformanceTestSuggestionEngine(unittest.TestCase):
+    """Microbenchmark: suggestion generation must sustain 10k base names per second."""
+
+    def test_generation_throughput(self):
+        engine = SuggestionEngine(top_k=12)
+        words = ["domain", "market", "buy", "sell", "trade", "web", "site", "online", "digital", "cyber"]
+        base_names = [f"{words[i % 10]}{words[(i // 10) % 10]}{i}" for i in range(10000)]
+
+        start_time = time.perf_counter()
+        for base_name in base_names:
+            engine.suggest(base_name)
+        elapsed = time.perf_counter() - start_time
+
+        self.assertLessEqual(elapsed, 1.0,
+                             f"Generating suggestions for 10k base names took {elapsed:.2f}s "
+                             f"({len(base_names) / elapsed:,.0f} names/s), exceeding 1s")
+
+
+if __name__ == "__main__":
+    unittest.main()
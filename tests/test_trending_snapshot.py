@@ -0,0 +1,90 @@
+import json
+import sys
+import time
+import unittest
+from unittest import mock
+
+from services.trending_snapshot import REFRESH_LOCK_KEY, SNAPSHOT_KEY, TrendingSnapshot
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+DOMAINS = [{"domain": "alpha.com", "available": True}]
+
+
+@unittest.skipIf(fakeredis is None, "fakeredis is not installed")
+class TestTrendingSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis(decode_responses=True)
+        self.snapshot = TrendingSnapshot(self.redis)
+        self.snapshot.max_age = 900
+        # request_refresh imports the Celery task lazily from the worker module
+        self.worker = mock.Mock()
+        patcher = mock.patch.dict(sys.modules, {"celery_worker": self.worker})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.delay = self.worker.refresh_trending_domains_snapshot.delay
+
+    def store(self, domains, age):
+        stored = self.snapshot.store(domains)
+        stored["generated_at_ts"] -= age
+        self.redis.set(SNAPSHOT_KEY, json.dumps(stored))
+
+    def test_fresh_snapshot_is_served_without_a_refresh(self):
+        self.store(DOMAINS, age=10)
+
+        snapshot = self.snapshot.get()
+
+        self.assertEqual(snapshot["domains"], DOMAINS)
+        self.assertFalse(snapshot["stale"])
+        self.delay.assert_not_called()
+
+    def test_stale_snapshot_is_served_and_refreshed_once(self):
+        self.store(DOMAINS, age=1000)
+
+        for _ in range(3):
+            snapshot = self.snapshot.get()
+            self.assertEqual(snapshot["domains"], DOMAINS)
+            self.assertTrue(snapshot["stale"])
+
+        self.delay.assert_called_once_with()
+        self.assertTrue(self.redis.exists(REFRESH_LOCK_KEY))
+
+        # The refresh task releases the lock when it is done
+        self.snapshot.release_refresh_lock()
+        self.snapshot.get()
+        self.assertEqual(self.delay.call_count, 2)
+
+    def test_refresh_lock_is_released_when_queueing_fails(self):
+        self.store(DOMAINS, age=1000)
+        self.delay.side_effect = ConnectionError("broker down")
+
+        self.assertTrue(self.snapshot.get()["stale"])
+
+        self.assertFalse(self.redis.exists(REFRESH_LOCK_KEY))
+
+    def test_empty_snapshot_is_served_as_is(self):
+        self.store([], age=10)
+        build = mock.Mock(return_value=DOMAINS)
+
+        snapshot = self.snapshot.get_or_build(build)
+
+        self.assertEqual(snapshot["domains"], [])
+        build.assert_not_called()
+
+    def test_missing_snapshot_is_built_inline_and_stored(self):
+        build = mock.Mock(return_value=DOMAINS)
+
+        snapshot = self.snapshot.get_or_build(build)
+
+        self.assertEqual(snapshot["domains"], DOMAINS)
+        self.assertEqual((snapshot["age"], snapshot["stale"]), (0.0, False))
+        build.assert_called_once_with()
+        self.assertTrue(self.snapshot.has_snapshot())
+        self.assertLess(time.time() - json.loads(self.redis.get(SNAPSHOT_KEY))["generated_at_ts"], 60)
+
+
+if __name__ == "__main__":
+    unittest.main()